@@ -0,0 +1,79 @@
+"""Meal frequency statistics: incremental updates vs rescanning the plan.
+
+Run from the project directory:
+
+    python benchmarks/bench_analytics.py [weeks, default 10000]
+
+"rescan" recomputes the counts and last-served days from weekly_plans, as a
+view would without MealStats; "incremental" applies the same edit to
+MealStats, and "report" is the Meal Stats view read from it.
+"""
+import datetime
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from mealplanner.analytics import MealStats  # noqa: E402
+from mealplanner.plan import DAYS, MealTable, Week  # noqa: E402
+
+EDITS = 200
+START = datetime.date(2000, 1, 3)
+
+
+def rescan(plans, num_weeks, today_slot):
+    counts = {}
+    last = {}
+    for week in range(1, num_weeks + 1):
+        meals = plans[week]
+        for day_index, day in enumerate(DAYS):
+            meal = meals.get(day)
+            if meal:
+                counts[meal] = counts.get(meal, 0) + 1
+                position = week * len(DAYS) + day_index
+                if position <= today_slot:
+                    last[meal] = position
+    return counts, last
+
+
+def main():
+    num_weeks = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    rng = random.Random(1)
+    table = MealTable()
+    plans = {week: Week.from_mapping(table, {day: f"Meal {rng.randrange(300)}" for day in DAYS})
+             for week in range(1, num_weeks + 1)}
+    today = START + datetime.timedelta(days=num_weeks * 7 // 2)
+    today_slot = (today - START).days + len(DAYS)
+    edits = [(rng.randrange(1, num_weeks + 1), rng.choice(DAYS), f"Meal {rng.randrange(300)}") for _ in range(EDITS)]
+
+    start = time.perf_counter()
+    stats = MealStats.build(plans)
+    print(f"{num_weeks} weeks, built in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    start = time.perf_counter()
+    for week, day, meal in edits[:10]:
+        plans[week][day] = meal
+        rescan(plans, num_weeks, today_slot)
+    rescanned = (time.perf_counter() - start) * 1000 / 10
+
+    start = time.perf_counter()
+    for week, day, meal in edits:
+        plans[week][day] = meal
+        stats.update(week, day, meal)
+    incremental = (time.perf_counter() - start) * 1000 / EDITS
+
+    start = time.perf_counter()
+    report = stats.report(START, today)
+    reported = (time.perf_counter() - start) * 1000
+
+    counts, _ = rescan(plans, num_weeks, today_slot)
+    assert counts == stats.counts
+    print(f"{'rescan per edit':>20}: {rescanned:8.3f} ms")
+    print(f"{'incremental per edit':>20}: {incremental:8.3f} ms")
+    print(f"{'report':>20}: {reported:8.3f} ms ({len(report)} meals)")
+
+
+if __name__ == "__main__":
+    main()
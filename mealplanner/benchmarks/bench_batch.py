@@ -0,0 +1,52 @@
+"""Batch throughput: plan files validated and normalised per second, by worker count.
+
+Run from the project directory:
+
+    python benchmarks/bench_batch.py
+
+Each file is a 52-week household plan; a tenth of them have a malformed week
+key for normalise to fix.
+"""
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from mealplanner import batch  # noqa: E402
+from mealplanner.plan import DAYS  # noqa: E402
+
+FILES = 5000
+WEEKS = 52
+
+
+def write_plans(directory):
+    for household in range(FILES):
+        weeks = {str(week): {day: f"Meal {(household + week) % 40}" for day in DAYS} for week in range(1, WEEKS + 1)}
+        if household % 10 == 0:
+            weeks[f"week {WEEKS + 1}"] = weeks.pop(str(WEEKS))
+        path = Path(directory) / f"{household // 100:03d}" / f"household_{household}.json"
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(json.dumps({"weeks": weeks, "start_date": "2025-01-06", "num_weeks": WEEKS}, indent=4))
+
+
+def main():
+    worker_counts = sorted({1, 2, os.cpu_count() or 1})
+    print(f"{FILES} files of {WEEKS} weeks; {os.cpu_count()} CPUs")
+    print(f"{'action':>10} {'workers':>8} {'files/s':>9}")
+    for action in ("validate", "normalise"):
+        for workers in worker_counts:
+            with tempfile.TemporaryDirectory() as tmp:
+                write_plans(tmp)
+                start = time.perf_counter()
+                batch.run(action, tmp, workers=workers, out=io.StringIO())
+                rate = FILES / (time.perf_counter() - start)
+            print(f"{action:>10} {workers:>8} {rate:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
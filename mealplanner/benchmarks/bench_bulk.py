@@ -0,0 +1,69 @@
+"""Bulk week operations vs the same change made one meal at a time.
+
+Run from the project directory:
+
+    python benchmarks/bench_bulk.py
+
+A 52-week plan with its search index and stats built (as after a search in
+the app). "per meal" repeats a 4-week rotation over the other 48 weeks with
+7 x 48 set_meal calls, each saved on its own: as a journal record
+(journal_mode, the default) or as a full snapshot (journal_mode off, the
+old behaviour). "bulk" is one PlanEngine.repeat_weeks call, which updates
+the views once per week and saves once.
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from mealplanner.engine import PlanEngine  # noqa: E402
+from mealplanner.plan import DAYS  # noqa: E402
+
+WEEKS = 52
+ROTATION = 4
+
+
+def make_engine(path, journal_mode=True):
+    engine = PlanEngine(path).load()
+    engine.journal_mode = journal_mode
+    engine.set_num_weeks(WEEKS)
+    for week in range(1, ROTATION + 1):
+        engine.weekly_plans[week] = {day: f"Meal {week} {day}" for day in DAYS}
+    engine.save_meals()
+    engine.meal_index, engine.meal_stats
+    return engine
+
+
+def per_meal(engine):
+    for week in range(ROTATION + 1, WEEKS + 1):
+        source = engine.weekly_plans[(week - 1) % ROTATION + 1]
+        for day in DAYS:
+            engine.set_meal(week, day, source[day])
+
+
+def bulk(engine):
+    engine.repeat_weeks(1, ROTATION)
+
+
+def timed(name, run, path, **kwargs):
+    engine = make_engine(path, **kwargs)
+    start = time.perf_counter()
+    run(engine)
+    elapsed = time.perf_counter() - start
+    assert engine.meal(WEEKS, "Sunday") == f"Meal {(WEEKS - 1) % ROTATION + 1} Sunday"
+    print(f"{name:<22} {elapsed * 1000:9.1f} ms")
+    engine.close()
+
+
+def main():
+    print(f"Repeat a {ROTATION}-week rotation over {WEEKS - ROTATION} weeks ({7 * (WEEKS - ROTATION)} meals)")
+    with tempfile.TemporaryDirectory() as tmp:
+        timed("per meal, snapshots", per_meal, str(Path(tmp) / "a.json"), journal_mode=False)
+        timed("per meal, journal", per_meal, str(Path(tmp) / "b.json"))
+        timed("bulk", bulk, str(Path(tmp) / "c.json"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Date lookups and month views over a long plan: DateIndex vs timedelta arithmetic.
+
+Run from the project directory:
+
+    python benchmarks/bench_calendar.py [weeks, default 520]
+
+"labels" formats the week label for every week of the plan, as paging
+through it does; "locate" resolves a date to its (week, day) 10000 times;
+"months" renders every month of the plan with its meals. "arithmetic" is
+the old way: a timedelta and strftime per render, and a scan over the weeks
+to find a date.
+"""
+import datetime
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from mealplanner.dates import DateIndex  # noqa: E402
+from mealplanner.engine import PlanEngine  # noqa: E402
+from mealplanner.plan import DAYS  # noqa: E402
+
+START = datetime.date(2025, 1, 6)
+LOOKUPS = 10000
+
+
+def scan_locate(start_date, num_weeks, date):
+    for week in range(1, num_weeks + 1):
+        monday = start_date + datetime.timedelta(days=(week - 1) * 7)
+        if monday <= date < monday + datetime.timedelta(days=7):
+            return week, DAYS[(date - monday).days]
+    return None
+
+
+def timed(run):
+    start = time.perf_counter()
+    run()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    weeks = int(sys.argv[1]) if len(sys.argv) > 1 else 520
+    engine = PlanEngine("unused.json")
+    engine.weekly_plans = engine.get_default_weekly_meals()
+    engine.plan_start_date, engine.num_weeks = START, weeks
+    engine.weekly_plans.num_weeks = weeks
+    dates = [START + datetime.timedelta(days=(n * 37) % (weeks * 7)) for n in range(LOOKUPS)]
+    end = DateIndex(START, weeks).end_date
+    months = [(year, month) for year in range(START.year, end.year + 1) for month in range(1, 13)
+              if (START.year, START.month) <= (year, month) <= (end.year, end.month)]
+    build = timed(lambda: engine.date_index) # Built once; the timings below reuse it
+    rows = [
+        ("labels",
+         timed(lambda: [(START + datetime.timedelta(days=(week - 1) * 7)).strftime('%Y-%m-%d')
+                        for week in range(1, weeks + 1)]),
+         timed(lambda: [engine.week_display_date(week) for week in range(1, weeks + 1)])),
+        ("locate",
+         timed(lambda: [scan_locate(START, weeks, date) for date in dates]),
+         timed(lambda: [engine.locate_date(date) for date in dates])),
+        ("months", None, timed(lambda: [engine.month_calendar(year, month) for year, month in months])),
+    ]
+    print(f"{weeks} weeks; building the DateIndex takes {build:.2f} ms")
+    print(f"{'':<8} {'arithmetic':>12} {'DateIndex':>12}")
+    for name, old, new in rows:
+        print(f"{name:<8} {'' if old is None else f'{old:9.2f} ms':>12} {new:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
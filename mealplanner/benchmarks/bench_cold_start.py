@@ -0,0 +1,53 @@
+"""Cold-start benchmark: three separate parses of the data file vs one PlanStore load.
+
+Run from the project directory:
+
+    python benchmarks/bench_cold_start.py
+"""
+import json
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from mealplanner.store import PlanStore  # noqa: E402
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+WEEK_COUNTS = [10, 100, 1000, 10000]
+REPEAT = 5
+
+
+def write_plan(path, num_weeks):
+    weeks = {str(week): {day: f"Meal {week % 50} {day}" for day in DAYS} for week in range(1, num_weeks + 1)}
+    with open(path, "w") as f:
+        json.dump({"weeks": weeks, "start_date": "2025-01-06", "num_weeks": num_weeks}, f, indent=4)
+
+
+def three_reads(path):
+    # What startup used to do: load_settings, load_meals and load_start_date each parse the file.
+    for _ in range(3):
+        with open(path) as f:
+            json.load(f)
+
+
+def plan_store_read(path):
+    store = PlanStore(path)
+    for _ in range(3):
+        store.load()
+
+
+def main():
+    print(f"{'weeks':>8} {'3 reads (ms)':>14} {'PlanStore (ms)':>16} {'saved':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for num_weeks in WEEK_COUNTS:
+            path = str(Path(tmp) / f"plan_{num_weeks}.json")
+            write_plan(path, num_weeks)
+            before = min(timeit.repeat(lambda: three_reads(path), number=1, repeat=REPEAT)) * 1000
+            after = min(timeit.repeat(lambda: plan_store_read(path), number=1, repeat=REPEAT)) * 1000
+            print(f"{num_weeks:>8} {before:>14.2f} {after:>16.2f} {before - after:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
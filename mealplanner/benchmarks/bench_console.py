@@ -0,0 +1,60 @@
+"""Cost per message written to the message area: old label concatenation vs GUIConsole.
+
+Run from the project directory:
+
+    python benchmarks/bench_console.py
+
+The label is repainted once every WRITES_PER_FRAME writes for GUIConsole,
+standing in for its once-per-interval repaint on the event loop.
+"""
+import asyncio
+import datetime
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from mealplanner.console import GUIConsole  # noqa: E402
+
+TOTAL = 100000
+BLOCK = 10000
+WRITES_PER_FRAME = 100
+OLD_LIMIT = 30000  # the old console gets too slow to run to TOTAL
+
+
+class Label:
+    text = ""
+
+
+def old_write(label, message):
+    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    label.text = label.text + f"{timestamp} - Info: {message}\n"
+
+
+def main():
+    loop = asyncio.new_event_loop()
+    console = GUIConsole(Label(), loop=loop)
+    old_label = Label()
+    print(f"{'messages':>9} {'old (us/write)':>15} {'GUIConsole (us/write)':>22}")
+    for block_start in range(0, TOTAL, BLOCK):
+        old = None
+        if block_start < OLD_LIMIT:
+            start = time.perf_counter()
+            for n in range(block_start, block_start + BLOCK):
+                old_write(old_label, f"message {n}")
+            old = (time.perf_counter() - start) * 1e6 / BLOCK
+
+        start = time.perf_counter()
+        for n in range(block_start, block_start + BLOCK):
+            console.write(f"message {n}")
+            if n % WRITES_PER_FRAME == 0:
+                console.render()
+        new = (time.perf_counter() - start) * 1e6 / BLOCK
+        old_text = f"{old:>15.2f}" if old is not None else f"{'-':>15}"
+        print(f"{block_start + BLOCK:>9} {old_text} {new:>22.2f}")
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
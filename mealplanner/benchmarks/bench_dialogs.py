@@ -0,0 +1,86 @@
+"""Edit dialog open latency: building a new window per press vs the pooled EditDinnerDialog.
+
+Run from the project directory:
+
+    python benchmarks/bench_dialogs.py
+
+Each round opens the dialog (timed) and then dismisses it the way Cancel
+does: the old dialog is closed, the pooled one hidden. Runs on the dummy
+backend unless TOGA_BACKEND is set; on a native backend most of the cost is
+creating and laying out the window, which the pooled dialog pays only once.
+"""
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("TOGA_BACKEND", "toga_dummy")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import toga  # noqa: E402
+from toga.constants import COLUMN, ROW  # noqa: E402
+from toga.style import Pack  # noqa: E402
+from toga.style.pack import END  # noqa: E402
+
+from mealplanner.widgets import EditDinnerDialog  # noqa: E402
+
+ROUNDS = 500
+
+
+class BenchApp(toga.App):
+    def startup(self):
+        self.main_window = toga.MainWindow(title="bench")
+        self.main_window.show()
+
+
+def open_old(week, day, meal):
+    # edit_dinner as it was before the dialogs were pooled
+    edit_window = toga.Window(title=f"Edit Dinner for Week {week}, {day}", resizable=True)
+    text_input = toga.TextInput(value=meal)
+    content = toga.Box(style=Pack(direction=COLUMN, margin=10))
+    content.add(toga.Label("Enter the new dinner:", style=Pack(margin_bottom=5)))
+    content.add(text_input)
+    ok_button = toga.Button("OK", on_press=lambda btn: None, style=Pack(width=60, margin=5))
+    cancel_button = toga.Button("Cancel", on_press=lambda btn: None, style=Pack(width=60, margin=5))
+    button_box = toga.Box(style=Pack(direction=ROW, justify_content=END, margin_top=20))
+    button_box.add(ok_button)
+    button_box.add(cancel_button)
+    content.add(button_box)
+    edit_window.content = content
+    edit_window.show()
+    return edit_window
+
+
+def measure(open_dialog, dismiss):
+    timings = []
+    for round_number in range(ROUNDS):
+        start = time.perf_counter()
+        dialog = open_dialog(round_number % 52 + 1, "Monday", f"Meal {round_number}")
+        timings.append(time.perf_counter() - start)
+        dismiss(dialog)
+    return timings
+
+
+def main():
+    BenchApp("Bench", "org.example.bench")
+    pooled = EditDinnerDialog(on_ok=lambda btn: None, on_cancel=lambda btn: None)
+
+    def open_pooled(week, day, meal):
+        pooled.show(week, day, meal)
+        return pooled
+
+    print(f"{ROUNDS} edit dialog opens on the {os.environ['TOGA_BACKEND']} backend")
+    print(f"{'dialog':>7} {'first (us)':>11} {'mean (us)':>10} {'p50 (us)':>9} {'p99 (us)':>9}")
+    for name, open_dialog, dismiss in (("new", open_old, lambda window: window.close()),
+                                       ("pooled", open_pooled, lambda dialog: dialog.hide())):
+        timings = measure(open_dialog, dismiss)
+        first = timings[0] * 1e6
+        timings.sort()
+        mean = statistics.mean(timings) * 1e6
+        print(f"{name:>7} {first:>11.1f} {mean:>10.1f} {timings[len(timings) // 2] * 1e6:>9.1f} "
+              f"{timings[int(len(timings) * 0.99)] * 1e6:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
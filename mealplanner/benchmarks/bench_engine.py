@@ -0,0 +1,53 @@
+"""Headless throughput: plan files loaded, edited and saved per second with PlanEngine.
+
+Run from the project directory:
+
+    python benchmarks/bench_engine.py
+
+Each file is a 52-week household plan. Nothing from toga is imported.
+"""
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from mealplanner.engine import PlanEngine  # noqa: E402
+from mealplanner.plan import DAYS  # noqa: E402
+
+FILES = 2000
+WEEKS = 52
+
+
+def write_plans(directory):
+    paths = []
+    for household in range(FILES):
+        path = str(Path(directory) / f"household_{household}.json")
+        weeks = {str(week): {day: f"Meal {(household + week) % 40}" for day in DAYS} for week in range(1, WEEKS + 1)}
+        with open(path, "w") as f:
+            json.dump({"weeks": weeks, "start_date": "2025-01-06", "num_weeks": WEEKS}, f, indent=4)
+        paths.append(path)
+    return paths
+
+
+def main():
+    print(f"toga imported: {'toga' in sys.modules}")
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_plans(tmp)
+        for name, edit in (("load only", False), ("load + edit + save", True)):
+            start = time.perf_counter()
+            for path in paths:
+                engine = PlanEngine(path).load()
+                if edit:
+                    engine.journal_mode = False # One snapshot write per file
+                    engine.set_meal(1, "Monday", "Soup")
+                engine.plan_store(load=False).close()
+            elapsed = time.perf_counter() - start
+            print(f"{name:>20}: {FILES / elapsed:8.0f} files/s ({elapsed * 1000 / FILES:.2f} ms per file)")
+    print(f"toga imported: {'toga' in sys.modules}")
+
+
+if __name__ == "__main__":
+    main()
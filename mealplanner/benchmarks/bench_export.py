@@ -0,0 +1,76 @@
+"""Export throughput and memory: streamed iCalendar and CSV exports of long plans.
+
+Run from the project directory:
+
+    python benchmarks/bench_export.py
+
+Exports plans of 1, 10 and 20 years with PlanEngine.export_plan and reports
+meals (rows) per second and the peak memory allocated while exporting
+(tracemalloc, excluding the plan itself). With streaming the peak stays
+at about one chunk of CHUNK_ROWS rows, whatever the plan length; "joined"
+builds the whole file as one string first, for comparison.
+"""
+import datetime
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from mealplanner.engine import PlanEngine  # noqa: E402
+from mealplanner.export import export_chunks, plan_days  # noqa: E402
+from mealplanner.plan import DAYS  # noqa: E402
+
+YEARS = [1, 10, 20]
+
+
+def make_engine(directory, weeks):
+    engine = PlanEngine(os.path.join(directory, f"plan_{weeks}.json"))
+    engine.weekly_plans = engine.get_default_weekly_meals()
+    engine.plan_start_date, engine.num_weeks = datetime.date(2025, 1, 6), weeks
+    engine.weekly_plans.num_weeks = weeks
+    for week in range(1, weeks + 1):
+        engine.weekly_plans[week] = {day: f"Meal {(week * 7 + index) % 120}, with sides" for index, day in enumerate(DAYS)}
+    return engine
+
+
+def measure(run):
+    """Return (result, seconds, peak bytes); timed without tracemalloc, which slows allocation down."""
+    start = time.perf_counter()
+    result = run()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    print(f"{'plan':>8} {'format':>6} {'rows/s':>12} {'file':>9} {'peak (streamed)':>16} {'peak (joined)':>14}")
+    with tempfile.TemporaryDirectory() as directory:
+        for years in YEARS:
+            weeks = years * 52
+            engine = make_engine(directory, weeks)
+            for export_format in ("ics", "csv"):
+                path = os.path.join(directory, f"plan_{weeks}.{export_format}")
+                rows, elapsed, peak = measure(lambda: engine.export_plan(path, export_format))
+
+                def joined():
+                    days = plan_days(engine.weekly_plans, engine.plan_start_date, engine.num_weeks)
+                    text = "".join(export_chunks(days, export_format))
+                    with open(path, "w", encoding="utf-8", newline="") as f:
+                        f.write(text)
+                    return len(text)
+
+                joined_peak = measure(joined)[2]
+                size = os.path.getsize(path)
+                print(f"{years:>5} yr {export_format:>6} {rows / elapsed:>12,.0f} {size / 1e6:>7.1f}MB "
+                      f"{peak / 1e6:>14.2f}MB {joined_peak / 1e6:>12.2f}MB")
+
+
+if __name__ == "__main__":
+    main()
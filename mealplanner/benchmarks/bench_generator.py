@@ -0,0 +1,64 @@
+"""Auto-fill speed: PlanGenerator's bitsets vs checking every meal against every rule.
+
+Run from the project directory:
+
+    python benchmarks/bench_generator.py [weeks, default 5000] [library size, default 200]
+
+Both fill the same weeks under the same rules (no repeat within 14 days, at
+most 3 uses a month, fish on Fridays); the naive filler picks uniformly from
+the meals that pass, the generator from its candidate bitset.
+"""
+import datetime
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from mealplanner.generator import FillRules, PlanGenerator  # noqa: E402
+from mealplanner.plan import DAYS  # noqa: E402
+
+START = datetime.date(2025, 1, 6)
+
+
+def naive_fill(library, rules, weeks, seed):
+    rng = random.Random(seed)
+    last_used = {}
+    month_uses = {}
+    filled = {}
+    for week in weeks:
+        filled[week] = {}
+        for index, day in enumerate(DAYS):
+            position = week * len(DAYS) + index
+            date = START + datetime.timedelta(days=position - len(DAYS))
+            allowed = rules.fixed_days.get(day, library)
+            candidates = [meal for meal in allowed
+                          if position - last_used.get(meal, -10**9) > rules.no_repeat_days
+                          and month_uses.get((date.year, date.month, meal), 0) < rules.max_per_month]
+            meal = rng.choice(candidates or allowed)
+            last_used[meal] = position
+            month_uses[date.year, date.month, meal] = month_uses.get((date.year, date.month, meal), 0) + 1
+            filled[week][day] = meal
+    return filled
+
+
+def main():
+    num_weeks = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    library = [f"Meal {number}" for number in range(int(sys.argv[2]) if len(sys.argv) > 2 else 200)]
+    rules = FillRules(no_repeat_days=14, max_per_month=3, fixed_days={"Friday": ["Fish and Chips", "Fish Pie", "Salmon"]})
+    weeks = range(1, num_weeks + 1)
+    print(f"{num_weeks} weeks from {len(library)} meals")
+
+    start = time.perf_counter()
+    naive_fill(library, rules, weeks, seed=1)
+    print(f"{'naive':>10}: {time.perf_counter() - start:7.3f} s")
+
+    start = time.perf_counter()
+    generator = PlanGenerator(library, rules, START, seed=1)
+    generator.fill({}, weeks)
+    print(f"{'bitsets':>10}: {time.perf_counter() - start:7.3f} s ({generator.violations} rule violations)")
+
+
+if __name__ == "__main__":
+    main()
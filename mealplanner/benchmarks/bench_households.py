@@ -0,0 +1,71 @@
+"""Switching between household plans: LRU cache of open plans vs reloading on every switch.
+
+Run from the project directory:
+
+    python benchmarks/bench_households.py [cache size in MB, default 2]
+
+20 households with 520-week plans (about 150 KB each on disk). 1000
+switches pick households with a skewed (Zipf-like) distribution, as when a
+few households are used most of the time; every 10th switch also edits a
+meal, so some evictions have to save. "reload" is the old behaviour.
+"""
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from mealplanner.households import HouseholdManager  # noqa: E402
+from mealplanner.plan import DAYS  # noqa: E402
+
+HOUSEHOLDS = 20
+WEEKS = 520
+SWITCHES = 1000
+
+
+def write_households(directory):
+    data_file = Path(directory) / "meal_plans.json"
+    (Path(directory) / "households").mkdir()
+    names = [f"Household {number}" for number in range(HOUSEHOLDS)]
+    for name in names:
+        weeks = {str(week): {day: f"Meal {(week * 7 + index) % 90}" for index, day in enumerate(DAYS)}
+                 for week in range(1, WEEKS + 1)}
+        with open(Path(directory) / "households" / f"{name}.json", "w") as f:
+            json.dump({"weeks": weeks, "start_date": "2025-01-06", "num_weeks": WEEKS}, f, indent=4)
+    return str(data_file), names
+
+
+def run(data_file, names, max_bytes):
+    rng = random.Random(21)
+    weights = [1 / (rank + 1) for rank in range(len(names))]
+    manager = HouseholdManager(data_file, max_bytes=max_bytes)
+    latencies = []
+    for switch in range(SWITCHES):
+        name = rng.choices(names, weights)[0]
+        start = time.perf_counter()
+        engine = manager.open(name)
+        latencies.append(time.perf_counter() - start)
+        if switch % 10 == 0:
+            engine.set_meal(rng.randrange(1, WEEKS + 1), rng.choice(DAYS), "Soup")
+    manager.close()
+    return manager, sorted(latencies)
+
+
+def main():
+    max_bytes = float(sys.argv[1]) * 1024 * 1024 if len(sys.argv) > 1 else 2 * 1024 * 1024
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file, names = write_households(tmp)
+        print(f"{HOUSEHOLDS} households, {SWITCHES} switches")
+        print(f"{'cache':>8} {'hit rate':>9} {'evictions':>10} {'median (ms)':>12} {'p95 (ms)':>9} {'total (s)':>10}")
+        for label, limit in (("reload", 0), (f"{max_bytes / 1024 / 1024:g} MB", max_bytes)):
+            manager, latencies = run(data_file, names, limit)
+            print(f"{label:>8} {manager.hits / SWITCHES:>9.0%} {manager.evictions:>10} "
+                  f"{latencies[len(latencies) // 2] * 1000:>12.3f} {latencies[int(len(latencies) * 0.95)] * 1000:>9.2f} "
+                  f"{sum(latencies):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Week navigation latency: rewiring Edit buttons by walking the widget tree vs DayRow.
+
+Run from the project directory:
+
+    python benchmarks/bench_navigation.py
+
+Both grids are built from real toga widgets on the dummy backend (set
+TOGA_BACKEND to measure another one) and pressed "Next Week" PRESSES times.
+The old grid reproduces the navigation code from before DayRow; the new grid
+runs MealPlanner's own navigation methods. Note that the dummy backend reads
+widget text back from its event log, which exaggerates the cost of the old
+grid's tree walk; relative numbers on a real backend will be smaller.
+"""
+import os
+import statistics
+import sys
+import time
+from functools import partial
+from pathlib import Path
+
+os.environ.setdefault("TOGA_BACKEND", "toga_dummy")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import toga  # noqa: E402
+from toga.constants import COLUMN, ROW  # noqa: E402
+from toga.style import Pack  # noqa: E402
+
+from mealplanner.app import MealPlanner  # noqa: E402
+from mealplanner.engine import PlanEngine  # noqa: E402
+from mealplanner.plan import DAYS, DEFAULT_WEEK_MEALS, WeekPlans  # noqa: E402
+from mealplanner.widgets import DayRow  # noqa: E402
+
+PRESSES = 1000
+
+
+class Grid:
+    """The parts of MealPlanner that week navigation touches."""
+
+    get_week_display_date = MealPlanner.get_week_display_date
+    update_navigation_buttons = MealPlanner.update_navigation_buttons
+
+    def __init__(self):
+        self.current_week = 1
+        self.num_weeks = PRESSES + 1
+        self.plan_start_date = None
+        # Every other week is planned, so each press changes all seven meal labels
+        stored = {week: {day: f"Meal {week} {day}" for day in DAYS} for week in range(2, self.num_weeks + 1, 2)}
+        self.weekly_plans = WeekPlans(stored, DEFAULT_WEEK_MEALS, self.num_weeks)
+        self.engine = PlanEngine("unused.json")  # Formats the week label
+        self.engine.weekly_plans, self.engine.num_weeks = self.weekly_plans, self.num_weeks
+        self.day_labels = {}
+        self.day_rows = {}
+        self.content = toga.Box(style=Pack(direction=COLUMN))
+        self.prev_button = toga.Button("< Previous Week", on_press=self.prev_week)
+        self.next_button = toga.Button("Next Week >", on_press=self.next_week)
+        self.week_label = toga.Label("")
+        self.content.add(toga.Box(children=[self.prev_button, self.week_label, self.next_button]))
+        self.content.add(toga.Button("Set Number of Weeks"))
+
+    def edit_dinner(self, widget, day, week):
+        pass
+
+
+class OldGrid(Grid):
+    def __init__(self):
+        super().__init__()
+        for day in DAYS:
+            day_box = toga.Box(style=Pack(direction=ROW))
+            meal_label = toga.Label(self.weekly_plans.get(self.current_week, {}).get(day, "No dinner planned"))
+            self.day_labels[day] = meal_label
+            edit_button = toga.Button("Edit", on_press=partial(self.edit_dinner, day=day, week=self.current_week))
+            day_box.add(toga.Label(f"{day}:"))
+            day_box.add(meal_label)
+            day_box.add(edit_button)
+            self.content.add(day_box)
+
+    def prev_week(self, widget):
+        pass
+
+    def next_week(self, widget):
+        if self.current_week < self.num_weeks:
+            self.current_week += 1
+            self.update_week_display()
+            self.update_edit_button_callbacks()
+            self.update_navigation_buttons()
+
+    def update_edit_button_callbacks(self):
+        for widget in self.content.children[2:]:
+            if isinstance(widget, toga.Box):
+                for sub_widget in widget.children:
+                    if isinstance(sub_widget, toga.Button) and sub_widget.text == "Edit":
+                        day = widget.children[0].text[:-1]
+                        sub_widget.on_press = partial(self.edit_dinner, day=day, week=self.current_week)
+
+    def update_week_display(self):
+        self.week_label.text = f"Week {self.current_week}: {self.get_week_display_date()}"
+        for day in DAYS:
+            meal = self.weekly_plans.get(self.current_week, {}).get(day, "No dinner planned")
+            self.day_labels[day].text = meal
+
+
+class NewGrid(Grid):
+    prev_week = MealPlanner.prev_week
+    next_week = MealPlanner.next_week
+    update_week_display = MealPlanner.update_week_display
+    edit_current_week = MealPlanner.edit_current_week
+
+    def __init__(self):
+        super().__init__()
+        for day in DAYS:
+            day_row = DayRow(day, self.edit_current_week)
+            self.day_rows[day] = day_row
+            self.day_labels[day] = day_row.meal_label
+            self.content.add(day_row)
+
+
+def press_next(grid):
+    timings = []
+    for _ in range(PRESSES):
+        start = time.perf_counter()
+        grid.next_week(grid.next_button)
+        timings.append(time.perf_counter() - start)
+    assert grid.current_week == PRESSES + 1
+    return timings
+
+
+def main():
+    print(f"{PRESSES} Next Week presses on the {os.environ['TOGA_BACKEND']} backend")
+    print(f"{'grid':>6} {'total (ms)':>11} {'mean (us)':>10} {'p50 (us)':>9} {'p99 (us)':>9}")
+    for name, grid_class in (("old", OldGrid), ("DayRow", NewGrid)):
+        timings = sorted(press_next(grid_class()))
+        total = sum(timings) * 1000
+        mean = statistics.mean(timings) * 1e6
+        p50 = timings[len(timings) // 2] * 1e6
+        p99 = timings[int(len(timings) * 0.99)] * 1e6
+        print(f"{name:>6} {total:>11.2f} {mean:>10.1f} {p50:>9.1f} {p99:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Memory held by a loaded plan: plain dicts from json.load vs the interned Week model.
+
+Run from the project directory:
+
+    python benchmarks/bench_plan_memory.py
+"""
+import gc
+import json
+import random
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from mealplanner.plan import DAYS  # noqa: E402
+from mealplanner.store import PlanStore  # noqa: E402
+
+NUM_WEEKS = 10000
+NUM_MEALS = 300
+
+
+def write_plan(path):
+    rng = random.Random(42)
+    meals = [f"Meal number {n}" for n in range(NUM_MEALS)]
+    weeks = {str(week): {day: rng.choice(meals) for day in DAYS} for week in range(1, NUM_WEEKS + 1)}
+    with open(path, "w") as f:
+        json.dump({"weeks": weeks, "start_date": "2025-01-06", "num_weeks": NUM_WEEKS}, f, indent=4)
+
+
+def retained_bytes(load):
+    gc.collect()
+    tracemalloc.start()
+    result = load()
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current, peak
+
+
+def load_dicts(path):
+    # What load_meals used to keep: the parsed document with int week keys
+    with open(path) as f:
+        data = json.load(f)
+    return {int(week): meals for week, meals in data["weeks"].items()}
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "meal_plans.json")
+        write_plan(path)
+        dict_current, dict_peak = retained_bytes(lambda: load_dicts(path))
+        week_current, week_peak = retained_bytes(lambda: PlanStore(path).load())
+    print(f"{NUM_WEEKS} weeks, {NUM_MEALS} distinct meals")
+    print(f"{'model':>14} {'retained (MB)':>14} {'peak (MB)':>10}")
+    print(f"{'dicts':>14} {dict_current / 1e6:>14.2f} {dict_peak / 1e6:>10.2f}")
+    print(f"{'interned Week':>14} {week_current / 1e6:>14.2f} {week_peak / 1e6:>10.2f}")
+    print(f"retained memory reduced {dict_current / week_current:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""UI-thread time per edit: synchronous saves vs the BackgroundWriter.
+
+Run from the project directory:
+
+    python benchmarks/bench_save_latency.py
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from mealplanner.store import PlanStore  # noqa: E402
+from mealplanner.writer import BackgroundWriter  # noqa: E402
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+WEEK_COUNTS = [10, 100, 1000]
+EDITS = 50
+
+
+def make_plans(num_weeks):
+    return {week: {day: f"Meal {week % 50} {day}" for day in DAYS} for week in range(1, num_weeks + 1)}
+
+
+def document(plans, num_weeks):
+    return {"weeks": plans, "start_date": "2025-01-06", "num_weeks": num_weeks}
+
+
+def per_edit_ms(edit):
+    start = time.perf_counter()
+    for n in range(EDITS):
+        edit(n)
+    return (time.perf_counter() - start) * 1000 / EDITS
+
+
+def main():
+    print(f"{'weeks':>6} {'sync save':>10} {'sync journal':>13} {'queued save':>12} {'queued journal':>15}  (ms per edit on the UI thread)")
+    with tempfile.TemporaryDirectory() as tmp:
+        for num_weeks in WEEK_COUNTS:
+            plans = make_plans(num_weeks)
+            store = PlanStore(str(Path(tmp) / f"plan_{num_weeks}.json"))
+            store.save(document(plans, num_weeks))
+
+            def sync_save(n):
+                plans[1]["Monday"] = f"Edit {n}"
+                store.save(document(plans, num_weeks))
+
+            def sync_journal(n):
+                plans[1]["Monday"] = f"Edit {n}"
+                store.append_edit(1, "Monday", f"Edit {n}")
+
+            writer = BackgroundWriter(debounce=0.05)
+
+            def queued_save(n):
+                # What MealPlanner.persist_plans does: copy the live plans and enqueue
+                plans[1]["Monday"] = f"Edit {n}"
+                writer.save(store, document({week: dict(meals) for week, meals in plans.items()}, num_weeks))
+
+            def queued_journal(n):
+                plans[1]["Monday"] = f"Edit {n}"
+                writer.append_edit(store, 1, "Monday", f"Edit {n}", {})
+
+            results = [per_edit_ms(sync_save), per_edit_ms(sync_journal)]
+            results.append(per_edit_ms(queued_save))
+            writer.flush()
+            results.append(per_edit_ms(queued_journal))
+            writer.close()
+            print(f"{num_weeks:>6} " + " ".join(f"{r:>{w}.3f}" for r, w in zip(results, (10, 13, 12, 15))))
+
+
+if __name__ == "__main__":
+    main()
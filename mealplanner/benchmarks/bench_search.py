@@ -0,0 +1,67 @@
+"""Meal search on a 10,000-week plan: index build, queries and incremental updates.
+
+Run from the project directory:
+
+    python benchmarks/bench_search.py [weeks, default 10000]
+
+"next" is what the search box runs (PlanEngine.next_meal_match), "list" builds
+the full list of matches (search_meals) and "scan" finds the same list by
+reading every week.
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from mealplanner.engine import PlanEngine  # noqa: E402
+from mealplanner.plan import DAYS  # noqa: E402
+from mealplanner.search import tokenize  # noqa: E402
+
+QUERIES = ("lasagne", "chicken veggies", "meal 7", "pasta")
+REPEATS = 20
+
+
+def scan(engine, query):
+    tokens = set(tokenize(query))
+    return [(week, day) for week in range(1, engine.num_weeks + 1) for day in DAYS
+            if tokens <= set(tokenize(engine.meal(week, day)))]
+
+
+def per_call(fn, *args):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        result = fn(*args)
+    return (time.perf_counter() - start) * 1000 / REPEATS, result
+
+
+def main():
+    num_weeks = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = PlanEngine(str(Path(tmp) / "meal_plans.json")).load()
+        engine.journal_mode = False
+        engine.set_num_weeks(num_weeks)
+        for week in range(1, num_weeks + 1, 3):
+            engine.weekly_plans[week]["Tuesday"] = f"Meal {week % 300}"
+        engine.weekly_plans[num_weeks // 2]["Friday"] = "Lasagne"
+
+        start = time.perf_counter()
+        engine.meal_index
+        print(f"{num_weeks} weeks, index built in {(time.perf_counter() - start) * 1000:.0f} ms")
+        print(f"{'query':>16} {'hits':>6} {'next (ms)':>10} {'list (ms)':>10} {'scan (ms)':>10}")
+        for query in QUERIES:
+            following, _ = per_call(engine.next_meal_match, query, num_weeks // 3)
+            indexed, hits = per_call(engine.search_meals, query)
+            scanned, expected = per_call(scan, engine, query) if num_weeks <= 20000 else (float("nan"), hits)
+            assert hits == expected
+            print(f"{query:>16} {len(hits):>6} {following:>10.3f} {indexed:>10.3f} {scanned:>10.1f}")
+
+        start = time.perf_counter()
+        for week in range(1, 1001):
+            engine.meal_index.update(week, "Monday", "Soup")
+        print(f"index update: {(time.perf_counter() - start) * 1000:.1f} us per edit")
+
+
+if __name__ == "__main__":
+    main()
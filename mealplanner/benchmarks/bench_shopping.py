@@ -0,0 +1,81 @@
+"""Shopping list for a whole year: cached week totals vs adding up the recipes each time.
+
+Run from the project directory:
+
+    python benchmarks/bench_shopping.py
+
+A 52-week plan drawn from 300 recipes of 12 ingredients each, out of 200
+ingredients (each always measured in the same kind of unit). "naive" reads
+every day's recipe and converts its units on every call; "load recipes"
+reads recipes.json into ingredient vectors, "cold" is the first
+PlanEngine.shopping_list call after that, "warm" a repeat, and "after edit"
+a repeat after one meal in the range changed.
+"""
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from mealplanner.engine import PlanEngine  # noqa: E402
+from mealplanner.plan import DAYS  # noqa: E402
+from mealplanner.recipes import normalise_unit, shopping_items  # noqa: E402
+
+WEEKS = 52
+REPEATS = 20
+UNITS = ["g", "kg", "ml", "l", "tbsp", "cups", ""]
+
+
+def naive(engine, recipes):
+    totals = {}
+    for week in range(1, WEEKS + 1):
+        for day in DAYS:
+            for name, quantity, unit in recipes.get(engine.meal(week, day), []):
+                base_unit, factor = normalise_unit(unit)
+                key = (name.casefold(), base_unit)
+                totals[key] = totals.get(key, 0) + quantity * factor
+    return shopping_items(totals)
+
+
+def timed(fn, repeats=REPEATS):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = fn()
+    return (time.perf_counter() - start) * 1000 / repeats, result
+
+
+def main():
+    rng = random.Random(20)
+    ingredients = [(f"ingredient {number}", rng.choice(UNITS)) for number in range(200)]
+    recipes = {f"Meal {number}": [[name, rng.randrange(1, 500), unit] for name, unit in rng.sample(ingredients, 12)]
+               for number in range(300)}
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(Path(tmp) / "recipes.json", "w") as f:
+            json.dump(recipes, f)
+        engine = PlanEngine(str(Path(tmp) / "meal_plans.json")).load()
+        engine.journal_mode = False
+        engine.set_num_weeks(WEEKS)
+        engine.auto_fill(library=list(recipes), seed=1)
+        engine.save_meals = lambda: None  # Time the list, not the saves
+
+        naive_ms, expected = timed(lambda: naive(engine, recipes))
+        load_ms, _ = timed(engine.load_recipes, repeats=1)
+        cold_ms, (items, _) = timed(lambda: engine.shopping_list(1, WEEKS), repeats=1)
+        assert items == expected
+        warm_ms, _ = timed(lambda: engine.shopping_list(1, WEEKS))
+
+        def edit_and_list():
+            engine.set_meal(rng.randrange(1, WEEKS + 1), rng.choice(DAYS), f"Meal {rng.randrange(300)}")
+            return engine.shopping_list(1, WEEKS)
+        edited_ms, _ = timed(edit_and_list)
+
+    print(f"{WEEKS} weeks, {len(items)} ingredients")
+    for name, elapsed in (("naive", naive_ms), ("load recipes", load_ms), ("cold", cold_ms), ("warm", warm_ms), ("after edit", edited_ms)):
+        print(f"{name:>12}: {elapsed:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
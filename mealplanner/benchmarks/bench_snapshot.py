@@ -0,0 +1,79 @@
+"""JSON plan files vs binary snapshots: load, first-week access, saves and size.
+
+Run from the project directory:
+
+    python benchmarks/bench_snapshot.py [weeks, default 50000]
+
+Builds a synthetic plan with the given number of weeks and saves it through
+PlanStore (JSON) and SnapshotPlanStore (binary). "load" opens the store,
+"first week" then reads week 1, and "full read" materialises every week.
+"edit save" is the mean time of EDITS saves in a row of one edited meal each,
+saving what the engine would: the whole plan as JSON, or the changed weeks
+to the snapshot.
+"""
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from mealplanner.plan import DAYS  # noqa: E402
+from mealplanner.snapshot import SnapshotPlanStore  # noqa: E402
+from mealplanner.store import PlanStore  # noqa: E402
+
+REPEATS = 3
+EDITS = 20
+
+
+def timed(fn):
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def save_fresh(store_class, path, document):
+    if os.path.exists(path):
+        os.remove(path)
+    store_class(path).save(document, backups=0)
+
+
+def edit_saves(store_class, path, start_date, num_weeks):
+    store = store_class(path).load()
+    plans = store.plan_weeks({}, 0)
+    start = time.perf_counter()
+    for edit in range(EDITS):
+        plans[edit % 7 + 1]["Monday"] = f"Edit {edit}"
+        weeks = plans.changed_weeks() if store.SAVES_CHANGES_ONLY else plans.persisted_weeks()
+        store.save({"weeks": weeks, "start_date": start_date, "num_weeks": num_weeks}, backups=0)
+    return (time.perf_counter() - start) / EDITS
+
+
+def main():
+    num_weeks = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    weeks = {week: {day: f"Meal {(week * 7 + index) % 500}" for index, day in enumerate(DAYS)}
+             for week in range(1, num_weeks + 1)}
+    document = {"weeks": weeks, "start_date": "2025-01-06", "num_weeks": num_weeks}
+    print(f"{num_weeks} weeks")
+    print(f"{'format':>7} {'save (ms)':>10} {'load (ms)':>10} {'first week (ms)':>16} {'full read (ms)':>15} "
+          f"{'edit save (ms)':>15} {'size (KB)':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, store_class, path in (("json", PlanStore, "meal_plans.json"),
+                                        ("binary", SnapshotPlanStore, "meal_plans.mealsnap")):
+            path = os.path.join(tmp, path)
+            save, _ = timed(lambda: save_fresh(store_class, path, document))
+            load, _ = timed(lambda: store_class(path).load())
+            first, _ = timed(lambda: dict(store_class(path).load().weeks[1]))
+            full, _ = timed(lambda: {week: dict(meals) for week, meals in store_class(path).load().weeks.items()})
+            size = os.path.getsize(path)
+            edit = edit_saves(store_class, path, document["start_date"], num_weeks)
+            print(f"{name:>7} {save * 1000:>10.1f} {load * 1000:>10.2f} {first * 1000:>16.2f} "
+                  f"{full * 1000:>15.1f} {edit * 1000:>15.2f} {size / 1024:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Load and edit latency of the JSON and SQLite storage backends.
+
+Run from the project directory:
+
+    python benchmarks/bench_storage_backends.py
+
+"load" opens the plan and reads the first (visible) week. "edit" saves one
+changed meal: for JSON both a full rewrite (journal_mode off) and a journal
+append, for SQLite a single-row upsert.
+"""
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from mealplanner.sqlite_store import SQLitePlanStore, migrate_json_to_sqlite  # noqa: E402
+from mealplanner.store import PlanStore  # noqa: E402
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+DEFAULT_WEEK = {day: "Default" for day in DAYS}
+WEEK_COUNTS = [10, 1000, 100000]
+
+
+def write_plan(path, num_weeks):
+    weeks = {str(week): {day: f"Meal {week % 50} {day}" for day in DAYS} for week in range(1, num_weeks + 1)}
+    with open(path, "w") as f:
+        json.dump({"weeks": weeks, "start_date": "2025-01-06", "num_weeks": num_weeks}, f, indent=4)
+
+
+def timed_ms(function, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    print(f"{'weeks':>7} {'json load':>10} {'sqlite load':>12} {'json rewrite':>13} {'json journal':>13} {'sqlite upsert':>14}  (ms)")
+    with tempfile.TemporaryDirectory() as tmp:
+        for num_weeks in WEEK_COUNTS:
+            repeat = 5 if num_weeks < 100000 else 1
+            json_path = str(Path(tmp) / f"plan_{num_weeks}.json")
+            db_path = str(Path(tmp) / f"plan_{num_weeks}.sqlite3")
+            write_plan(json_path, num_weeks)
+            migrate_json_to_sqlite(json_path, db_path)
+
+            def json_load():
+                PlanStore(json_path).load().plan_weeks(DEFAULT_WEEK, num_weeks)[1]
+
+            def sqlite_load():
+                store = SQLitePlanStore(db_path).load()
+                store.plan_weeks(DEFAULT_WEEK, num_weeks)[1]
+                store.close()
+
+            json_store = PlanStore(json_path).load()
+            plans = json_store.plan_weeks(DEFAULT_WEEK, num_weeks)
+
+            def json_rewrite():
+                plans[1]["Monday"] = "Edited"
+                json_store.save({"weeks": plans, "start_date": "2025-01-06", "num_weeks": num_weeks}, backups=0)
+
+            def json_journal():
+                json_store.append_edit(1, "Monday", "Edited")
+
+            sqlite_store = SQLitePlanStore(db_path).load()
+
+            def sqlite_upsert():
+                sqlite_store.append_edit(1, "Monday", "Edited")
+
+            results = [timed_ms(json_load, repeat), timed_ms(sqlite_load, repeat),
+                       timed_ms(json_rewrite, repeat), timed_ms(json_journal, repeat), timed_ms(sqlite_upsert, repeat)]
+            sqlite_store.close()
+            print(f"{num_weeks:>7} " + " ".join(f"{r:>{w}.2f}" for r, w in zip(results, (10, 12, 13, 13, 14))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Loading a very large plan file: json.load then copy vs the streaming loader.
+
+Run from the project directory:
+
+    python benchmarks/bench_streaming_load.py [size in MB, default 100]
+
+Writes a synthetic indent=4 plan file of about the given size and loads it
+with PlanStore both ways, reporting load time and peak traced memory
+(tracemalloc; timed runs are separate, untraced runs).
+"""
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from mealplanner import store as store_module  # noqa: E402
+from mealplanner.plan import DAYS  # noqa: E402
+from mealplanner.store import PlanStore  # noqa: E402
+
+BYTES_PER_WEEK = 275  # roughly, at indent=4 with the meal names below
+
+
+def write_plan(path, size_mb):
+    num_weeks = size_mb * 1024 * 1024 // BYTES_PER_WEEK
+    with open(path, "w") as f:
+        f.write('{\n    "weeks": {')
+        for week in range(1, num_weeks + 1):
+            meals = {day: f"Meal {(week * 7 + index) % 500}" for index, day in enumerate(DAYS)}
+            body = json.dumps(meals, indent=4).replace("\n", "\n        ")
+            f.write(f'{"," if week > 1 else ""}\n        "{week}": {body}')
+        f.write(f'\n    }},\n    "start_date": "2025-01-06",\n    "num_weeks": {num_weeks}\n}}\n')
+    return num_weeks
+
+
+def load(path, streaming):
+    store_module.STREAMING_MIN_BYTES = 0 if streaming else float("inf")
+    return PlanStore(path).load()
+
+
+def main():
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "meal_plans.json")
+        num_weeks = write_plan(path, size_mb)
+        print(f"{os.path.getsize(path) / 1024 / 1024:.0f} MB, {num_weeks} weeks")
+        print(f"{'loader':>10} {'load (s)':>9} {'peak (MB)':>10}")
+        for name, streaming in (("json.load", False), ("streaming", True)):
+            gc.collect()
+            start = time.perf_counter()
+            store = load(path, streaming)
+            elapsed = time.perf_counter() - start
+            assert len(store.weeks) == num_weeks
+            del store
+            gc.collect()
+            tracemalloc.start()
+            store = load(path, streaming)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            del store
+            print(f"{name:>10} {elapsed:>9.2f} {peak / 1024 / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Picking up an external change to the plan file: week-level merge vs reloading the plan.
+
+Run from the project directory:
+
+    python benchmarks/bench_watcher.py [weeks, default 520]
+
+Another program rewrites the data file with one week changed. "merge" is
+PlanEngine.reload_changes, which re-reads the file but only replaces the
+changed week in the live plan and its views (the search index is built
+beforehand, as in the app); "reload" opens a new engine and rebuilds the
+index, as restarting the app would.
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from mealplanner.engine import PlanEngine  # noqa: E402
+from mealplanner.plan import DAYS  # noqa: E402
+
+ROUNDS = 20
+
+
+def write_plan(path, weeks, changed_week, meal):
+    document = {"weeks": {str(week): {day: f"Meal {(week * 7 + index) % 90}" for index, day in enumerate(DAYS)}
+                          for week in range(1, weeks + 1)},
+                "start_date": "2025-01-06", "num_weeks": weeks}
+    document["weeks"][str(changed_week)]["Monday"] = meal
+    with open(path + ".tmp", "w") as f:
+        json.dump(document, f, indent=4)
+    os.replace(path + ".tmp", path)
+
+
+def main():
+    weeks = int(sys.argv[1]) if len(sys.argv) > 1 else 520
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "meal_plans.json")
+        write_plan(path, weeks, 1, "Meal 0")
+        engine = PlanEngine(path).load()
+        engine.meal_index
+        merge = reload = 0.0
+        for number in range(1, ROUNDS + 1):
+            write_plan(path, weeks, number % weeks + 1, f"Changed {number}")
+
+            start = time.perf_counter()
+            changes = engine.reload_changes()
+            merge += time.perf_counter() - start
+            assert changes.weeks == sorted({number % weeks + 1, (number - 1) % weeks + 1}), changes
+
+            start = time.perf_counter()
+            PlanEngine(path).load().meal_index
+            reload += time.perf_counter() - start
+        print(f"{weeks} weeks, {ROUNDS} external changes")
+        print(f"merge:  {merge / ROUNDS * 1000:8.2f} ms per change")
+        print(f"reload: {reload / ROUNDS * 1000:8.2f} ms per change")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,12 @@
-from mealplanner.app import main
+import sys
 
 if __name__ == "__main__":
+    if sys.argv[1:2] == ["batch"]:
+        # Headless batch jobs; see mealplanner.batch
+        from mealplanner.batch import main as batch_main
+
+        sys.exit(batch_main(sys.argv[2:]))
+
+    from mealplanner.app import main
+
     main().main_loop()
@@ -0,0 +1,56 @@
+import datetime
+from collections import namedtuple
+
+from .plan import DAYS
+from .search import SlotIndex
+
+MealFrequency = namedtuple("MealFrequency", "meal count last_served days_since")
+
+
+def date_slot(start_date, date):
+    """Return the slot (see search.slot) of ``date`` in a plan starting on ``start_date``."""
+    return (date - start_date).days + len(DAYS)
+
+
+def slot_date(start_date, position):
+    return start_date + datetime.timedelta(days=position - len(DAYS))
+
+
+class MealStats(SlotIndex):
+    """How often each meal is planned and on which days, kept up to date edit by edit.
+
+    ``counts[meal]`` is the number of days ``meal`` is planned; an edit
+    adjusts it and flips one bit of the meal's slot bitset, with no rescan
+    (a bit flip copies the bitset, see SlotIndex). When a meal was last
+    served is found from the bitset (the highest slot up to a date), so it
+    needs no rescan either. Meals are grouped by their exact name.
+    """
+
+    def meal_keys(self, meal):
+        return (meal,)
+
+    def last_slot(self, meal, before):
+        """Return the last slot up to and including ``before`` that has ``meal``, or None."""
+        if before < 0:
+            return None
+        last = (self.postings.get(meal, 0) & ((1 << (before + 1)) - 1)).bit_length() - 1
+        return last if last >= 0 else None
+
+    def report(self, start_date=None, today=None):
+        """Return a MealFrequency per meal, most often planned first.
+
+        ``last_served`` is the last date up to ``today`` the meal is planned,
+        and ``days_since`` the days from then to ``today``; both are None
+        without a ``start_date`` or if the meal isn't planned by ``today``.
+        """
+        today = today or datetime.date.today()
+        today_slot = date_slot(start_date, today) if start_date else None
+        rows = []
+        for meal, count in sorted(self.counts.items(), key=lambda item: (-item[1], item[0])):
+            last = self.last_slot(meal, today_slot) if today_slot is not None else None
+            if last is None:
+                rows.append(MealFrequency(meal, count, None, None))
+            else:
+                last_served = slot_date(start_date, last)
+                rows.append(MealFrequency(meal, count, last_served, (today - last_served).days))
+        return rows
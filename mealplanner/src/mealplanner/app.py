@@ -1,36 +1,84 @@
 import toga
 from toga.style import Pack
-from toga.style.pack import CENTER, RIGHT, END, LEFT, BOLD
+from toga.style.pack import CENTER, LEFT, BOLD
 from toga.constants import COLUMN, ROW
-from functools import partial
-import json
-import os
 import datetime
+import os
 import sys  # Import the sys module
-import datetime
-
-DATA_FILE = "meal_plans.json"
+from .console import GUIConsole, MAX_LINES
+from .engine import DATA_FILE, STORAGE_BACKEND, PlanEngine
+from .households import DEFAULT_HOUSEHOLD, HouseholdManager
+from .log import HEADLESS, LEVEL, LOG_FILE, configure_logging, logger
+from .plan import DAYS
+from .watcher import PlanWatcher
+from .widgets import BulkEditDialog, DayRow, EditDinnerDialog, MonthDialog, NO_DINNER, SetWeeksDialog
+
+# "full" builds the whole window before showing it; "grid-first" shows the week
+# grid first and builds the message area and background writer when idle
+STARTUP_MODE = os.environ.get("MEALPLANNER_STARTUP", "full")
 # NUM_WEEKS will now be loaded/set dynamically
+STATS_SHOWN = 10 # Meals listed by the Meal Stats button
+
+
+def _engine_attribute(name):
+    return property(lambda self: getattr(self.engine, name), lambda self, value: setattr(self.engine, name, value))
+
 
 class MealPlanner(toga.App):
     def __init__(self, formal_name=None, app_id=None, **kwargs):
-            super().__init__(formal_name="Meal Planner", app_id="com.johndavid.whatsfordinner", **kwargs)
-            self.weekly_plans = {}
+            # Set before toga.App.__init__, which may run startup() (toga-dummy does)
+            self.started = False # startup() has built the window; later calls do nothing
+            self.engine = PlanEngine(DATA_FILE, STORAGE_BACKEND) # Plan state and logic, see engine.py
             self.current_week = 1
             self.day_labels = {}
-            self.plan_start_date = None
-            self.num_weeks = 4
-            self.DATA_FILE = DATA_FILE
-
+            self.day_rows = {}
+            self.edit_dialog = None # Dialogs are built on first use and reused
+            self.set_weeks_dialog = None
+            self.bulk_edit_dialog = None
+            self.month_dialog = None
+            self.calendar_month = None # (year, month) shown in the calendar
+            self.search_hit = None # (week, day) the last search jumped to
+            self.households = None # Open household plans, see households.py
+            self.household = DEFAULT_HOUSEHOLD
+            self._refreshing_households = False
+            self.plan_watcher = None # Reloads changes other programs make to the plan file
+            self.console_max_lines = MAX_LINES # Messages kept in each message label
+            self.log_level = LEVEL # Messages below this level are dropped unformatted
+            self.log_file = LOG_FILE # Optional rotating log file
+            self.headless = HEADLESS # No GUI log sink or stdout/stderr redirection (tests, kiosks)
+            self.log_handler = None
+            self.stdout_console = None
+            self.stderr_console = None
+            self.startup_mode = STARTUP_MODE
+            super().__init__(formal_name="Meal Planner", app_id="com.johndavid.whatsfordinner", **kwargs)
 
     def startup(self):
+        if self.started:
+            return
+        self.started = True
         main_box = toga.Box(style=Pack(direction=COLUMN, margin=10))  # Changed to COLUMN
+        # Records logged before the message labels exist are held by the GUI handler
+        self.log_handler = configure_logging(self.log_level, gui=not self.headless, log_file=self.log_file)
 
-        self.load_settings() # Load NUM_WEEKS and potentially other settings
-        self.weekly_plans = self.load_meals()
+        self.engine.load() # Settings, meals and start date
+        self.households = HouseholdManager(self.DATA_FILE, self.STORAGE_BACKEND)
+        self.households.adopt(self.household, self.engine)
         self.current_week = 1  # Start with the first week
         self.day_labels = {}
-        self.plan_start_date = self.load_start_date() # Load or default start date
+        self.day_rows = {}
+        grid_first = self.startup_mode == "grid-first"
+        if not grid_first:
+            self.start_writer()
+
+        # Household switcher; recently used households stay loaded
+        household_box = toga.Box(style=Pack(direction=ROW, align_items=CENTER, margin_bottom=10))
+        self.household_selection = toga.Selection(items=self.households.names(), value=self.household,
+                                                  on_change=self.handle_household_change, style=Pack(flex=1))
+        self.new_household_input = toga.TextInput(placeholder="New household", style=Pack(width=150, margin_left=5))
+        household_box.add(self.household_selection)
+        household_box.add(self.new_household_input)
+        household_box.add(toga.Button("Add", on_press=self.add_household, style=Pack(width=60, margin_left=5)))
+        main_box.add(household_box)
 
         # Week navigation buttons
         week_nav_box = toga.Box(style=Pack(direction=ROW, align_items=CENTER, margin_bottom=10))
@@ -48,19 +96,65 @@ class MealPlanner(toga.App):
         # Set Number of Weeks Button
         set_weeks_button = toga.Button("Set Number of Weeks", on_press=self.show_set_weeks_dialog, style=Pack(margin_bottom=10))
         main_box.add(set_weeks_button)
+        auto_fill_button = toga.Button("Auto-fill Empty Weeks", on_press=self.auto_fill, style=Pack(margin_bottom=10))
+        main_box.add(auto_fill_button)
+        bulk_edit_button = toga.Button("Bulk Edit Weeks", on_press=self.show_bulk_edit_dialog, style=Pack(margin_bottom=10))
+        main_box.add(bulk_edit_button)
+
+        # Meal search: each Find jumps to the next week with a matching meal
+        search_box = toga.Box(style=Pack(direction=ROW, align_items=CENTER, margin_bottom=10))
+        self.search_input = toga.TextInput(placeholder="Search meals", on_confirm=self.find_meal, style=Pack(flex=1))
+        search_box.add(self.search_input)
+        search_box.add(toga.Button("Find", on_press=self.find_meal, style=Pack(width=80, margin_left=5)))
+        search_box.add(toga.Button("Meal Stats", on_press=self.show_meal_stats, style=Pack(margin_left=5)))
+        search_box.add(toga.Button("Shopping List", on_press=self.show_shopping_list, style=Pack(margin_left=5)))
+        main_box.add(search_box)
+
+        # Jump to the week of a date, or pick one from a month calendar
+        date_box = toga.Box(style=Pack(direction=ROW, align_items=CENTER, margin_bottom=10))
+        self.date_input = toga.TextInput(placeholder="YYYY-MM-DD or today", on_confirm=self.go_to_date, style=Pack(flex=1))
+        date_box.add(self.date_input)
+        date_box.add(toga.Button("Go to Date", on_press=self.go_to_date, style=Pack(margin_left=5)))
+        date_box.add(toga.Button("Calendar", on_press=self.show_calendar, style=Pack(margin_left=5)))
+        date_box.add(toga.Button("Export .ics", on_press=lambda widget: self.export_plan("ics"), style=Pack(margin_left=5)))
+        date_box.add(toga.Button("Export .csv", on_press=lambda widget: self.export_plan("csv"), style=Pack(margin_left=5)))
+        main_box.add(date_box)
+
+        meals = self.weekly_plans.get(self.current_week, {})
+        for day in DAYS:
+            day_row = DayRow(day, self.edit_current_week, meals.get(day, NO_DINNER))
+            self.day_rows[day] = day_row
+            self.day_labels[day] = day_row.meal_label
+            main_box.add(day_row)
+
+        if not grid_first:
+            self.build_message_area(main_box)
+
+        self.main_window = toga.MainWindow(title=self.formal_name, size=(800, 600))
+        self.main_window.content = main_box
+        self.main_window.show()
+        self.update_week_display()
+        self.update_navigation_buttons()
+
+        if grid_first:
+            # The week grid is on screen; build the rest once the event loop is idle
+            self.loop.call_soon(self.finish_startup)
+        else:
+            self.start_console()
+        self.watch_plan_file()
 
-        days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-        for day in days:
-            day_box = toga.Box(style=Pack(direction=ROW, align_items=CENTER, margin=10)) # Changed to ROW
-            day_label = toga.Label(f"{day}:", style=Pack(width=100, text_align=RIGHT))
-            meal_label = toga.Label(self.weekly_plans.get(self.current_week, {}).get(day, "No dinner planned"), id=f"{day.lower()}-dinner", style=Pack(width=200, text_align=LEFT)) # Adjusted width and
-            self.day_labels[day] = meal_label
-            edit_button = toga.Button("Edit", on_press=partial(self.edit_dinner, day=day, week=self.current_week), style=Pack(width=80)) # Passing current_week
-            day_box.add(day_label)
-            day_box.add(meal_label)
-            day_box.add(edit_button)
-            main_box.add(day_box)
+    def finish_startup(self):
+        """Build what "grid-first" startup deferred: the message area and the background writer."""
+        if self.stdout_console is None:
+            self.build_message_area(self.main_window.content)
+            self.start_console()
+        self.start_writer()
 
+    def start_writer(self):
+        # Saves happen on a worker thread so slow disks don't block the event loop
+        self.engine.start_writer()
+
+    def build_message_area(self, main_box):
         # Message Area with Title and ScrollContainer
         message_title = toga.Label("Messages:", style=Pack(margin_top=15, font_weight='bold'))
         clear_button = toga.Button("Clear Messages", on_press=self.clear_messages, style=Pack(margin_top=8))
@@ -73,253 +167,347 @@ class MealPlanner(toga.App):
 
         message_scroll = toga.ScrollContainer(content=message_content_box, style=Pack(flex=1, height=100))
 
-        main_box.add(message_title)
-        main_box.add(message_scroll)
-        main_box.add(clear_button)
-
-        self.main_window = toga.MainWindow(title=self.formal_name, size=(800, 600))
-        self.main_window.content = main_box
-        self.main_window.show()
-        self.update_week_display()
-        self.update_navigation_buttons()
-
-        # Redirect stdout and stderr to our separate labels
-        sys.stdout = self.GUIConsole(self.stdout_label)
-        self.stderr_console = self.GUIConsole(self.stderr_label, is_stderr=True)
-        sys.stderr = self.GUIConsole(self.stderr_label)
-
-    class GUIConsole:
-        def __init__(self, text_widget, is_stderr=False):
-            self.text_widget = text_widget
-            self.is_stderr = is_stderr
+        main_box.add(message_title, message_scroll, clear_button)
 
-        def write(self, message):
-            timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            prefix = "Info: " if not self.is_stderr else "Error: "
-            formatted_message = f"{timestamp} - {prefix}{message}\n"
-            self.text_widget.text = self.text_widget.text + formatted_message
+    def start_console(self):
+        self.stdout_console = self.GUIConsole(self.stdout_label, max_lines=self.console_max_lines, loop=self.loop)
+        self.stderr_console = self.GUIConsole(self.stderr_label, is_stderr=True, max_lines=self.console_max_lines, loop=self.loop)
+        if self.log_handler is not None:
+            # Show log records and stray stdout/stderr output in our separate labels
+            self.log_handler.attach(self.stdout_console, self.stderr_console)
+            sys.stdout = self.stdout_console
+            sys.stderr = self.stderr_console
 
-        def flush(self):
-            pass
+    GUIConsole = GUIConsole
 
     def clear_messages(self, widget):
-            self.stdout_label.text = ""
-            self.stderr_label.text = ""
+            self.stdout_console.clear()
+            self.stderr_console.clear()
+
+    # Plan state and operations live on the engine; the app keeps these names for its views and tests
+    DATA_FILE = _engine_attribute("data_file")
+    STORAGE_BACKEND = _engine_attribute("storage_backend")
+    weekly_plans = _engine_attribute("weekly_plans")
+    num_weeks = _engine_attribute("num_weeks")
+    plan_start_date = _engine_attribute("plan_start_date")
+    journal_mode = _engine_attribute("journal_mode")
+    save_debounce = _engine_attribute("save_debounce")
+    writer = _engine_attribute("writer")
 
     def load_settings(self):
-        if os.path.exists(self.DATA_FILE):
-            try:
-                with open(self.DATA_FILE, 'r') as f:
-                    data = json.load(f)
-                    self.num_weeks = data.get('num_weeks', 4) # Default to 4 if not found
-            except (json.JSONDecodeError, FileNotFoundError):
-                self.num_weeks = 4
-        else:
-            self.num_weeks = 4
+        self.engine.load_settings()
 
     def load_meals(self):
-        if os.path.exists(self.DATA_FILE):  # Changed to self.DATA_FILE
-            try:
-                with open(self.DATA_FILE, 'r') as f:
-                    data = json.load(f)
-                    weekly_data_str_keys = data.get('weeks', {})
-                    weekly_data = {}
-                    for week_str, meals in weekly_data_str_keys.items():
-                        try:
-                            week_int = int(week_str)
-                            weekly_data[week_int] = meals
-                        except ValueError:
-                            sys.stderr.write(f"Warning: Skipping invalid week key in data file: {week_str}\n")
-
-                    # Ensure we have enough weeks in the data (using integer keys now)
-                    for week in range(1, self.num_weeks + 1):
-                        if week not in weekly_data:
-                            weekly_data[week] = self.get_default_week_meals()
-
-                    start_date_str = data.get('start_date')
-                    if start_date_str:
-                        self.plan_start_date = self.parse_date(start_date_str)
-                    else:
-                        self.plan_start_date = self.get_default_start_date()
-                    return weekly_data
-            except json.JSONDecodeError:
-                sys.stderr.write(f"Error decoding JSON from {self.DATA_FILE}.  Using default meals.\n")
-                return self.get_default_weekly_meals()
-            except FileNotFoundError:
-                sys.stderr.write(f"File not found: {self.DATA_FILE}. Using default meals.\n")
-                return self.get_default_weekly_meals()  # Handle file not found explicitly
-        else:
-            return self.get_default_weekly_meals()
-
-
-    def parse_date(self, date_str):
-        try:
-            return datetime.datetime.strptime(date_str, '%Y-%m-%d').date()
-        except ValueError:
-            return self.get_default_start_date()
-
-    def get_default_start_date(self):
-        return datetime.date.today() + datetime.timedelta(days=-datetime.date.today().weekday()) # Default to current week's Monday
+        return self.engine.load_meals()
 
     def load_start_date(self):
-        if os.path.exists(self.DATA_FILE):
-            try:
-                with open(self.DATA_FILE, 'r') as f:
-                    data = json.load(f)
-                    start_date_str = data.get('start_date')  # Changed from .get('weeks', {}).get('start_date')
-                    if start_date_str:
-                        return self.parse_date(start_date_str)
-            except (json.JSONDecodeError, FileNotFoundError):
-                pass  # Don't raise an error, just return the default
-            # The following line should be *outside* the if block
-            return self.get_default_start_date()
+        return self.engine.load_start_date()
 
     def get_default_weekly_meals(self):
-        default_meals = self.get_default_week_meals()
-        return {week: default_meals.copy() for week in range(1, self.num_weeks + 1)}
+        return self.engine.get_default_weekly_meals()
 
     def get_default_week_meals(self):
-        return {
-            "Monday": "Pasta",
-            "Tuesday": "Tacos",
-            "Wednesday": "Pizza",
-            "Thursday": "Chicken and Veggies",
-            "Friday": "Fish and Chips",
-            "Saturday": "Steak",
-            "Sunday": "Roast Dinner",
-        }
+        return self.engine.get_default_week_meals()
 
     def save_meals(self):
-        sys.stdout.write("save_meals() called")
-        data_to_save = {'weeks': self.weekly_plans, 'start_date': self.plan_start_date.strftime('%Y-%m-%d') if self.plan_start_date else None, 'num_weeks': self.num_weeks}
-        try:
-            with open(self.DATA_FILE, 'w') as f:
-                json.dump(data_to_save, f, indent=4)
-        except IOError:
-            sys.stderr.write(f"Error saving: {f}")
-            sys.stderr.write(f"Error saving meals to {self.DATA_FILE}.")
+        self.engine.save_meals()
+
+    def save_meal(self, week, day, meal):
+        self.engine.save_meal(week, day, meal)
 
     def prev_week(self, widget):
         if self.current_week > 1:
             self.current_week -= 1
             self.update_week_display()
-            self.update_edit_button_callbacks()
             self.update_navigation_buttons()
 
     def next_week(self, widget):
         if self.current_week < self.num_weeks:
             self.current_week += 1
             self.update_week_display()
-            self.update_edit_button_callbacks()
             self.update_navigation_buttons()
 
     def update_navigation_buttons(self):
         self.prev_button.enabled = self.current_week > 1
         self.next_button.enabled = self.current_week < self.num_weeks
 
-    def update_edit_button_callbacks(self):
-        for widget in self.main_window.content.children[2:]: # Skip week nav and set weeks button
-            if isinstance(widget, toga.Box): # Each day is in a Box
-                for sub_widget in widget.children:
-                    if isinstance(sub_widget, toga.Button) and sub_widget.text == "Edit":
-                        day = widget.children[0].text[:-1] # Extract the day from the label
-                        sub_widget.on_press = partial(self.edit_dinner, day=day, week=self.current_week)
+    def edit_current_week(self, widget, day):
+        # Called by a DayRow's Edit button; the week is whichever is shown now
+        self.edit_dinner(widget, day=day, week=self.current_week)
 
     def get_week_display_date(self):
-        if self.plan_start_date:
-            start_date = self.plan_start_date + datetime.timedelta(days=(self.current_week - 1) * 7)
-            return start_date.strftime('%Y-%m-%d')
-        else:
-            return 'Not Set'
+        return self.engine.week_display_date(self.current_week)
 
     def update_week_display(self):
         self.week_label.text = f"Week {self.current_week}: {self.get_week_display_date()}"
-        for day in ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]:
-            meal = self.weekly_plans.get(self.current_week, {}).get(day, "No dinner planned")
-            self.day_labels[day].text = meal
+        meals = self.weekly_plans.get(self.current_week, {})
+        for day, day_row in self.day_rows.items():
+            day_row.show_meal(meals.get(day, NO_DINNER))
+
+    def handle_household_change(self, widget):
+        if not self._refreshing_households and widget.value is not None:
+            self.switch_household(widget.value)
+
+    def switch_household(self, name):
+        """Show household ``name``'s plan, loading it unless it is still open."""
+        if name == self.household:
+            return
+        background = self.writer is not None
+        self.engine = self.households.open(name)
+        self.household = name
+        if background:
+            self.start_writer()
+        self.current_week = 1
+        self.search_hit = None
+        self.update_week_display()
+        self.update_navigation_buttons()
+        self.watch_plan_file()
+        logger.info("Showing the plan for %s.", name)
 
-    def show_set_weeks_dialog(self, widget):
-        self.set_weeks_window = toga.Window(title="Set Number of Weeks", resizable=False)
-        weeks_input = toga.TextInput(style=Pack(margin=10))
-        self.weeks_input_widget = weeks_input # Store a reference
-        ok_button = toga.Button("OK", on_press=self.handle_set_weeks_ok, style=Pack(margin=10))
-        cancel_button = toga.Button("Cancel", on_press=lambda btn: self.set_weeks_window.close(), style=Pack(margin=10))
+    def watch_plan_file(self):
+        """Watch the data file of the plan shown, instead of any watched before."""
+        if self.plan_watcher is not None:
+            self.plan_watcher.stop()
+        path = self.engine.plan_store(load=False).path
+        self.plan_watcher = PlanWatcher(path, self.handle_plan_file_changed).start(self.loop)
 
-        button_box = toga.Box(style=Pack(direction=ROW, align_items=CENTER, margin=10))
-        button_box.add(ok_button)
-        button_box.add(cancel_button)
+    def handle_plan_file_changed(self):
+        try:
+            changes = self.engine.reload_changes()
+        except Exception as e:
+            logger.error("Error reloading %s: %s", self.engine.data_file, e)
+            return
+        if changes is None:
+            return # Our own save, or nothing that changed the plan
+        if changes.conflicts:
+            weeks = ", ".join(str(week) for week in changes.conflicts)
+            logger.warning("The plan file changed on disk; kept your unsaved edits to week(s) %s.", weeks)
+        if changes.settings:
+            self.current_week = min(self.current_week, self.num_weeks)
+            self.update_navigation_buttons()
+        if changes.settings or self.current_week in changes.weeks:
+            self.update_week_display()
+        if changes.weeks:
+            logger.info("Reloaded week(s) %s from disk.", ", ".join(str(week) for week in changes.weeks))
 
-        content_box = toga.Box(style=Pack(direction=COLUMN, margin=10))
-        content_box.add(toga.Label("Enter the desired number of weeks:", style=Pack(margin_bottom=5)))
-        content_box.add(weeks_input)
-        content_box.add(button_box)
+    def add_household(self, widget):
+        name = self.new_household_input.value.strip()
+        try:
+            self.households.path(name)
+        except ValueError:
+            logger.warning("Invalid household name: '%s'", name)
+            return
+        self.switch_household(name)
+        self.new_household_input.value = ""
+        self._refreshing_households = True # Changing the items would otherwise switch households
+        try:
+            self.household_selection.items = self.households.names()
+            self.household_selection.value = name
+        finally:
+            self._refreshing_households = False
+
+    def find_meal(self, widget):
+        query = self.search_input.value.strip()
+        if not query:
+            return
+        # Move on from the last match shown if it is in this week, otherwise start at this week
+        last_day = self.search_hit[1] if self.search_hit and self.search_hit[0] == self.current_week else None
+        match = self.engine.next_meal_match(query, self.current_week, last_day)
+        if match is None:
+            logger.info("No meals match '%s'", query)
+            return
+        week, day, number, count = match
+        self.search_hit = (week, day)
+        self.current_week = week
+        self.update_week_display()
+        self.update_navigation_buttons()
+        logger.info("Week %s, %s: %s (match %d of %d)", week, day, self.engine.meal(week, day), number, count)
+
+    def show_meal_stats(self, widget):
+        # The most planned meals and when each was last served, in the message area
+        report = self.engine.meal_report()
+        logger.info("Most planned meals (%d meals in %d weeks):", len(report), self.num_weeks)
+        for row in report[:STATS_SHOWN]:
+            if row.last_served is None:
+                logger.info("  %s: %d days, not served yet", row.meal, row.count)
+            else:
+                logger.info("  %s: %d days, last served %s (%d days ago)", row.meal, row.count,
+                            row.last_served.strftime('%Y-%m-%d'), row.days_since)
+
+    def show_shopping_list(self, widget):
+        # Ingredients for the week shown, from the recipes file next to the data file
+        items, missing = self.engine.shopping_list(self.current_week)
+        logger.info("Shopping list for week %s (%d items):", self.current_week, len(items))
+        for item in items:
+            logger.info("  %s: %s", item.ingredient, f"{item.quantity:g} {item.unit}".rstrip())
+        if missing:
+            logger.info("No recipe for: %s", ", ".join(missing))
+
+    def auto_fill(self, widget):
+        # Weeks still on the default dinners get a varied plan from the meals used so far
+        weeks = self.engine.empty_weeks()
+        if not weeks:
+            logger.info("No empty weeks to fill.")
+            return
+        generator = self.engine.auto_fill(weeks=weeks)
+        self.update_week_display()
+        logger.info("Filled %d weeks from %d meals.", len(weeks), len(generator.meals))
+        if generator.violations:
+            logger.warning("%d days repeat a meal sooner than the rules allow; add meals to the plan for more variety.",
+                           generator.violations)
 
-        self.set_weeks_window.content = content_box
-        self.set_weeks_window.show()
+    def show_week(self, week):
+        self.current_week = week
+        self.update_week_display()
+        self.update_navigation_buttons()
+
+    def go_to_date(self, widget):
+        text = self.date_input.value.strip()
+        try:
+            date = datetime.date.today() if text.lower() == "today" else datetime.date.fromisoformat(text)
+        except ValueError:
+            logger.warning("Not a date: '%s' (use YYYY-MM-DD)", text)
+            return
+        found = self.engine.locate_date(date)
+        if found is None:
+            logger.warning("%s is not in the plan.", date.isoformat())
+            return
+        week, day = found
+        self.show_week(week)
+        logger.info("%s is %s of week %s: %s", date.isoformat(), day, week, self.engine.meal(week, day) or NO_DINNER)
+
+    def show_calendar(self, widget):
+        date = self.engine.week_start_date(self.current_week) or datetime.date.today()
+        self.calendar_month = (date.year, date.month)
+        self.render_calendar()
+
+    def render_calendar(self):
+        if self.month_dialog is None:
+            self.month_dialog = MonthDialog(self.select_calendar_week, self.previous_month, self.next_month)
+        year, month = self.calendar_month
+        rows = [[(f"{cell.date.day} {meal or ''}".strip() if cell.week else "", cell.week) for cell, meal in row]
+                for row in self.engine.month_calendar(year, month)]
+        self.month_dialog.show(datetime.date(year, month, 1).strftime("%B %Y"), rows)
+
+    def previous_month(self, widget):
+        year, month = self.calendar_month
+        self.calendar_month = (year - 1, 12) if month == 1 else (year, month - 1)
+        self.render_calendar()
+
+    def next_month(self, widget):
+        year, month = self.calendar_month
+        self.calendar_month = (year + 1, 1) if month == 12 else (year, month + 1)
+        self.render_calendar()
+
+    def select_calendar_week(self, week):
+        self.month_dialog.hide()
+        self.show_week(week)
+
+    def export_path(self, export_format):
+        """Exports are written next to the plan's data file: meal_plans.json -> meal_plans.ics."""
+        return f"{os.path.splitext(self.engine.data_file)[0]}.{export_format}"
+
+    def export_plan(self, export_format):
+        path = self.export_path(export_format)
+        try:
+            meals = self.engine.export_plan(path, export_format)
+        except (OSError, ValueError) as e:
+            logger.error("Error exporting to %s: %s", path, e)
+            return
+        logger.info("Exported %d meals to %s", meals, path)
+
+    def show_bulk_edit_dialog(self, widget):
+        if self.bulk_edit_dialog is None:
+            self.bulk_edit_dialog = BulkEditDialog(on_ok=self.handle_bulk_edit_ok)
+        self.bulk_edit_dialog.show()
+
+    def handle_bulk_edit_ok(self, widget):
+        dialog = self.bulk_edit_dialog
+        operation = dialog.operation_selection.value
+        try:
+            weeks = self.bulk_edit(operation, dialog.weeks_input.value, dialog.target_input.value)
+        except ValueError as e:
+            logger.warning("%s: %s", operation, e)
+            return
+        dialog.hide()
+        logger.info("%s: changed %d week(s).", operation, len(weeks))
+
+    def bulk_edit(self, operation, weeks_text, target_text=""):
+        """Apply a BULK_OPERATIONS entry to week ranges typed as "N" or "N-M", then redraw once."""
+        if operation == "Shift weeks":
+            weeks = self.engine.shift_weeks(int(weeks_text))
+        else:
+            first, last = parse_week_range(weeks_text)
+            if operation == "Copy week":
+                if first != last:
+                    raise ValueError("copy one week at a time")
+                weeks = self.engine.copy_week(first, *parse_week_range(target_text))
+            elif operation == "Repeat weeks":
+                through = parse_week_range(target_text)[1] if target_text.strip() else None
+                weeks = self.engine.repeat_weeks(first, last, through)
+            elif operation == "Clear weeks":
+                weeks = self.engine.clear_weeks(first, last)
+            else:
+                raise ValueError(f"unknown operation {operation!r}")
+        self.update_week_display()
+        return weeks
+
+    def show_set_weeks_dialog(self, widget):
+        if self.set_weeks_dialog is None:
+            self.set_weeks_dialog = SetWeeksDialog(on_ok=self.handle_set_weeks_ok)
+        self.set_weeks_dialog.show()
 
     def handle_set_weeks_ok(self, widget):
         try:
-            num_weeks = int(self.weeks_input_widget.value)
+            num_weeks = int(self.set_weeks_dialog.weeks_input.value)
             if num_weeks > 0:
-                self.num_weeks = num_weeks
+                self.engine.set_num_weeks(num_weeks) # New weeks start from the defaults
                 self.save_settings()
-                self.set_weeks_window.close()
-                self.set_weeks_window = None  # Clear the reference to the window
+                self.set_weeks_dialog.hide()
             else:
-                sys.stderr.write("Invalid Input!Please enter a positive number.")
+                logger.warning("Invalid Input! Please enter a positive number.")
         except ValueError:
-            sys.stderr.write("Invalid Input! Please enter a valid number.")
+            logger.warning("Invalid Input! Please enter a valid number.")
 
     def save_settings(self):
-        settings_data = {
-            "num_weeks": self.num_weeks,
-        }
-        if self.plan_start_date:
-            settings_data["start_date"] = self.plan_start_date.strftime('%Y-%m-%d')
         try:
-            with open(self.DATA_FILE, "w") as f:
-                json.dump(settings_data, f)
+            self.engine.persist_plans()
         except Exception as e:
-            print(f"Error saving settings: {e}")  # Basic error handling
+            logger.error("Error saving settings: %s", e)  # Basic error handling
             self.show_error_dialog("Error Saving", f"Failed to save settings: {e}")
 
     def shutdown(self):
-        self.save_meals()
+        if self.plan_watcher is not None:
+            self.plan_watcher.stop()
+        if self.households is not None:
+            self.households.close() # Includes the engine shown
+        else:
+            self.engine.close()
 
     def edit_dinner(self, widget, day, week):
         current_meal = self.weekly_plans.get(week, {}).get(day, "")
-        edit_window = toga.Window(title=f"Edit Dinner for Week {week}, {day}", resizable=True)
-        self.text_input = toga.TextInput(value=current_meal) # Make self.text_input an attribute
-        self.edit_window = edit_window
-        self.day = day # add self.day and self.week
-        self.week = week
-
-        content = toga.Box(style=Pack(direction=COLUMN, margin=10))
-        content.add(toga.Label("Enter the new dinner:", style=Pack(margin_bottom=5)))
-        content.add(self.text_input)
-
-        ok_button = toga.Button("OK", on_press=self.handle_edit_ok, style=Pack(width=60, margin=5)) # change handle_ok to self.handle_edit_ok
-        cancel_button = toga.Button("Cancel", on_press=self.handle_edit_cancel, style=Pack(width=60, margin=5))
-
-        button_box = toga.Box(style=Pack(direction=ROW, justify_content=END, margin_top=20))
-        button_box.add(ok_button)
-        button_box.add(cancel_button)
-
-        content.add(button_box)
-        self.edit_window.content = content
-        self.edit_window.show()
+        if self.edit_dialog is None:
+            self.edit_dialog = EditDinnerDialog(on_ok=self.handle_edit_ok, on_cancel=self.handle_edit_cancel)
+        self.edit_dialog.show(week, day, current_meal)
 
     def handle_edit_ok(self, ok_button): # create handle_edit_ok as a method
-        sys.stderr.write("This message should be red.\n")
-        new_meal = self.text_input.value
-        self.edit_window.close()
+        dialog = self.edit_dialog
+        logger.debug("Edit OK for week %s, %s", dialog.week, dialog.day)
+        new_meal = dialog.text_input.value
+        dialog.hide()
         if new_meal is not None:
-            self.weekly_plans[self.week][self.day] = new_meal # change week and day to self.week and self.day
+            self.engine.set_meal(dialog.week, dialog.day, new_meal)
             self.update_week_display()  # Force a re-render of the current week's labels
-            self.save_meals()
 
     def handle_edit_cancel(self, cancel_button): # create handle_edit_cancel as a method
-        self.edit_window.close()
+        self.edit_dialog.hide()
+
+
+def parse_week_range(text):
+    """Parse "N" or "N-M" into ``(first, last)``; raises ValueError."""
+    first, _, last = text.strip().partition("-")
+    first = int(first)
+    return first, int(last) if last.strip() else first
 
 
 def main():
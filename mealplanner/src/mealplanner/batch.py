@@ -0,0 +1,288 @@
+"""Validate, normalise or export many plan files in parallel, without the GUI.
+
+    python -m mealplanner batch validate plans/
+    python -m mealplanner batch normalise plans/ --workers 8
+    python -m mealplanner batch export plans/ --output exported/ --format sqlite
+    python -m mealplanner batch export plans/ --output calendars/ --format ics
+
+Every ``*.json`` file under the directory is handed to a process pool. One
+line per file is printed as results arrive (only problems with ``--quiet``),
+followed by a summary with the throughput. The exit status is 1 if any file
+was invalid or failed.
+"""
+import argparse
+import datetime
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from .engine import DEFAULT_NUM_WEEKS, DEFAULT_WEEK_MEALS
+from .plan import DAYS, Week
+from .recipes import RECIPES_FILE
+from .store import PlanStore
+
+ACTIONS = ("validate", "normalise", "export")
+EXPORT_FORMATS = ("json", "sqlite", "binary", "ics", "csv")
+
+OK = "ok"
+WARNING = "warning"
+FIXED = "fixed"
+INVALID = "invalid"
+ERROR = "error"
+FAILED = (INVALID, ERROR)
+
+PLAN_KEYS = ('weeks', 'num_weeks', 'start_date') # A plan document has at least one of these
+
+# "3", "3.0", "week 3", "Week_3"
+_WEEK_KEY = re.compile(r"^\s*(?:week[\s_-]*)?(\d+)(?:\.0*)?\s*$", re.IGNORECASE)
+
+
+def fix_week_key(key):
+    """Return the week number a malformed week key stands for, or None."""
+    match = _WEEK_KEY.match(str(key))
+    if match is None or int(match.group(1)) < 1:
+        return None
+    return int(match.group(1))
+
+
+class NotAPlanError(ValueError):
+    """The file is not a meal plan (or not JSON at all); it is reported as invalid and never rewritten."""
+
+
+def validate_document(data):
+    """Return (problems, warnings) for a parsed plan document."""
+    problems = []
+    warnings = []
+    if not isinstance(data, dict):
+        return [f"document is a {type(data).__name__}, not an object"], warnings
+    if not any(key in data for key in PLAN_KEYS):
+        return [f"not a meal plan: none of {', '.join(PLAN_KEYS)}"], warnings
+
+    num_weeks = data.get('num_weeks')
+    if num_weeks is not None and (not isinstance(num_weeks, int) or isinstance(num_weeks, bool) or num_weeks < 1):
+        problems.append(f"num_weeks is not a positive integer: {num_weeks!r}")
+        num_weeks = None
+    start_date = data.get('start_date')
+    if start_date is not None:
+        try:
+            datetime.datetime.strptime(start_date, '%Y-%m-%d')
+        except (TypeError, ValueError):
+            problems.append(f"start_date is not a YYYY-MM-DD date: {start_date!r}")
+
+    weeks = data.get('weeks', {})
+    if not isinstance(weeks, dict):
+        return problems + [f"weeks is a {type(weeks).__name__}, not an object"], warnings
+    week_numbers = set()
+    for key, meals in weeks.items():
+        try:
+            week_numbers.add(int(key))
+        except ValueError:
+            problems.append(f"invalid week key {key!r}")
+        if not isinstance(meals, dict):
+            problems.append(f"week {key!r} is a {type(meals).__name__}, not an object")
+            continue
+        for day, meal in meals.items():
+            if day not in DAYS:
+                problems.append(f"week {key!r} has an unknown day {day!r}")
+            elif not isinstance(meal, str):
+                problems.append(f"week {key!r} {day} meal is not a string: {meal!r}")
+
+    missing = [week for week in range(1, (num_weeks or DEFAULT_NUM_WEEKS) + 1) if week not in week_numbers]
+    if missing:
+        warnings.append(f"{len(missing)} week(s) use the default meals")
+    return problems, warnings
+
+
+def normalised_document(path):
+    """Load ``path`` as the app would and return (document, fixes).
+
+    Week keys that can be read as a week number ("3.0", "week 3") are
+    converted, and every week up to num_weeks is filled in, from the default
+    meals where it isn't stored. Journaled edits are included.
+    """
+    store = PlanStore(path).load()
+    if store.error == PlanStore.INVALID:
+        status, detail = validate_file(path)  # Report it as the validate action does
+        raise NotAPlanError(detail if status == INVALID else "not a valid plan file")
+    if store.error is not None:
+        raise ValueError("missing file")
+    if store.num_weeks is None and store.start_date is None and not store.weeks and not store.invalid_week_keys:
+        # Nothing of a plan was read; make sure the file is a plan at all before filling it in
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if not any(key in data for key in PLAN_KEYS):
+            raise NotAPlanError(f"not a meal plan: none of {', '.join(PLAN_KEYS)}")
+    fixes = []
+    weeks = store.replayed_weeks(DEFAULT_WEEK_MEALS)
+    if store.invalid_week_keys:
+        with open(path, encoding="utf-8") as f:
+            raw_weeks = json.load(f).get('weeks', {})
+        for key in store.invalid_week_keys:
+            week = fix_week_key(key)
+            meals = raw_weeks.get(key)
+            if week is not None and isinstance(meals, dict) and week not in weeks:
+                weeks[week] = Week.from_mapping(store.table, meals)
+                fixes.append(f"week key {key!r} -> {week}")
+            else:
+                fixes.append(f"dropped week key {key!r}")
+
+    num_weeks = store.num_weeks or DEFAULT_NUM_WEEKS
+    filled = [week for week in range(1, num_weeks + 1) if week not in weeks]
+    default_week = Week.from_mapping(store.table, DEFAULT_WEEK_MEALS)
+    for week in filled:
+        weeks[week] = default_week.copy()
+    if filled:
+        fixes.append(f"filled {len(filled)} week(s) with the default meals")
+    start_date = store.start_date
+    if start_date is not None and validate_document({'start_date': start_date})[0]:
+        fixes.append(f"dropped start_date {start_date!r}")
+        start_date = None
+
+    document = {
+        'weeks': {week: weeks[week] for week in sorted(weeks)},
+        'start_date': start_date,
+        'num_weeks': num_weeks,
+    }
+    return document, fixes
+
+
+def validate_file(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except ValueError as e:
+        return INVALID, f"not valid JSON: {e}"
+    problems, warnings = validate_document(data)
+    if problems:
+        return INVALID, "; ".join(problems)
+    if warnings:
+        return WARNING, "; ".join(warnings)
+    return OK, ""
+
+
+def normalise_file(path):
+    document, fixes = normalised_document(path)
+    if not fixes:
+        return OK, ""
+    PlanStore(path).save(document)
+    return FIXED, "; ".join(fixes)
+
+
+def export_file(path, root, output, export_format):
+    document, fixes = normalised_document(path)
+    target = Path(output) / Path(path).relative_to(root)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if export_format == "sqlite":
+        from .sqlite_store import SQLitePlanStore, sqlite_path
+
+        target = Path(sqlite_path(str(target)))
+        if target.exists():
+            target.unlink()
+        store = SQLitePlanStore(str(target))
+        try:
+            store.save(document)
+        finally:
+            store.close()
+    elif export_format in ("ics", "csv"):
+        from .export import plan_days, write_export
+
+        if document['start_date'] is None:
+            raise ValueError("no start_date to put the meals on")
+        start_date = datetime.datetime.strptime(document['start_date'], '%Y-%m-%d').date()
+        target = target.with_suffix(f".{export_format}")
+        days = plan_days(document['weeks'], start_date, document['num_weeks'])
+        name = "-".join(Path(path).relative_to(root).with_suffix("").parts)
+        write_export(str(target), days, export_format, calendar_name=f"Dinners ({name})", uid_prefix=name)
+    elif export_format == "binary":
+        from .snapshot import SnapshotPlanStore, snapshot_path
+
+        target = Path(snapshot_path(str(target)))
+        if target.exists():
+            target.unlink()  # A snapshot save keeps the weeks the document leaves out
+        SnapshotPlanStore(str(target)).save(document, backups=0)
+    else:
+        PlanStore(str(target)).save(document, backups=0)
+    return (FIXED if fixes else OK), f"-> {target}" + (f" ({'; '.join(fixes)})" if fixes else "")
+
+
+def process_file(job):
+    """Run one batch job in a worker process; returns (path, status, detail)."""
+    action, path, root, output, export_format = job
+    try:
+        if action == "validate":
+            status, detail = validate_file(path)
+        elif action == "normalise":
+            status, detail = normalise_file(path)
+        else:
+            status, detail = export_file(path, root, output, export_format)
+    except NotAPlanError as e:
+        status, detail = INVALID, str(e)
+    except json.JSONDecodeError as e:
+        status, detail = INVALID, f"not valid JSON: {e}"
+    except Exception as e:
+        status, detail = ERROR, f"{type(e).__name__}: {e}"
+    return path, status, detail
+
+
+def find_plan_files(directory):
+    # Recipes live next to the plans they are for (see recipes.py)
+    return sorted(str(path) for path in Path(directory).rglob("*.json") if path.is_file() and path.name != RECIPES_FILE)
+
+
+def run(action, directory, output=None, export_format="json", workers=None, out=None, quiet=False):
+    """Process the plan files under ``directory`` on a pool of ``workers`` processes.
+
+    One line per file is streamed to ``out`` (stdout by default) as results
+    arrive. Returns a {status: count} summary. With ``workers=1`` the files
+    are processed in this process.
+    """
+    out = out or sys.stdout
+    jobs = [(action, path, directory, output, export_format) for path in find_plan_files(directory)]
+    counts = dict.fromkeys((OK, WARNING, FIXED, INVALID, ERROR), 0)
+    start = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        results = map(process_file, jobs)
+        executor = None
+    else:
+        # Large chunks keep the inter-process overhead per file small
+        chunksize = max(1, min(64, len(jobs) // (workers * 4)))
+        executor = ProcessPoolExecutor(max_workers=workers)
+        results = executor.map(process_file, jobs, chunksize=chunksize)
+    try:
+        for path, status, detail in results:
+            counts[status] += 1
+            if not quiet or status in FAILED:
+                out.write(f"{status.upper():<8} {path}{': ' + detail if detail else ''}\n")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    elapsed = time.perf_counter() - start
+    rate = len(jobs) / elapsed if elapsed > 0 else 0.0
+    summary = ", ".join(f"{count} {status}" for status, count in counts.items() if count)
+    out.write(f"{len(jobs)} files in {elapsed:.2f}s ({rate:.0f} files/s): {summary or 'nothing to do'}\n")
+    out.flush()
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m mealplanner batch", description=__doc__.splitlines()[0])
+    parser.add_argument("action", choices=ACTIONS)
+    parser.add_argument("directory", help="directory searched (recursively) for *.json plan files")
+    parser.add_argument("--output", help="directory exported files are written to (export only)")
+    parser.add_argument("--format", dest="export_format", choices=EXPORT_FORMATS, default="json",
+                        help="export format (default: json)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--quiet", action="store_true", help="only print problems and the summary")
+    args = parser.parse_args(argv)
+    if args.action == "export":
+        if not args.output:
+            parser.error("export needs --output")
+        os.makedirs(args.output, exist_ok=True)
+
+    counts = run(args.action, args.directory, args.output, args.export_format, args.workers, quiet=args.quiet)
+    return 1 if any(counts[status] for status in FAILED) else 0
@@ -0,0 +1,98 @@
+import datetime
+import threading
+import time
+from collections import deque
+
+# Most recent messages kept (and shown) per console.
+MAX_LINES = 500
+# Minimum seconds between label repaints; writes in between are batched.
+FLUSH_INTERVAL = 0.1
+
+
+class GUIConsole:
+    """File-like object that shows written messages in a label.
+
+    Messages go into a ring buffer of the last ``max_lines`` lines, so a write
+    costs the same however long the session has been running. The label is
+    repainted at most once per ``interval``: the first write after a quiet
+    period paints straight away, and writes that follow it are batched into
+    one repaint scheduled on ``loop``. Writes may come from any thread; the
+    label is only touched on the thread that created the console.
+    """
+
+    def __init__(self, text_widget, is_stderr=False, max_lines=MAX_LINES, interval=FLUSH_INTERVAL, loop=None):
+        self.text_widget = text_widget
+        self.is_stderr = is_stderr
+        self.prefix = "Info: " if not is_stderr else "Error: "
+        self.lines = deque(maxlen=max_lines)
+        self.interval = interval
+        self.loop = loop
+        self._lock = threading.Lock()
+        self._ui_thread = threading.get_ident()
+        self._dirty = False
+        self._scheduled = False
+        self._last_render = float("-inf")
+        self._timestamp_second = None
+        self._timestamp = ""
+
+    def _now(self):
+        # Formatting the time is the costly part of a write; reuse it within a second
+        second = int(time.time())
+        if second != self._timestamp_second:
+            self._timestamp_second = second
+            self._timestamp = datetime.datetime.fromtimestamp(second).strftime("%Y-%m-%d %H:%M:%S")
+        return self._timestamp
+
+    def write(self, message):
+        text = message.rstrip("\n")
+        if not text.strip():
+            return len(message)  # e.g. the separate "\n" write from print()
+        self.append(f"{self._now()} - {self.prefix}{text}")
+        return len(message)
+
+    def append(self, line):
+        """Add an already formatted line (e.g. a log record) without a timestamp or prefix."""
+        with self._lock:
+            self.lines.append(line)
+            self._dirty = True
+            if self._scheduled:
+                return
+            delay = self._last_render + self.interval - time.monotonic()
+            on_ui_thread = threading.get_ident() == self._ui_thread
+            if delay > 0 or not on_ui_thread:
+                self._scheduled = self._schedule(max(delay, 0), on_ui_thread)
+                if self._scheduled:
+                    return
+        if on_ui_thread:
+            self.render()
+
+    def _schedule(self, delay, on_ui_thread):
+        if self.loop is None or self.loop.is_closed():
+            return False
+        if on_ui_thread:
+            self.loop.call_later(delay, self.render)
+        else:
+            self.loop.call_soon_threadsafe(self.loop.call_later, delay, self.render)
+        return True
+
+    def render(self):
+        """Repaint the label with the buffered lines, if anything changed."""
+        with self._lock:
+            self._scheduled = False
+            if not self._dirty:
+                return
+            self._dirty = False
+            self._last_render = time.monotonic()
+            text = "\n".join(self.lines) + "\n" if self.lines else ""
+        self.text_widget.text = text
+
+    def clear(self):
+        with self._lock:
+            self.lines.clear()
+            self._dirty = True
+        if threading.get_ident() == self._ui_thread:
+            self.render()
+
+    def flush(self):
+        if threading.get_ident() == self._ui_thread:
+            self.render()
@@ -0,0 +1,81 @@
+import calendar
+import datetime
+from collections import namedtuple
+
+from .plan import DAYS
+
+# One day of a month view; week and day are None for dates outside the plan
+CalendarCell = namedtuple("CalendarCell", "date week day")
+
+_MAX_ORDINAL = datetime.date.max.toordinal()
+
+
+class DateIndex:
+    """Date arithmetic for a plan's days, for a start date and plan length.
+
+    Day ``i`` of the plan (week ``i // 7 + 1``, day ``DAYS[i % 7]``) is the
+    start date's ordinal plus ``i``, so a date, a week label or the week and
+    day of a date is one addition or one ``divmod`` of ordinals, worked out
+    when asked for. Nothing is stored per day, so building an index costs
+    the same for any plan length. Days past the last date Python can
+    represent (the end of year 9999) have no date. PlanEngine keeps one per
+    ``(plan_start_date, num_weeks)`` and builds a new one when either
+    changes.
+    """
+
+    def __init__(self, start_date, num_weeks):
+        self.start_date = start_date
+        self.num_weeks = num_weeks
+        self._first = start_date.toordinal()
+        self._days = max(num_weeks, 0) * len(DAYS)
+
+    @property
+    def end_date(self):
+        """The last day of the plan (or the last date there is, if the plan runs past it)."""
+        if not self._days:
+            return None
+        return datetime.date.fromordinal(min(self._first + self._days - 1, _MAX_ORDINAL))
+
+    def date(self, week, day):
+        """Return the date of ``day`` in ``week``, or None if the week is not in the plan."""
+        if not 1 <= week <= self.num_weeks:
+            return None
+        ordinal = self._first + (week - 1) * len(DAYS) + DAYS.index(day)
+        return datetime.date.fromordinal(ordinal) if ordinal <= _MAX_ORDINAL else None
+
+    def week_label(self, week):
+        """Return the text shown for ``week`` (the date of its Monday), or None if it has no date."""
+        date = self.date(week, DAYS[0])
+        return date.isoformat() if date else None
+
+    def locate(self, date):
+        """Return ``(week, day)`` for ``date``, or None if the plan doesn't cover it."""
+        offset = date.toordinal() - self._first
+        if not 0 <= offset < self._days:
+            return None
+        week, index = divmod(offset, len(DAYS))
+        return week + 1, DAYS[index]
+
+    def month(self, year, month):
+        """Return the calendar for a month as rows of seven CalendarCells, Monday first.
+
+        Rows start on the Monday on or before the 1st and end on the Sunday
+        on or after the last day, so cells before and after the month are
+        included, as on a wall calendar.
+        """
+        first = datetime.date(year, month, 1)
+        last = first.replace(day=calendar.monthrange(year, month)[1])
+        start = first.toordinal() - first.weekday()
+        end = min(last.toordinal() + 6 - last.weekday(), _MAX_ORDINAL)
+        rows = []
+        for row_start in range(start, end + 1, len(DAYS)):
+            row = []
+            for ordinal in range(row_start, min(row_start + len(DAYS), end + 1)):  # December 9999 ends on a Friday
+                offset = ordinal - self._first
+                if 0 <= offset < self._days:
+                    week, index = divmod(offset, len(DAYS))
+                    row.append(CalendarCell(datetime.date.fromordinal(ordinal), week + 1, DAYS[index]))
+                else:
+                    row.append(CalendarCell(datetime.date.fromordinal(ordinal), None, None))
+            rows.append(row)
+        return rows
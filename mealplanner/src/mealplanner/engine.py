@@ -0,0 +1,546 @@
+import datetime
+import os
+from collections import namedtuple
+
+from .analytics import MealStats
+from .dates import DateIndex
+from .export import plan_days, write_export
+from .generator import FillRules, PlanGenerator
+from .log import logger
+from .plan import DAYS, DEFAULT_WEEK_MEALS, WeekPlans
+from .recipes import RECIPES_FILE, RecipeBook, ShoppingListCache
+from .search import MealIndex, slot, slot_day
+from .store import PlanStore, open_store
+from .writer import BackgroundWriter, DEBOUNCE
+
+DATA_FILE = "meal_plans.json"
+# "json", "sqlite" or "binary", see store.open_store
+STORAGE_BACKEND = os.environ.get("MEALPLANNER_STORAGE_BACKEND", "json").lower()
+DEFAULT_NUM_WEEKS = 4
+WEEK_BYTES = 200 # Rough memory for one edited week, or one week of an index or cache
+
+# What reload_changes merged: weeks taken from the file, weeks kept because of
+# unsaved local edits, and whether num_weeks or start_date changed
+PlanChanges = namedtuple("PlanChanges", "weeks conflicts settings")
+
+
+class PlanEngine:
+    """The meal plan for one data file: loading, defaults, date math and saving.
+
+    Has no GUI dependencies, so batch jobs can load, edit and save plans
+    without a display; MealPlanner is a view over one of these. Saves are
+    synchronous unless ``start_writer`` has started a BackgroundWriter.
+    """
+
+    def __init__(self, data_file=DATA_FILE, storage_backend=STORAGE_BACKEND):
+        self.data_file = data_file
+        self.storage_backend = storage_backend
+        self.weekly_plans = {}
+        self.plan_start_date = None
+        self.num_weeks = DEFAULT_NUM_WEEKS
+        self.journal_mode = True # Append single edits to a journal instead of rewriting data_file
+        self.save_debounce = DEBOUNCE # Seconds the background writer waits to coalesce edits
+        self.writer = None
+        self.dirty = False # Changed since the last full save (edits may still be in the journal)
+        self.unsaved_weeks = set() # Weeks edited since the last full save
+        self._unsaved_settings = False
+        self._plan_store = None
+        self._plan_store_key = None
+        self._derived = {} # Indexes over weekly_plans kept up to date by set_meal, see _derived_view
+        self._derived_plans = None
+        self.recipes_file = None # Defaults to RECIPES_FILE next to data_file
+        self._recipe_book = None
+        self._date_index = None
+
+    def load(self):
+        """Load the settings, meals and start date from data_file, and return self."""
+        self.load_settings()
+        self.weekly_plans = self.load_meals()
+        self.plan_start_date = self.load_start_date()
+        return self
+
+    def start_writer(self):
+        if self.writer is None:
+            # Saves happen on a worker thread so slow disks don't block the caller
+            self.writer = BackgroundWriter(self.save_debounce, on_error=self.report_save_error)
+
+    def close(self):
+        """Save the plan, wait for the writer to finish and release the store."""
+        self.save_meals()
+        self.release()
+
+    def release(self):
+        """Wait for the writer to finish and release the store, without saving again."""
+        if self.writer is not None:
+            self.writer.close() # Blocks until the final save is on disk
+            self.writer = None
+        if self._plan_store is not None:
+            self._plan_store.close()
+
+    def estimated_size(self):
+        """Roughly how many bytes of memory the loaded plan takes, for caches of open plans."""
+        try:
+            size = os.path.getsize(self.plan_store(load=False).path) # Parsed plans scale with the file
+        except OSError:
+            size = 0
+        if isinstance(self.weekly_plans, WeekPlans):
+            size += WEEK_BYTES * len(self.weekly_plans.edited)
+        return size + WEEK_BYTES * len(self._derived) * self.num_weeks
+
+    def plan_store(self, load=True):
+        """Return the shared PlanStore for data_file, (re)reading it only if the file changed."""
+        if load and self.writer is not None:
+            self.writer.flush() # Read our own queued writes
+        key = (self.data_file, self.storage_backend)
+        if self._plan_store is None or self._plan_store_key != key:
+            if self._plan_store is not None:
+                if self.writer is not None:
+                    self.writer.flush()
+                self._plan_store.close()
+            self._plan_store = open_store(self.data_file, self.storage_backend)
+            self._plan_store_key = key
+        return self._plan_store.load() if load else self._plan_store
+
+    def load_settings(self):
+        store = self.plan_store()
+        self.num_weeks = store.num_weeks or DEFAULT_NUM_WEEKS
+
+    def load_meals(self):
+        store = self.plan_store()
+        if store.error is None:
+            for week_str in store.invalid_week_keys:
+                logger.warning("Skipping invalid week key in data file: %s", week_str)
+            if store.start_date:
+                self.plan_start_date = self.parse_date(store.start_date)
+            else:
+                self.plan_start_date = self.get_default_start_date()
+        elif store.error == PlanStore.INVALID:
+            logger.error("Error decoding JSON from %s. Using default meals.", self.data_file)
+
+        # Journaled edits are replayed, and we ensure we have enough weeks
+        return store.plan_weeks(self.get_default_week_meals(), self.num_weeks)
+
+    def parse_date(self, date_str):
+        try:
+            return datetime.datetime.strptime(date_str, '%Y-%m-%d').date()
+        except ValueError:
+            return self.get_default_start_date()
+
+    def get_default_start_date(self):
+        return datetime.date.today() + datetime.timedelta(days=-datetime.date.today().weekday()) # Default to current week's Monday
+
+    def load_start_date(self):
+        store = self.plan_store()
+        if store.error == PlanStore.MISSING:
+            return None
+        if store.start_date:
+            return self.parse_date(store.start_date)
+        return self.get_default_start_date()
+
+    def get_default_weekly_meals(self):
+        # Default weeks share one dict and are only copied when edited
+        return WeekPlans({}, self.get_default_week_meals(), self.num_weeks)
+
+    def get_default_week_meals(self):
+        return dict(DEFAULT_WEEK_MEALS)
+
+    @property
+    def date_index(self):
+        """The DateIndex for the current start date and plan length, or None without a start date."""
+        if self.plan_start_date is None:
+            return None
+        index = self._date_index
+        if index is None or index.start_date != self.plan_start_date or index.num_weeks != self.num_weeks:
+            index = self._date_index = DateIndex(self.plan_start_date, self.num_weeks)
+        return index
+
+    def week_start_date(self, week):
+        """Return the Monday of ``week``, or None if the plan has no start date (or the week is past the year 9999)."""
+        if self.plan_start_date is None:
+            return None
+        if 1 <= week <= self.num_weeks:
+            return self.date_index.date(week, DAYS[0])
+        try:
+            return self.plan_start_date + datetime.timedelta(days=(week - 1) * 7)
+        except OverflowError:
+            return None  # Past the year 9999
+
+    def week_display_date(self, week):
+        index = self.date_index
+        if index is not None and 1 <= week <= index.num_weeks:
+            return index.week_label(week) or 'Not Set'
+        start_date = self.week_start_date(week)
+        return start_date.strftime('%Y-%m-%d') if start_date else 'Not Set'
+
+    def locate_date(self, date):
+        """Return the ``(week, day)`` planned for ``date``, or None if the plan doesn't cover it."""
+        index = self.date_index
+        return index.locate(date) if index is not None else None
+
+    def month_calendar(self, year, month):
+        """Return a month as rows of ``(CalendarCell, meal)`` pairs, Monday first; meal is None
+        outside the plan. Returns [] if the plan has no start date."""
+        index = self.date_index
+        if index is None:
+            return []
+        plans = self.weekly_plans
+        return [[(cell, plans.get(cell.week, {}).get(cell.day) if cell.week else None) for cell in row]
+                for row in index.month(year, month)]
+
+    def export_plan(self, path, export_format=None):
+        """Stream the plan's meals to ``path`` as iCalendar or CSV (by default from the extension).
+
+        Returns the number of meals exported. Raises ValueError if the plan
+        has no start date or the format is unknown, and OSError if the file
+        can't be written.
+        """
+        if self.plan_start_date is None:
+            raise ValueError("The plan has no start date to put the meals on")
+        days = plan_days(self.weekly_plans, self.plan_start_date, self.num_weeks)
+        name = os.path.splitext(os.path.basename(self.data_file))[0]
+        return write_export(path, days, export_format, calendar_name=f"Dinners ({name})", uid_prefix=name)
+
+    def meal(self, week, day, default=None):
+        return self.weekly_plans.get(week, {}).get(day, default)
+
+    def set_meal(self, week, day, meal):
+        """Change one meal, keep the search index and statistics current and persist the edit."""
+        self.weekly_plans[week][day] = meal
+        if 1 <= week <= self.num_weeks:
+            for view in self._current_views():
+                view.update(week, day, meal)
+        self.save_meal(week, day, meal)
+
+    def _current_views(self):
+        # Views built over a plan that has since been replaced are rebuilt on next use instead
+        return self._derived.values() if self._derived_plans is self.weekly_plans else ()
+
+    def _derived_view(self, view_class, build=None):
+        """Return the ``view_class`` view over the weeks in the plan, building it on first use.
+
+        Views have ``update``, ``update_week`` and ``remove_week`` methods;
+        ``build`` makes one from ``{week: meals}`` (default: ``view_class.build``).
+        """
+        # Built on first use rather than in load(), so startup doesn't decode every week
+        if self._derived_plans is not self.weekly_plans:
+            self._derived = {}
+            self._derived_plans = self.weekly_plans
+        view = self._derived.get(view_class)
+        if view is None:
+            plans = self.weekly_plans
+            weeks = {week: plans[week] for week in range(1, self.num_weeks + 1) if week in plans}
+            view = self._derived[view_class] = (build or view_class.build)(weeks)
+        return view
+
+    @property
+    def meal_index(self):
+        """The MealIndex over the plan's weeks, updated edit by edit."""
+        return self._derived_view(MealIndex)
+
+    @property
+    def meal_stats(self):
+        """The MealStats over the plan's weeks, updated edit by edit."""
+        return self._derived_view(MealStats)
+
+    def meal_report(self, today=None):
+        """Return a MealFrequency per meal, most often planned first (see MealStats.report)."""
+        return self.meal_stats.report(self.plan_start_date, today)
+
+    def recipes_path(self):
+        return self.recipes_file or os.path.join(os.path.dirname(self.data_file), RECIPES_FILE)
+
+    @property
+    def recipe_book(self):
+        if self._recipe_book is None:
+            self.load_recipes()
+        return self._recipe_book
+
+    def load_recipes(self):
+        """(Re)read the recipes file; cached shopping list totals are dropped."""
+        self._recipe_book = RecipeBook.load(self.recipes_path())
+        self._derived.pop(ShoppingListCache, None)
+
+    def shopping_list(self, first_week, last_week=None):
+        """Return ``(ShoppingItems, meals without a recipe)`` for weeks ``first_week`` to ``last_week``."""
+        last_week = first_week if last_week is None else last_week
+        cache = self._derived_view(ShoppingListCache, lambda weeks: ShoppingListCache(self.recipe_book, self.weekly_plans))
+        return cache.shopping_list(max(first_week, 1), min(last_week, self.num_weeks))
+
+    def search_meals(self, query):
+        """Return the ``(week, day)`` of every planned meal matching ``query``, in plan order."""
+        return MealIndex.matches(self.meal_index.search(query))
+
+    def next_meal_match(self, query, week=1, day=None):
+        """Find the first meal matching ``query`` after ``day`` of ``week`` (from the start of
+        ``week`` if ``day`` is None), wrapping round to week 1.
+
+        Returns ``(week, day, match number, match count)``, or None if nothing matches.
+        """
+        bits = self.meal_index.search(query)
+        if not bits:
+            return None
+        after = slot(week, day) if day is not None else slot(week, DAYS[0]) - 1
+        position = MealIndex.next_match(bits, after)
+        if position is None:
+            position = MealIndex.next_match(bits)
+        number = (bits & ((1 << position) - 1)).bit_count() + 1
+        return (*slot_day(position), number, bits.bit_count())
+
+    def empty_weeks(self):
+        """Return the weeks of the plan that have no meals, or only the default meals."""
+        plans = self.weekly_plans
+        default = self.get_default_week_meals()
+        weeks = []
+        for week in range(1, self.num_weeks + 1):
+            if isinstance(plans, WeekPlans) and week not in plans.edited and week not in plans.stored:
+                weeks.append(week) # Untouched default week; nothing to decode
+                continue
+            meals = plans.get(week) or {}
+            if not any(meals.values()) or meals == default:
+                weeks.append(week)
+        return weeks
+
+    def auto_fill(self, library=None, rules=None, weeks=None, seed=None):
+        """Fill ``weeks`` (by default the empty weeks) from a meal library under FillRules, and save.
+
+        The library defaults to every meal already in the plan. Returns the
+        PlanGenerator, whose ``violations`` counts days no meal fitted.
+        """
+        weeks = self.empty_weeks() if weeks is None else weeks
+        if library is None:
+            library = list(self.meal_stats.counts) or list(self.get_default_week_meals().values())
+        generator = PlanGenerator(library, rules or FillRules(), self.plan_start_date, seed)
+        self.apply_weeks(generator.fill(self.weekly_plans, weeks))
+        return generator
+
+    def apply_weeks(self, weeks):
+        """Replace whole weeks in one change: ``weeks`` maps week numbers to ``{day: meal}``.
+
+        The derived views are updated once per week and the plan is saved
+        once, as one snapshot write rather than a journal record per day.
+        Returns the weeks written, in order.
+        """
+        plans = self.weekly_plans
+        views = self._current_views()
+        for week, meals in weeks.items():
+            plans[week] = meals if isinstance(plans, WeekPlans) else dict(meals)
+            self.unsaved_weeks.add(week)
+            if 1 <= week <= self.num_weeks:
+                for view in views:
+                    view.update_week(week, plans[week])
+        if weeks:
+            self.dirty = True
+            self.save_meals()
+        return sorted(weeks)
+
+    def _check_weeks(self, first, last):
+        if not 1 <= first <= last <= self.num_weeks:
+            raise ValueError(f"Weeks {first} to {last} are not within the plan's {self.num_weeks} weeks")
+
+    def copy_week(self, source, first, last=None):
+        """Copy the meals of week ``source`` to weeks ``first`` to ``last``, and save."""
+        last = first if last is None else last
+        self._check_weeks(source, source)
+        self._check_weeks(first, last)
+        meals = dict(self.weekly_plans.get(source, {}))
+        return self.apply_weeks({week: meals for week in range(first, last + 1) if week != source})
+
+    def repeat_weeks(self, first, last, through=None):
+        """Repeat weeks ``first`` to ``last`` as a rotation over the weeks after them up to
+        ``through`` (default: the end of the plan), and save."""
+        through = self.num_weeks if through is None else through
+        self._check_weeks(first, last)
+        self._check_weeks(last, through)
+        plans = self.weekly_plans
+        rotation = [dict(plans.get(week, {})) for week in range(first, last + 1)]
+        return self.apply_weeks({week: rotation[(week - first) % len(rotation)]
+                                 for week in range(last + 1, through + 1)})
+
+    def clear_weeks(self, first, last=None):
+        """Remove every meal from weeks ``first`` to ``last``, and save."""
+        last = first if last is None else last
+        self._check_weeks(first, last)
+        return self.apply_weeks({week: {} for week in range(first, last + 1)})
+
+    def shift_weeks(self, offset):
+        """Move the meals of every week ``offset`` weeks later (earlier if negative), and save.
+
+        Meals moved past either end of the plan are dropped, and the weeks
+        they leave get the default meals.
+        """
+        plans = self.weekly_plans
+        weeks = range(1, self.num_weeks + 1)
+        if not offset:
+            return []
+        moved = {week + offset: dict(plans.get(week, {})) for week in weeks if week + offset in weeks}
+        default = self.get_default_week_meals()
+        return self.apply_weeks({week: moved.get(week, default) for week in weeks})
+
+    def set_start_date(self, start_date, keep_dates=True):
+        """Change the plan's start date, and save.
+
+        With ``keep_dates`` the meals are shifted by the whole number of
+        weeks the start moved, so they stay on (about) the same dates.
+        """
+        old_start_date, self.plan_start_date = self.plan_start_date, start_date
+        self.dirty = True
+        self._unsaved_settings = True
+        offset = round((old_start_date - start_date).days / 7) if keep_dates and old_start_date else 0
+        if not self.shift_weeks(offset):
+            self.save_meals()
+
+    def set_num_weeks(self, num_weeks):
+        """Change the plan length; weeks added start from the defaults. Call persist_plans to save it."""
+        if num_weeks <= 0:
+            raise ValueError(f"Number of weeks must be positive, not {num_weeks}")
+        old_num_weeks, self.num_weeks = self.num_weeks, num_weeks
+        self.dirty = True
+        self._unsaved_settings = True
+        if isinstance(self.weekly_plans, WeekPlans):
+            self.weekly_plans.num_weeks = num_weeks
+        for view in self._current_views():
+            # Weeks past num_weeks can still be stored but aren't part of the plan
+            for week in range(num_weeks + 1, old_num_weeks + 1):
+                view.remove_week(week)
+            for week in range(old_num_weeks + 1, num_weeks + 1):
+                if week in self.weekly_plans:
+                    view.update_week(week, self.weekly_plans[week])
+
+    def save_meals(self):
+        logger.debug("save_meals() called")
+        try:
+            self.persist_plans()
+        except OSError as e:
+            logger.error("Error saving meals to %s: %s", self.data_file, e)
+
+    def persist_plans(self):
+        """Write the merged plan document, on the background writer when it is running.
+
+        If another program changed the data file since it was last read or
+        written here, its changes are merged in first (see reload_changes),
+        so saving never overwrites them.
+        """
+        store = self.plan_store(load=False)
+        changes = self._merge_file_changes()
+        if changes is not None and changes.conflicts:
+            logger.warning("%s changed on disk; saving your edits over week(s) %s", store.path,
+                           ", ".join(str(week) for week in changes.conflicts))
+        background = self.writer is not None and self.writer.running
+        # The writer serialises later, so it gets a copy of the live plans
+        document = self.plan_document(copy=background)
+        if background:
+            self.writer.save(store, document)
+        else:
+            store.save(document)
+        self.dirty = False
+        self.unsaved_weeks.clear()
+        self._unsaved_settings = False
+
+    def reload_changes(self):
+        """Merge changes another program made to the data file into the plan, week by week.
+
+        Weeks that differ between the file as last read or written here and
+        the file now are taken from the file, unless they have unsaved local
+        edits too; those are conflicts and keep the local meals (they win
+        at the next save). Returns a PlanChanges, or None if the file has
+        not changed.
+        """
+        changes = self._merge_file_changes()
+        if changes is not None and changes.weeks and self.writer is not None and self.writer.running:
+            self.persist_plans() # Replaces any queued save built before the merge
+        return changes
+
+    def _merge_file_changes(self):
+        store = self.plan_store(load=False)
+        with store.lock:
+            if not store.changed_on_disk():
+                return None
+            base_weeks, base_num_weeks, base_start_date = store.weeks, store.num_weeks, store.start_date
+            store.load()
+            if store.error is not None:
+                logger.warning("Ignoring the changed data file %s: it is %s", store.path, store.error)
+                return PlanChanges([], [], False)
+            new_weeks = store.weeks
+        changed = {week for week in base_weeks if base_weeks.get(week) != new_weeks.get(week)}
+        changed.update(week for week in new_weeks if week not in base_weeks)
+
+        plans = self.weekly_plans
+        applied, conflicts = [], []
+        for week in sorted(changed):
+            meals = new_weeks.get(week)
+            if week in self.unsaved_weeks:
+                if meals is None or plans.get(week) != meals:
+                    conflicts.append(week)
+                continue
+            applied.append(week)
+            if isinstance(plans, WeekPlans):
+                plans.reset_week(week)
+            elif meals is None:
+                plans.pop(week, None)
+            else:
+                plans[week] = dict(meals)
+        if isinstance(plans, WeekPlans):
+            plans.stored = new_weeks
+
+        settings = False
+        if not self._unsaved_settings:
+            if store.num_weeks != base_num_weeks and store.num_weeks:
+                self.num_weeks = store.num_weeks
+                if isinstance(plans, WeekPlans):
+                    plans.num_weeks = store.num_weeks
+                settings = True
+            if store.start_date != base_start_date:
+                self.plan_start_date = self.parse_date(store.start_date) if store.start_date else self.get_default_start_date()
+                settings = True
+
+        if settings:
+            self._derived = {} # Rebuilt for the new plan length on next use
+        else:
+            for view in self._current_views():
+                for week in applied:
+                    if 1 <= week <= self.num_weeks and week in plans:
+                        view.update_week(week, plans[week])
+                    else:
+                        view.remove_week(week)
+        return PlanChanges(applied, conflicts, settings)
+
+    def report_save_error(self, store, error):
+        # Called on the writer thread; the logging handlers accept records from any thread
+        logger.error("Error saving meals to %s: %s", store.path, error)
+
+    def plan_document(self, copy=False):
+        """Merge the settings and the meal plans into the document saved to data_file."""
+        store = self.plan_store(load=False)
+        weeks = self.weekly_plans
+        if not isinstance(weeks, WeekPlans) and not weeks:
+            # Plans haven't been loaded; keep whatever is stored rather than dropping it
+            weeks = self.plan_store().replayed_weeks(self.get_default_week_meals())
+        if isinstance(weeks, WeekPlans):
+            # Untouched default weeks are never written
+            weeks = weeks.changed_weeks(copy) if store.SAVES_CHANGES_ONLY else weeks.persisted_weeks(copy)
+        elif copy:
+            weeks = {week: dict(meals) for week, meals in weeks.items()}
+        return {
+            'weeks': weeks,
+            'start_date': self.plan_start_date.strftime('%Y-%m-%d') if self.plan_start_date else None,
+            'num_weeks': self.num_weeks,
+        }
+
+    def save_meal(self, week, day, meal):
+        """Persist a single meal edit, as one journal record when journal_mode is on."""
+        self.dirty = True
+        self.unsaved_weeks.add(week)
+        if not self.journal_mode:
+            self.save_meals()
+            return
+        store = self.plan_store(load=False)
+        if self.writer is not None and self.writer.running:
+            self.writer.append_edit(store, week, day, meal, self.get_default_week_meals())
+            return
+        try:
+            store.append_edit(week, day, meal, self.get_default_week_meals())
+            if store.needs_compaction():
+                store.compact(self.get_default_week_meals())
+        except OSError as e:
+            logger.error("Error saving meal to %s: %s", store.path, e)
+            self.save_meals()
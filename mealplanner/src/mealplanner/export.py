@@ -0,0 +1,169 @@
+"""Export meal plans to iCalendar (.ics) and CSV, for calendar apps and spreadsheets.
+
+Exports are streamed: ``plan_days`` walks the plan a week at a time,
+``export_chunks`` turns the days into text a chunk of ``CHUNK_ROWS`` meals
+at a time, and ``write_export`` writes each chunk as it is made. Memory use
+is one chunk, however long the plan.
+"""
+import csv
+import datetime
+import os
+
+from .plan import DAYS
+
+EXPORT_FORMATS = ("ics", "csv")
+CHUNK_ROWS = 512 # Meals formatted per write
+CSV_HEADER = ("date", "week", "day", "meal")
+ICS_LINE_OCTETS = 75 # RFC 5545 folds longer content lines
+
+
+def plan_days(weekly_plans, start_date, num_weeks):
+    """Yield ``(date, week, day, meal)`` for every planned meal of weeks 1 to ``num_weeks``, in date order."""
+    ordinal = start_date.toordinal()
+    for week in range(1, num_weeks + 1):
+        meals = weekly_plans.get(week) or {}
+        for index, day in enumerate(DAYS):
+            meal = meals.get(day)
+            if meal:
+                yield datetime.date.fromordinal(ordinal + index), week, day, meal
+        ordinal += len(DAYS)
+
+
+class _Lines:
+    """File-like sink for csv.writer that keeps the lines written until they are taken."""
+
+    def __init__(self):
+        self.lines = []
+
+    def write(self, text):
+        self.lines.append(text)
+
+    def take(self):
+        text = "".join(self.lines)
+        self.lines.clear()
+        return text
+
+
+def csv_chunks(days, chunk_rows=CHUNK_ROWS):
+    """Yield CSV text with a header row and one row per planned meal, ``chunk_rows`` rows at a time."""
+    sink = _Lines()
+    writer = csv.writer(sink, lineterminator="\r\n")
+    writer.writerow(CSV_HEADER)
+    for date, week, day, meal in days:
+        writer.writerow((date.isoformat(), week, day, meal))
+        if len(sink.lines) >= chunk_rows:
+            yield sink.take()
+    if sink.lines:
+        yield sink.take()
+
+
+def ics_text(value):
+    """Escape ``value`` for an iCalendar TEXT property."""
+    return (value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+            .replace("\r\n", "\\n").replace("\n", "\\n"))
+
+
+def ics_line(line):
+    """Return ``line`` as a content line ending in CRLF, folded at 75 octets without splitting characters."""
+    if len(line) * 4 <= ICS_LINE_OCTETS or len(line.encode("utf-8")) <= ICS_LINE_OCTETS:
+        return line + "\r\n"
+    parts = []
+    start = 0
+    octets = 0
+    limit = ICS_LINE_OCTETS
+    for position, char in enumerate(line):
+        size = len(char.encode("utf-8"))
+        if octets + size > limit:
+            parts.append(line[start:position])
+            start, octets, limit = position, 0, ICS_LINE_OCTETS - 1  # Continuation lines start with a space
+        octets += size
+    parts.append(line[start:])
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def ics_chunks(days, calendar_name="Dinners", uid_prefix="plan", stamp=None, chunk_rows=CHUNK_ROWS):
+    """Yield an iCalendar file with one all-day event per planned meal, ``chunk_rows`` events at a time.
+
+    Event UIDs are made from ``uid_prefix`` and the date, so re-importing an
+    export updates the events from the last one instead of duplicating them.
+    """
+    stamp = (stamp or datetime.datetime.now(datetime.timezone.utc)).strftime("%Y%m%dT%H%M%SZ")
+    lines = [
+        "BEGIN:VCALENDAR\r\n",
+        "VERSION:2.0\r\n",
+        "PRODID:-//Meal Planner//EN\r\n",
+        "CALSCALE:GREGORIAN\r\n",
+        ics_line(f"X-WR-CALNAME:{ics_text(calendar_name)}"),
+    ]
+    events = 0
+    one_day = datetime.timedelta(days=1)
+    for date, week, day, meal in days:
+        start = date.isoformat().replace("-", "")  # Much cheaper than strftime per event
+        lines += (
+            "BEGIN:VEVENT\r\n",
+            ics_line(f"UID:{start}-dinner-{uid_prefix}@mealplanner"),
+            f"DTSTAMP:{stamp}\r\n",
+            f"DTSTART;VALUE=DATE:{start}\r\n",
+            f"DTEND;VALUE=DATE:{(date + one_day).isoformat().replace('-', '')}\r\n",
+            ics_line(f"SUMMARY:{ics_text(meal)}"),
+            "TRANSP:TRANSPARENT\r\n",
+            "END:VEVENT\r\n",
+        )
+        events += 1
+        if events == chunk_rows:
+            yield "".join(lines)
+            lines.clear()
+            events = 0
+    lines.append("END:VCALENDAR\r\n")
+    yield "".join(lines)
+
+
+def export_chunks(days, export_format, **options):
+    """Yield the text of an export in ``export_format`` ("ics" or "csv").
+
+    ``options`` are passed to ics_chunks; CSV only uses ``chunk_rows``.
+    """
+    if export_format == "ics":
+        return ics_chunks(days, **options)
+    if export_format == "csv":
+        return csv_chunks(days, options.get("chunk_rows", CHUNK_ROWS))
+    raise ValueError(f"Unknown export format {export_format!r}; use one of {', '.join(EXPORT_FORMATS)}")
+
+
+def format_for_path(path):
+    """Return the export format for a file name's extension."""
+    export_format = os.path.splitext(path)[1].lstrip(".").lower()
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Can't tell the export format of {path}; use a .ics or .csv file name")
+    return export_format
+
+
+def write_export(path, days, export_format=None, **options):
+    """Stream an export of ``days`` (see plan_days) to ``path``, and return the number of meals written.
+
+    The file is written next to ``path`` and renamed over it when complete,
+    so a failed export never leaves a half-written calendar behind.
+    """
+    export_format = export_format or format_for_path(path)
+    meals = 0
+
+    def counted():
+        nonlocal meals
+        for row in days:
+            meals += 1
+            yield row
+
+    chunks = export_chunks(counted(), export_format, **options)
+    temp_path = f"{path}.tmp"
+    try:
+        with open(temp_path, "w", encoding="utf-8", newline="") as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    return meals
@@ -0,0 +1,140 @@
+import datetime
+import random
+from array import array
+from collections import deque
+
+from .plan import DAYS
+
+
+class FillRules:
+    """Constraints for PlanGenerator.
+
+    ``no_repeat_days``: a meal is not planned again on the next N days.
+    ``max_per_month``: uses of a meal per calendar month (per 4-week block
+    if the plan has no start date), or None for no limit.
+    ``fixed_days``: ``{day: meal or list of meals}`` limiting what a day
+    may have, e.g. ``{"Friday": ["Fish and Chips", "Fish Pie"]}``. Meals
+    that are only named here are not used on other days.
+    """
+
+    def __init__(self, no_repeat_days=6, max_per_month=None, fixed_days=None):
+        self.no_repeat_days = no_repeat_days
+        self.max_per_month = max_per_month
+        self.fixed_days = {day: [meals] if isinstance(meals, str) else list(meals)
+                           for day, meals in (fixed_days or {}).items()}
+
+
+class PlanGenerator:
+    """Fills weeks from a meal library, one day at a time and without backtracking.
+
+    Meals are numbered, and each rule is kept as an int bitset over them:
+    the meals each day may have, the meals used in the last
+    ``no_repeat_days`` days and the meals used up for this month. A day's
+    candidates are then ``allowed & ~recent & ~used_up``, and a random
+    candidate is the lowest set bit after rotating the bitset by a random
+    amount, so each day costs a few int operations whatever the library
+    size. If no meal satisfies every rule, the allowed meal used longest
+    ago is chosen and counted in ``violations``.
+
+    Days are identified by slot (``week * 7 + day index``, see search.slot)
+    and must be observed or chosen in order.
+    """
+
+    def __init__(self, library, rules=None, start_date=None, seed=None):
+        library = list(library)
+        self.rules = rules or FillRules()
+        fixed_meals = [meal for meals in self.rules.fixed_days.values() for meal in meals]
+        self.meals = list(dict.fromkeys(meal for meal in library + fixed_meals if meal))
+        if not self.meals:
+            raise ValueError("The meal library is empty")
+        self._ids = {meal: meal_id for meal_id, meal in enumerate(self.meals)}
+        self._all = (1 << len(self.meals)) - 1
+        # Meals named only in fixed_days are kept for those days
+        library_mask = self._mask(meal for meal in library if meal) or self._all
+        self._allowed = [self._mask(self.rules.fixed_days[day]) if day in self.rules.fixed_days else library_mask
+                         for day in DAYS]
+        self.start_date = start_date
+        self.random = random.Random(seed)
+        self.violations = 0
+        self._window = deque()  # Meal ids of the last no_repeat_days days, -1 for none
+        self._in_window = array('I', bytes(4 * len(self.meals)))
+        self._recent = 0
+        self._month_end = -1  # First slot of the next month
+        self._month_uses = array('I', bytes(4 * len(self.meals)))
+        self._used_up = 0
+        self._last_used = array('q', [-1] * len(self.meals))
+
+    def _mask(self, meals):
+        mask = 0
+        for meal in meals:
+            mask |= 1 << self._ids[meal]
+        return mask
+
+    def _start_month(self, position):
+        days = position - len(DAYS)  # Days since the Monday of week 1
+        if self.start_date is None:
+            self._month_end = (days // 28 + 1) * 28 + len(DAYS)
+        else:
+            date = self.start_date + datetime.timedelta(days=days)
+            next_month = datetime.date(date.year + date.month // 12, date.month % 12 + 1, 1)
+            self._month_end = (next_month - self.start_date).days + len(DAYS)
+        self._month_uses = array('I', bytes(4 * len(self.meals)))
+        self._used_up = 0
+
+    def _record(self, position, meal_id):
+        if position >= self._month_end:
+            self._start_month(position)
+        window = self.rules.no_repeat_days
+        if window > 0:
+            self._window.append(meal_id)
+            if meal_id >= 0:
+                self._in_window[meal_id] += 1
+                self._recent |= 1 << meal_id
+            if len(self._window) > window:
+                old = self._window.popleft()
+                if old >= 0:
+                    self._in_window[old] -= 1
+                    if not self._in_window[old]:
+                        self._recent &= ~(1 << old)
+        if meal_id >= 0:
+            self._last_used[meal_id] = position
+            self._month_uses[meal_id] += 1
+            if self.rules.max_per_month is not None and self._month_uses[meal_id] >= self.rules.max_per_month:
+                self._used_up |= 1 << meal_id
+
+    def observe(self, position, meal):
+        """Account for a meal that is already planned at slot ``position``."""
+        self._record(position, self._ids.get(meal, -1))
+
+    def choose(self, position):
+        """Pick and record the meal for slot ``position``."""
+        allowed = self._allowed[position % len(DAYS)]
+        candidates = allowed & ~self._recent & ~self._used_up
+        if candidates:
+            shift = self.random.randrange(len(self.meals))
+            rotated = ((candidates >> shift) | (candidates << (len(self.meals) - shift))) & self._all
+            meal_id = ((rotated & -rotated).bit_length() - 1 + shift) % len(self.meals)
+        else:
+            self.violations += 1
+            meal_id = min((meal_id for meal_id in range(len(self.meals)) if allowed >> meal_id & 1),
+                          key=self._last_used.__getitem__)
+        self._record(position, meal_id)
+        return self.meals[meal_id]
+
+    def fill(self, weekly_plans, weeks):
+        """Return ``{week: {day: meal}}`` for ``weeks``, taking the meals planned in earlier weeks into account."""
+        targets = set(weeks)
+        filled = {}
+        if not targets:
+            return filled
+        # Start early enough to see the whole month and repeat window of the first week filled
+        lookback = max(5, -(-self.rules.no_repeat_days // len(DAYS)))
+        first = max(1, min(targets) - lookback)
+        for week in range(first, max(targets) + 1):
+            if week in targets:
+                filled[week] = {day: self.choose(week * len(DAYS) + index) for index, day in enumerate(DAYS)}
+            else:
+                meals = weekly_plans.get(week, {})
+                for index, day in enumerate(DAYS):
+                    self.observe(week * len(DAYS) + index, meals.get(day))
+        return filled
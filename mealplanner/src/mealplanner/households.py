@@ -0,0 +1,102 @@
+import os
+import re
+import time
+from collections import OrderedDict
+
+from .engine import DATA_FILE, STORAGE_BACKEND, PlanEngine
+from .log import logger
+from .recipes import RECIPES_FILE
+
+HOUSEHOLDS_DIR = "households" # Next to DATA_FILE: one <name>.json per extra household
+DEFAULT_HOUSEHOLD = "Home" # The household whose plan is DATA_FILE itself
+CACHE_MAX_BYTES = 64 * 1024 * 1024 # Estimated memory for open plans before the least recently used is closed
+
+_NAME = re.compile(r"^[\w][\w '&.-]*$")
+# The recipes file shared by the households in HOUSEHOLDS_DIR is not a household
+_RESERVED = os.path.splitext(RECIPES_FILE)[0].casefold()
+
+
+class HouseholdManager:
+    """Named household plan files, with an LRU cache of loaded PlanEngines.
+
+    Opening a household that is in the cache is a dictionary lookup. When
+    the estimated size of the cached plans (``PlanEngine.estimated_size``)
+    goes over ``max_bytes``, the least recently used plans are closed;
+    plans with unsaved changes are saved first. The plan opened last is
+    always kept, however big.
+    """
+
+    def __init__(self, data_file=DATA_FILE, storage_backend=STORAGE_BACKEND, max_bytes=CACHE_MAX_BYTES):
+        self.data_file = data_file
+        self.storage_backend = storage_backend
+        self.max_bytes = max_bytes
+        self.directory = os.path.join(os.path.dirname(data_file), HOUSEHOLDS_DIR)
+        self.engines = OrderedDict() # name -> PlanEngine, least recently used first
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.load_seconds = 0.0
+
+    def path(self, name):
+        """Return the data file of household ``name``."""
+        if name == DEFAULT_HOUSEHOLD:
+            return self.data_file
+        if not _NAME.match(name) or name in (".", "..") or name.casefold() == _RESERVED:
+            raise ValueError(f"Invalid household name: {name!r}")
+        return os.path.join(self.directory, f"{name}.json")
+
+    def names(self):
+        """Return the default household, then the others found on disk or open, by name."""
+        names = set(self.engines)
+        try:
+            names.update(os.path.splitext(entry)[0] for entry in os.listdir(self.directory)
+                         if entry.endswith(".json") and entry.casefold() != RECIPES_FILE.casefold())
+        except FileNotFoundError:
+            pass
+        names.discard(DEFAULT_HOUSEHOLD)
+        return [DEFAULT_HOUSEHOLD] + sorted(names, key=str.casefold)
+
+    def adopt(self, name, engine):
+        """Put an engine that is already loaded into the cache as household ``name``."""
+        self.engines[name] = engine
+        self.engines.move_to_end(name)
+        self._evict()
+
+    def open(self, name):
+        """Return the loaded PlanEngine for household ``name``, from the cache if it is there."""
+        engine = self.engines.get(name)
+        if engine is not None:
+            self.hits += 1
+            self.engines.move_to_end(name)
+            self._evict() # Plans grow as they are edited
+            return engine
+        self.misses += 1
+        data_file = self.path(name)
+        os.makedirs(os.path.dirname(data_file) or ".", exist_ok=True)
+        start = time.perf_counter()
+        engine = PlanEngine(data_file, self.storage_backend).load()
+        self.load_seconds += time.perf_counter() - start
+        self.engines[name] = engine
+        self._evict()
+        return engine
+
+    def cached_bytes(self):
+        return sum(engine.estimated_size() for engine in self.engines.values())
+
+    def _evict(self):
+        while len(self.engines) > 1 and self.cached_bytes() > self.max_bytes:
+            name, engine = self.engines.popitem(last=False)
+            self.evictions += 1
+            self._close(name, engine)
+
+    def _close(self, name, engine):
+        if engine.dirty:
+            logger.debug("Saving household %s before closing it", name)
+            engine.close()
+        else:
+            engine.release()
+
+    def close(self):
+        """Save and close every open household."""
+        while self.engines:
+            self.engines.popitem(last=False)[1].close()
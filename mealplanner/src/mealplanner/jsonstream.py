@@ -0,0 +1,116 @@
+"""Incremental reader for large JSON objects.
+
+``iter_members`` reads a JSON object from a text file in chunks and yields
+its members one at a time. Members of one nested object (the plan's
+``weeks``) are yielded one by one too, so a caller can build its own
+structures as it reads and never hold the whole document in memory.
+"""
+import json
+
+CHUNK_SIZE = 1024 * 1024
+
+_WHITESPACE = " \t\n\r"
+_decoder = json.JSONDecoder()
+
+
+class _Reader:
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size):
+        chunk = self.f.read(size)
+        if not chunk:
+            self.eof = True
+            return False
+        if self.pos > self.chunk_size:
+            # Drop what has been consumed so the buffer stays about a chunk long
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        self.buffer += chunk
+        return True
+
+    def peek(self):
+        """Skip whitespace and return the next character, or "" at the end of the file."""
+        while True:
+            buffer, pos = self.buffer, self.pos
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(buffer):
+                return buffer[pos]
+            if not self._fill(self.chunk_size):
+                return ""
+
+    def expect(self, chars):
+        char = self.peek()
+        if not char or char not in chars:
+            raise json.JSONDecodeError(f"Expecting one of {chars!r}", self.buffer, self.pos)
+        self.pos += 1
+        return char
+
+    def value(self):
+        """Decode the next complete JSON value, reading more of the file until it is complete."""
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Most likely the value runs past the end of the buffer
+                if not self._fill(size):
+                    raise
+                size *= 2
+                continue
+            if end == len(self.buffer) and not self.eof and not isinstance(value, (str, dict, list)):
+                # A number may continue in the next chunk ("12" + "34")
+                if self._fill(size):
+                    continue
+            self.pos = end
+            return value
+
+
+def iter_members(f, nested_key=None, chunk_size=CHUNK_SIZE):
+    """Yield ``(parent, key, value)`` for the members of the JSON object in ``f``.
+
+    Top-level members have ``parent`` None. If the value of ``nested_key``
+    is an object, its members are yielded with ``parent`` set to
+    ``nested_key`` instead of as one value. Raises json.JSONDecodeError if
+    the file isn't a JSON object.
+    """
+    reader = _Reader(f, chunk_size)
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.pos += 1
+    else:
+        while True:
+            key = reader.value()
+            if not isinstance(key, str):
+                raise json.JSONDecodeError("Expecting property name", reader.buffer, reader.pos)
+            reader.expect(":")
+            if key == nested_key and reader.peek() == "{":
+                yield from _iter_nested(reader, key)
+            else:
+                yield None, key, reader.value()
+            if reader.expect(",}") == "}":
+                break
+    if reader.peek():
+        raise json.JSONDecodeError("Extra data", reader.buffer, reader.pos)
+
+
+def _iter_nested(reader, parent):
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.pos += 1
+        return
+    while True:
+        key = reader.value()
+        if not isinstance(key, str):
+            raise json.JSONDecodeError("Expecting property name", reader.buffer, reader.pos)
+        reader.expect(":")
+        yield parent, key, reader.value()
+        if reader.expect(",}") == "}":
+            return
@@ -0,0 +1,80 @@
+import logging
+import os
+
+LOGGER_NAME = "mealplanner"
+
+# Defaults, overridable from the environment for kiosk, server and test runs.
+LEVEL = os.environ.get("MEALPLANNER_LOG_LEVEL", "INFO").upper()
+LOG_FILE = os.environ.get("MEALPLANNER_LOG_FILE") or None
+HEADLESS = os.environ.get("MEALPLANNER_HEADLESS", "") not in ("", "0")
+LOG_FILE_MAX_BYTES = 1024 * 1024
+LOG_FILE_BACKUPS = 3
+
+FORMAT = "%(asctime)s - %(levelname)s: %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+logger = logging.getLogger(LOGGER_NAME)
+
+
+class GUIConsoleHandler(logging.Handler):
+    """Logging handler that shows records in the app's message consoles.
+
+    Records below WARNING go to the stdout console and the rest to the stderr
+    console. Records logged before the consoles exist are held (up to
+    ``capacity``) and shown once ``attach`` is called.
+    """
+
+    def __init__(self, level=logging.NOTSET, capacity=500):
+        super().__init__(level)
+        self.stdout_console = None
+        self.stderr_console = None
+        self.capacity = capacity
+        self.pending = []
+
+    def attach(self, stdout_console, stderr_console):
+        self.stdout_console = stdout_console
+        self.stderr_console = stderr_console
+        pending, self.pending = self.pending, []
+        for record in pending:
+            self.emit(record)
+
+    def emit(self, record):
+        if self.stdout_console is None:
+            if len(self.pending) < self.capacity:
+                self.pending.append(record)
+            return
+        try:
+            console = self.stderr_console if record.levelno >= logging.WARNING else self.stdout_console
+            console.append(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+
+def configure_logging(level=LEVEL, gui=True, log_file=LOG_FILE,
+                      max_bytes=LOG_FILE_MAX_BYTES, backups=LOG_FILE_BACKUPS):
+    """Set up the ``mealplanner`` logger and return its GUIConsoleHandler, or None when ``gui`` is off.
+
+    Messages below ``level`` are dropped before they are formatted. With
+    ``log_file`` set, records are also written to a rotating log file. Calling
+    this again replaces the handlers from the previous call.
+    """
+    logger.setLevel(level)
+    for handler in list(logger.handlers):
+        if getattr(handler, "_mealplanner_handler", False):
+            logger.removeHandler(handler)
+            handler.close()
+
+    formatter = logging.Formatter(FORMAT, DATE_FORMAT)
+    handlers = []
+    if log_file:
+        from logging.handlers import RotatingFileHandler
+
+        handlers.append(RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backups, encoding="utf-8"))
+    gui_handler = GUIConsoleHandler() if gui else None
+    if gui_handler is not None:
+        handlers.append(gui_handler)
+    for handler in handlers:
+        handler._mealplanner_handler = True
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+    return gui_handler
@@ -0,0 +1,249 @@
+import threading
+from array import array
+from collections.abc import Mapping, MutableMapping
+
+DAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+_DAY_INDEX = {day: index for index, day in enumerate(DAYS)}
+_NO_MEALS = (0,) * len(DAYS)
+# Meals of a week nothing has been planned for; stores use them to replay journaled edits to such weeks
+DEFAULT_WEEK_MEALS = {
+    "Monday": "Pasta",
+    "Tuesday": "Tacos",
+    "Wednesday": "Pizza",
+    "Thursday": "Chicken and Veggies",
+    "Friday": "Fish and Chips",
+    "Saturday": "Steak",
+    "Sunday": "Roast Dinner",
+}
+
+
+class MealTable:
+    """Intern table giving each distinct meal name a small integer id.
+
+    Id 0 is reserved for "no meal". Plans repeat a few hundred names across
+    thousands of weeks, so weeks store ids and share one copy of each name.
+    The UI thread and the background writer both intern names, so new names
+    are added under a lock; looking up a known name takes no lock.
+    """
+
+    __slots__ = ("names", "ids", "_lock")
+
+    def __init__(self):
+        self.names = [None]
+        self.ids = {}
+        self._lock = threading.Lock()
+
+    def intern(self, name):
+        meal_id = self.ids.get(name)
+        if meal_id is None:
+            with self._lock:
+                meal_id = self.ids.get(name)
+                if meal_id is None:
+                    # The name goes in before its id is visible, so names[id] always works
+                    self.names.append(name)
+                    meal_id = self.ids[name] = len(self.names) - 1
+        return meal_id
+
+
+class Week(MutableMapping):
+    """One week of meals as seven interned meal ids, one slot per day in DAYS order.
+
+    Reads and writes like the ``{day: meal}`` dict it replaces. Only the
+    seven day names are valid keys and meals must be strings.
+    """
+
+    __slots__ = ("table", "ids")
+
+    def __init__(self, table, ids=_NO_MEALS):
+        self.table = table
+        self.ids = array('I', ids)
+
+    @classmethod
+    def from_mapping(cls, table, meals):
+        """Build a Week from a ``{day: meal}`` mapping, skipping unknown days and non-string meals."""
+        if isinstance(meals, Week) and meals.table is table:
+            return cls(table, meals.ids)
+        week = cls(table)
+        for day, meal in meals.items():
+            index = _DAY_INDEX.get(day)
+            if index is not None and isinstance(meal, str):
+                week.ids[index] = table.intern(meal)
+        return week
+
+    def copy(self):
+        return Week(self.table, self.ids)
+
+    def __getitem__(self, day):
+        meal_id = self.ids[_DAY_INDEX[day]]
+        if not meal_id:
+            raise KeyError(day)
+        return self.table.names[meal_id]
+
+    def __setitem__(self, day, meal):
+        if not isinstance(meal, str):
+            raise TypeError(f"Meal must be a string, not {type(meal).__name__}")
+        self.ids[_DAY_INDEX[day]] = self.table.intern(meal)
+
+    def __delitem__(self, day):
+        index = _DAY_INDEX[day]
+        if not self.ids[index]:
+            raise KeyError(day)
+        self.ids[index] = 0
+
+    def __iter__(self):
+        return (day for day, meal_id in zip(DAYS, self.ids) if meal_id)
+
+    def __len__(self):
+        return len(DAYS) - self.ids.count(0)
+
+    def __contains__(self, day):
+        index = _DAY_INDEX.get(day)
+        return index is not None and self.ids[index] != 0
+
+    def __repr__(self):
+        return repr(dict(self))
+
+    def __eq__(self, other):
+        if isinstance(other, Week) and other.table is self.table:
+            return self.ids == other.ids
+        if isinstance(other, Mapping):
+            return dict(self) == dict(other.items())
+        return NotImplemented
+
+
+class WeekPlans(MutableMapping):
+    """Week number -> meals mapping that materialises weeks on demand.
+
+    Reads come from three layers: weeks edited in this session, ``stored``
+    weeks (the loaded snapshot, or a lazy database view) and, for any other
+    week up to ``num_weeks``, the shared ``default_week``. Nothing is copied
+    until a week is written to: looking up a stored or default week returns
+    a copy-on-write WeekView, and only weeks that were changed end up in
+    ``edited``, as compact Week objects interned in ``table``.
+
+    It reads and writes like the plain ``{week: {day: meal}}`` dict it
+    replaces, so ``weekly_plans[week][day] = meal`` keeps working.
+    """
+
+    def __init__(self, stored=None, default_week=None, num_weeks=0, table=None):
+        self.stored = stored if stored is not None else {}
+        self.default_week = default_week if default_week is not None else {}
+        self.num_weeks = num_weeks
+        self.table = table if table is not None else MealTable()
+        self.edited = {}
+        self._removed = set()
+
+    def _in_default_range(self, week):
+        return isinstance(week, int) and 1 <= week <= self.num_weeks
+
+    def __getitem__(self, week):
+        meals = self.edited.get(week)
+        if meals is not None:
+            return meals
+        if week in self._removed:
+            raise KeyError(week)
+        if week in self.stored:
+            return WeekView(self, week, self.stored[week])
+        if self._in_default_range(week):
+            return WeekView(self, week, self.default_week)
+        raise KeyError(week)
+
+    def __setitem__(self, week, meals):
+        self._removed.discard(week)
+        self.edited[week] = Week.from_mapping(self.table, meals)
+
+    def __delitem__(self, week):
+        if week not in self:
+            raise KeyError(week)
+        self.edited.pop(week, None)
+        self._removed.add(week)
+
+    def __contains__(self, week):
+        if week in self.edited:
+            return True
+        if week in self._removed:
+            return False
+        return week in self.stored or self._in_default_range(week)
+
+    def __iter__(self):
+        weeks = set(self.edited)
+        weeks.update(self.stored)
+        weeks.update(range(1, self.num_weeks + 1))
+        weeks.difference_update(self._removed)
+        return iter(sorted(weeks, key=lambda week: (not isinstance(week, int), week)))
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"{type(self).__name__}(stored={len(self.stored)}, edited={len(self.edited)}, num_weeks={self.num_weeks})"
+
+    def materialise(self, week, meals):
+        """Return the edited Week for ``week``, copying ``meals`` into it on first write."""
+        edited = self.edited.get(week)
+        if edited is None:
+            edited = self.edited[week] = Week.from_mapping(self.table, meals)
+            self._removed.discard(week)
+        return edited
+
+    def reset_week(self, week):
+        """Drop this session's changes to ``week``, so it reads from ``stored`` (or the default) again."""
+        self.edited.pop(week, None)
+        self._removed.discard(week)
+
+    def persisted_weeks(self, copy=False):
+        """Return ``{week: meals}`` for every stored or edited week, but not untouched defaults.
+
+        With ``copy`` the edited weeks are copied, so the result can be
+        handed to another thread while editing continues.
+        """
+        weeks = {week: meals for week, meals in self.stored.items() if week not in self._removed}
+        for week, meals in self.edited.items():
+            weeks[week] = meals.copy() if copy else meals
+        return weeks
+
+    def changed_weeks(self, copy=False):
+        """Return ``{week: meals}`` for the weeks edited since loading."""
+        return {week: meals.copy() if copy else meals for week, meals in self.edited.items()}
+
+
+class WeekView(MutableMapping):
+    """Copy-on-write view of one week whose meals are shared (stored or default)."""
+
+    __slots__ = ("_plans", "_week", "_meals")
+
+    def __init__(self, plans, week, meals):
+        self._plans = plans
+        self._week = week
+        self._meals = meals
+
+    def _data(self):
+        return self._plans.edited.get(self._week, self._meals)
+
+    def __getitem__(self, day):
+        return self._data()[day]
+
+    def __setitem__(self, day, meal):
+        self._plans.materialise(self._week, self._meals)[day] = meal
+
+    def __delitem__(self, day):
+        if day not in self._data():
+            raise KeyError(day)
+        del self._plans.materialise(self._week, self._meals)[day]
+
+    def __iter__(self):
+        return iter(self._data())
+
+    def __len__(self):
+        return len(self._data())
+
+    def __contains__(self, day):
+        return day in self._data()
+
+    def __repr__(self):
+        return repr(dict(self._data()))
+
+    def __eq__(self, other):
+        if isinstance(other, Mapping):
+            return dict(self._data().items()) == dict(other.items())
+        return NotImplemented
@@ -0,0 +1,198 @@
+"""Recipes for meals, and shopping lists summed over ranges of weeks.
+
+Recipes are read from a JSON file mapping meal names to ingredient lists::
+
+    {
+        "Spaghetti Bolognese": [
+            {"ingredient": "spaghetti", "quantity": 500, "unit": "g"},
+            ["beef mince", 0.5, "kg"],
+            ["onion", 1]
+        ]
+    }
+
+Quantities are converted to a base unit per kind (grams, millilitres or
+a count), so "500 g" and "0.5 kg" of the same ingredient add up.
+"""
+import json
+from collections import namedtuple
+
+from .log import logger
+from .plan import DAYS
+
+RECIPES_FILE = "recipes.json"
+
+# unit -> (base unit, factor to the base unit)
+UNITS = {
+    "g": ("g", 1), "gram": ("g", 1), "kg": ("g", 1000), "kilogram": ("g", 1000), "mg": ("g", 0.001),
+    "oz": ("g", 28.349523125), "ounce": ("g", 28.349523125), "lb": ("g", 453.59237), "pound": ("g", 453.59237),
+    "ml": ("ml", 1), "millilitre": ("ml", 1), "l": ("ml", 1000), "litre": ("ml", 1000), "liter": ("ml", 1000),
+    "tsp": ("ml", 5), "teaspoon": ("ml", 5), "tbsp": ("ml", 15), "tablespoon": ("ml", 15), "cup": ("ml", 240),
+    "": ("", 1), "each": ("", 1), "piece": ("", 1), "pc": ("", 1),
+}
+# Shown in the larger unit once a total reaches it
+LARGER_UNITS = {"g": ("kg", 1000), "ml": ("l", 1000)}
+
+ShoppingItem = namedtuple("ShoppingItem", "ingredient quantity unit")
+
+
+def normalise_unit(unit):
+    """Return ``(base unit, factor)`` for a unit name; unknown units are their own base unit."""
+    name = (unit or "").strip().casefold().rstrip(".")
+    if name not in UNITS and name.endswith("s") and name[:-1] in UNITS:
+        name = name[:-1]  # grams, cups, pieces
+    return UNITS.get(name, (name, 1))
+
+
+def meal_key(meal):
+    return " ".join(meal.casefold().split())
+
+
+class RecipeBook:
+    """Recipes by meal name, each precomputed as an ingredient vector.
+
+    A vector is a tuple of ``((ingredient, base unit), quantity)`` pairs
+    with the quantities already converted, so adding up a meal is a few
+    additions. Meal names are matched ignoring case and extra spaces.
+    """
+
+    def __init__(self, recipes=None):
+        self.vectors = {}
+        for meal, ingredients in (recipes or {}).items():
+            self.add(meal, ingredients)
+
+    @classmethod
+    def load(cls, path):
+        """Read a recipes file; a missing or invalid file gives an empty book."""
+        try:
+            with open(path) as f:
+                recipes = json.load(f)
+        except FileNotFoundError:
+            return cls()
+        except (ValueError, OSError) as e:
+            logger.error("Error reading recipes from %s: %s", path, e)
+            return cls()
+        if not isinstance(recipes, dict):
+            logger.error("Error reading recipes from %s: not a JSON object", path)
+            return cls()
+        return cls(recipes)
+
+    def add(self, meal, ingredients):
+        """Add or replace the recipe for ``meal``; malformed ingredients are skipped with a warning."""
+        totals = {}
+        for item in ingredients if isinstance(ingredients, list) else []:
+            if isinstance(item, dict):
+                name, quantity, unit = item.get("ingredient"), item.get("quantity", 1), item.get("unit", "")
+            elif isinstance(item, list) and 1 <= len(item) <= 3:
+                name, quantity, unit = list(item) + [None, 1, ""][len(item):]
+            else:
+                name = quantity = unit = None
+            if not isinstance(name, str) or not isinstance(quantity, (int, float)) or not isinstance(unit, str):
+                logger.warning("Skipping malformed ingredient for %s: %r", meal, item)
+                continue
+            base_unit, factor = normalise_unit(unit)
+            key = (" ".join(name.casefold().split()), base_unit)
+            totals[key] = totals.get(key, 0) + quantity * factor
+        self.vectors[meal_key(meal)] = tuple(totals.items())
+
+    def vector(self, meal):
+        """Return the ingredient vector for ``meal``, or None if it has no recipe."""
+        return self.vectors.get(meal_key(meal)) if meal else None
+
+
+class ShoppingListCache:
+    """Ingredient totals per week and per range of weeks over a plan.
+
+    Kept up to date like the other views over the plan (``update``,
+    ``update_week``, ``remove_week``): an edit drops the week's totals,
+    which are summed again from the recipe vectors when next needed. A
+    cached range then only has that week's old totals taken off and the new
+    ones added, so re-listing a year after an edit costs one week, not 52.
+    """
+
+    MAX_RANGES = 8  # Ranges of weeks whose totals are kept
+
+    def __init__(self, recipe_book, weekly_plans):
+        self.recipe_book = recipe_book
+        self.weekly_plans = weekly_plans
+        self._weeks = {}  # week -> ({(ingredient, unit): quantity}, meals without a recipe)
+        self._ranges = {}  # (first, last) -> [totals, {week: week entry summed}, (items, missing) or None]
+
+    def update(self, week, day, meal):
+        self._weeks.pop(week, None)
+
+    def update_week(self, week, meals):
+        self._weeks.pop(week, None)
+
+    def remove_week(self, week):
+        self._weeks.pop(week, None)
+
+    def week_totals(self, week):
+        cached = self._weeks.get(week)
+        if cached is None:
+            totals = {}
+            missing = set()
+            meals = self.weekly_plans.get(week, {})
+            for day in DAYS:
+                meal = meals.get(day)
+                vector = self.recipe_book.vector(meal)
+                if vector is None:
+                    if meal:
+                        missing.add(meal)
+                    continue
+                for key, quantity in vector:
+                    totals[key] = totals.get(key, 0) + quantity
+            cached = self._weeks[week] = (totals, frozenset(missing))
+        return cached
+
+    def aggregate(self, weeks):
+        """Return ``({(ingredient, base unit): quantity}, meals without a recipe)`` summed over ``weeks``."""
+        totals = {}
+        missing = set()
+        for week in weeks:
+            week_totals, week_missing = self.week_totals(week)
+            for key, quantity in week_totals.items():
+                totals[key] = totals.get(key, 0) + quantity
+            missing |= week_missing
+        return totals, missing
+
+    def shopping_list(self, first_week, last_week):
+        """Return ``(ShoppingItems, sorted meals without a recipe)`` for weeks ``first_week`` to ``last_week``."""
+        key = (first_week, last_week)
+        cached = self._ranges.pop(key, None)
+        if cached is None:
+            cached = [{}, {}, None]
+            if len(self._ranges) >= self.MAX_RANGES:
+                del self._ranges[next(iter(self._ranges))]
+        self._ranges[key] = cached  # Most recently used last
+        totals, summed, result = cached
+        for week in range(first_week, last_week + 1):
+            entry = self.week_totals(week)
+            old = summed.get(week)
+            if old is entry:
+                continue
+            if old is not None:
+                for ingredient, quantity in old[0].items():
+                    remaining = totals[ingredient] - quantity
+                    if abs(remaining) > 1e-9:
+                        totals[ingredient] = remaining
+                    else:
+                        del totals[ingredient]
+            for ingredient, quantity in entry[0].items():
+                totals[ingredient] = totals.get(ingredient, 0) + quantity
+            summed[week] = entry
+            result = None
+        if result is None:
+            missing = set().union(*(entry[1] for entry in summed.values()))
+            result = cached[2] = (shopping_items(totals), sorted(missing))
+        return result
+
+
+def shopping_items(totals):
+    """Turn aggregated totals into ShoppingItems sorted by ingredient, in readable units."""
+    items = []
+    for (ingredient, unit), quantity in sorted(totals.items()):
+        larger_unit, factor = LARGER_UNITS.get(unit, (None, None))
+        if larger_unit and quantity >= factor:
+            quantity, unit = quantity / factor, larger_unit
+        items.append(ShoppingItem(ingredient, round(quantity, 2), unit))
+    return items
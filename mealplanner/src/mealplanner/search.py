@@ -0,0 +1,160 @@
+import re
+
+from .plan import DAYS
+
+_DAY_INDEX = {day: index for index, day in enumerate(DAYS)}
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """Split a meal name or query into lower-case word tokens."""
+    return _TOKEN.findall(text.casefold()) if text else []
+
+
+def slot(week, day):
+    """Return the bit position of ``day`` of ``week``; slots are numbered in plan order."""
+    return week * len(DAYS) + _DAY_INDEX[day]
+
+
+def slot_day(position):
+    """Return the ``(week, day)`` of a bit position."""
+    week, day_index = divmod(position, len(DAYS))
+    return week, DAYS[day_index]
+
+
+class SlotIndex:
+    """Index from keys derived from each meal to the days those meals are planned.
+
+    Subclasses say which keys a meal has (``meal_keys``). Each key's
+    postings are one int used as a bitset, with the bit at ``slot(week,
+    day)`` set for every day whose meal has the key, and ``counts`` holds
+    the number of those days. An edit flips one bit per key and adjusts a
+    count, with no rescan of the plan; flipping a bit builds a new int, so
+    its cost grows with the bitset (about one machine word per 64 days up
+    to the key's last planned day). Only weeks from 1 up are indexed.
+
+    The index keeps its own copy of every indexed meal, so ``update`` can
+    remove the old postings without being told what the meal was.
+    """
+
+    def __init__(self):
+        self.postings = {}
+        self.counts = {}
+        self._meals = {}  # week -> list of meals in DAYS order
+        self._keys = {}  # meal name -> its distinct keys
+
+    def meal_keys(self, meal):
+        raise NotImplementedError
+
+    @classmethod
+    def build(cls, weekly_plans):
+        """Index every week of a ``{week: {day: meal}}`` mapping."""
+        index = cls()
+        slots = {}
+        for week in weekly_plans:
+            if not isinstance(week, int) or week < 1:
+                continue
+            meals = weekly_plans[week]
+            week_meals = index._meals[week] = [None] * len(DAYS)
+            for day_index, day in enumerate(DAYS):
+                meal = meals.get(day)
+                if meal and isinstance(meal, str):
+                    week_meals[day_index] = meal
+                    position = week * len(DAYS) + day_index
+                    for key in index._meal_keys(meal):
+                        slots.setdefault(key, []).append(position)
+        # Setting bits in a bytearray is linear; OR-ing them into an int one by one is not
+        for key, positions in slots.items():
+            bits = bytearray(max(positions) // 8 + 1)
+            for position in positions:
+                bits[position >> 3] |= 1 << (position & 7)
+            index.postings[key] = int.from_bytes(bits, "little")
+            index.counts[key] = len(positions)
+        return index
+
+    def _meal_keys(self, meal):
+        keys = self._keys.get(meal)
+        if keys is None:
+            keys = self._keys[meal] = tuple(dict.fromkeys(self.meal_keys(meal)))
+        return keys
+
+    def update(self, week, day, meal):
+        """Re-index one day after its meal changed (``meal`` may be None or "" for no meal)."""
+        if not isinstance(week, int) or week < 1:
+            return
+        day_index = _DAY_INDEX[day]
+        meals = self._meals.setdefault(week, [None] * len(DAYS))
+        old_meal = meals[day_index]
+        if old_meal == meal:
+            return
+        bit = 1 << slot(week, day)
+        if old_meal:
+            for key in self._meal_keys(old_meal):
+                count = self.counts[key] - 1
+                if count:
+                    self.postings[key] &= ~bit
+                    self.counts[key] = count
+                else:
+                    del self.postings[key]
+                    del self.counts[key]
+        meals[day_index] = meal
+        if meal:
+            for key in self._meal_keys(meal):
+                self.postings[key] = self.postings.get(key, 0) | bit
+                self.counts[key] = self.counts.get(key, 0) + 1
+
+    def update_week(self, week, meals):
+        """Re-index a whole week from its ``{day: meal}`` mapping."""
+        for day in DAYS:
+            meal = meals.get(day)
+            self.update(week, day, meal if isinstance(meal, str) else None)
+
+    def remove_week(self, week):
+        """Drop a week from the index, e.g. when the plan is shortened."""
+        if week in self._meals:
+            for day in DAYS:
+                self.update(week, day, None)
+            del self._meals[week]
+
+
+class MealIndex(SlotIndex):
+    """Inverted index from meal-name words to the days those meals are planned.
+
+    Matching all the words of a query is an AND of a few bitsets, counting
+    the matches is ``bit_count`` and finding the next match after a day is
+    a shift, whatever the size of the plan.
+    """
+
+    def meal_keys(self, meal):
+        return tokenize(meal)
+
+    def search(self, query):
+        """Return the bitset of days whose meal contains every word of ``query`` (0 for none)."""
+        tokens = dict.fromkeys(tokenize(query))
+        if not tokens:
+            return 0
+        bits = -1
+        for token in tokens:
+            bits &= self.postings.get(token, 0)
+            if not bits:
+                break
+        return bits
+
+    @staticmethod
+    def matches(bits):
+        """Return the ``(week, day)`` of every bit set in ``bits``, in plan order."""
+        binary = bin(bits)[:1:-1]  # Lowest bit first, so string index == bit position
+        result = []
+        position = binary.find("1")
+        while position >= 0:
+            result.append(slot_day(position))
+            position = binary.find("1", position + 1)
+        return result
+
+    @staticmethod
+    def next_match(bits, after=-1):
+        """Return the position of the first bit set in ``bits`` after position ``after``, or None."""
+        bits >>= after + 1
+        if not bits:
+            return None
+        return after + (bits & -bits).bit_length()
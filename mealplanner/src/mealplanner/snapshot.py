@@ -0,0 +1,439 @@
+"""Compact binary snapshots of a meal plan, read through mmap.
+
+A snapshot holds the same data as the JSON document ``save_meals`` writes.
+Each distinct meal name is stored once, and each week is a fixed-width
+record, so a week can be looked up (by binary search) and decoded without
+reading the rest of the file. Layout, all little-endian:
+
+    header   magic, version, start_date string id, num_weeks (0: none),
+             string count, week count and the offsets of the sections below
+    weeks    one record per week, sorted by week number:
+             int64 week, then a uint32 meal string id per day in DAYS order
+    offsets  a uint64 file offset for each string id, 1..string count
+    strings  per string: uint32 byte length, then the UTF-8 bytes
+
+String id 0 means "none" (no meal, or no start date).
+"""
+import heapq
+import json
+import mmap
+import os
+import struct
+import sys
+import weakref
+from array import array
+from collections.abc import Mapping
+
+from .plan import DAYS, DEFAULT_WEEK_MEALS, Week
+from .store import BACKUP_COUNT, PlanStore
+
+MAGIC = b"MEALSNAP"
+VERSION = 1
+HEADER = struct.Struct("<8sIIqQQQQQ")
+WEEK_RECORD = struct.Struct("<q%dI" % len(DAYS))
+_WEEK_NUMBER = struct.Struct("<q")
+_OFFSET = struct.Struct("<Q")
+_LENGTH = struct.Struct("<I")
+
+
+class SnapshotError(ValueError):
+    """The file is not a valid snapshot."""
+
+
+def snapshot_path(data_file):
+    """Return the snapshot path used for ``data_file`` (meal_plans.json -> meal_plans.mealsnap)."""
+    return os.path.splitext(data_file)[0] + ".mealsnap"
+
+
+def _meal_ids(meals, intern):
+    """Return the per-day string ids of a week's meals, giving new names ids with ``intern``."""
+    if isinstance(meals, Week):
+        table_names = meals.table.names
+        return [intern(table_names[meal_id]) if meal_id else 0 for meal_id in meals.ids]
+    meal_ids = [0] * len(DAYS)
+    for index, day in enumerate(DAYS):
+        meal = meals.get(day)
+        if isinstance(meal, str):
+            meal_ids[index] = intern(meal)
+    return meal_ids
+
+
+def write_snapshot(f, document):
+    """Write a plan ``document`` (as passed to PlanStore.save) to the binary file ``f``."""
+    ids = {}
+    names = []
+
+    def intern(name):
+        string_id = ids.get(name)
+        if string_id is None:
+            names.append(name)
+            string_id = ids[name] = len(names)
+        return string_id
+
+    records = {int(key): _meal_ids(meals, intern) for key, meals in document.get('weeks', {}).items()}
+
+    start_date = document.get('start_date')
+    start_date_id = intern(start_date) if start_date is not None else 0
+    num_weeks = document.get('num_weeks') or 0
+
+    encoded = [name.encode('utf-8') for name in names]
+    weeks_pos = HEADER.size
+    offsets_pos = weeks_pos + WEEK_RECORD.size * len(records)
+    strings_pos = offsets_pos + _OFFSET.size * len(encoded)
+    offsets = array('Q')
+    position = strings_pos
+    for data in encoded:
+        offsets.append(position)
+        position += _LENGTH.size + len(data)
+    if sys.byteorder != "little":
+        offsets.byteswap()
+
+    f.write(HEADER.pack(MAGIC, VERSION, start_date_id, num_weeks, len(encoded), len(records),
+                        weeks_pos, offsets_pos, strings_pos))
+    f.write(b"".join(WEEK_RECORD.pack(week, *records[week]) for week in sorted(records)))
+    f.write(offsets.tobytes())
+    f.write(b"".join(_LENGTH.pack(len(data)) + data for data in encoded))
+
+
+class Snapshot:
+    """A memory-mapped snapshot file; weeks and strings are decoded on demand."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < HEADER.size:
+                raise SnapshotError(f"{path} is too short to be a snapshot")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, start_date_id, num_weeks, self.string_count, self.week_count,
+         self._weeks_pos, self._offsets_pos, self._strings_pos) = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            raise SnapshotError(f"{path} is not a version {VERSION} meal plan snapshot")
+        if (self._weeks_pos + WEEK_RECORD.size * self.week_count > self._offsets_pos
+                or self._offsets_pos + _OFFSET.size * self.string_count > self._strings_pos
+                or self._strings_pos > size or start_date_id > self.string_count):
+            raise SnapshotError(f"{path} is truncated or corrupt")
+        self.size = size
+        self.num_weeks = num_weeks or None
+        self.start_date = self.string(start_date_id)
+
+    def close(self):
+        self._map.close()
+
+    def string(self, string_id):
+        if not string_id:
+            return None
+        if string_id > self.string_count:
+            raise SnapshotError(f"string id {string_id} out of range")
+        (offset,) = _OFFSET.unpack_from(self._map, self._offsets_pos + _OFFSET.size * (string_id - 1))
+        if offset < self._strings_pos or offset + _LENGTH.size > self.size:
+            raise SnapshotError(f"string id {string_id} has a bad offset")
+        (length,) = _LENGTH.unpack_from(self._map, offset)
+        if offset + _LENGTH.size + length > self.size:
+            raise SnapshotError(f"string id {string_id} runs past the end of the file")
+        return self._map[offset + _LENGTH.size:offset + _LENGTH.size + length].decode('utf-8')
+
+    def week_number(self, index):
+        return _WEEK_NUMBER.unpack_from(self._map, self._weeks_pos + WEEK_RECORD.size * index)[0]
+
+    def _position(self, week):
+        """Return the index of the first week record not before ``week`` (binary search)."""
+        low, high = 0, self.week_count
+        while low < high:
+            middle = (low + high) // 2
+            if self.week_number(middle) < week:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def find(self, week):
+        """Return the record index of ``week``, or -1."""
+        index = self._position(week)
+        return index if index < self.week_count and self.week_number(index) == week else -1
+
+    def meal_ids(self, index):
+        """Return the per-day meal string ids of the week record at ``index``."""
+        return WEEK_RECORD.unpack_from(self._map, self._weeks_pos + WEEK_RECORD.size * index)[1:]
+
+    def write_updated(self, f, weeks, start_date, num_weeks):
+        """Write this snapshot to ``f`` with ``weeks`` ({week: meals}) put over its weeks.
+
+        Only the given weeks are encoded. The other week records, and the
+        strings, are copied as they are, so a string keeps its id and a save
+        that changes one week doesn't decode the rest of the plan. New meal
+        names are added after the existing strings. Returns the weeks written.
+        """
+        ids = {self.string(string_id): string_id for string_id in range(1, self.string_count + 1)}
+        names = []
+
+        def intern(name):
+            string_id = ids.get(name)
+            if string_id is None:
+                names.append(name)
+                string_id = ids[name] = self.string_count + len(names)
+            return string_id
+
+        records = {int(key): _meal_ids(meals, intern) for key, meals in weeks.items()}
+        start_date_id = intern(start_date) if start_date is not None else 0
+        week_count = self.week_count + sum(1 for week in records if self.find(week) < 0)
+
+        encoded = [name.encode('utf-8') for name in names]
+        string_count = self.string_count + len(encoded)
+        weeks_pos = HEADER.size
+        offsets_pos = weeks_pos + WEEK_RECORD.size * week_count
+        strings_pos = offsets_pos + _OFFSET.size * string_count
+        offsets = array('Q', self._map[self._offsets_pos:self._offsets_pos + _OFFSET.size * self.string_count])
+        if sys.byteorder != "little":
+            offsets.byteswap()
+        shift = strings_pos - self._strings_pos  # The existing strings move as one block
+        offsets = array('Q', (offset + shift for offset in offsets))
+        position = strings_pos + self.size - self._strings_pos
+        for data in encoded:
+            offsets.append(position)
+            position += _LENGTH.size + len(data)
+        if sys.byteorder != "little":
+            offsets.byteswap()
+
+        f.write(HEADER.pack(MAGIC, VERSION, start_date_id, num_weeks or 0, string_count, week_count,
+                            weeks_pos, offsets_pos, strings_pos))
+        copied = 0  # Records before this index are written
+        for week in sorted(records):
+            index = self._position(week)
+            f.write(self._map[self._weeks_pos + WEEK_RECORD.size * copied:self._weeks_pos + WEEK_RECORD.size * index])
+            copied = index + 1 if index < self.week_count and self.week_number(index) == week else index
+            f.write(WEEK_RECORD.pack(week, *records[week]))
+        f.write(self._map[self._weeks_pos + WEEK_RECORD.size * copied:self._weeks_pos + WEEK_RECORD.size * self.week_count])
+        f.write(offsets.tobytes())
+        f.write(self._map[self._strings_pos:self.size])
+        f.write(b"".join(_LENGTH.pack(len(data)) + data for data in encoded))
+        return set(records)
+
+    def document(self):
+        """Decode the whole snapshot into the JSON document ``save_meals`` would write."""
+        names = [None] + [self.string(string_id) for string_id in range(1, self.string_count + 1)]
+        weeks = {}
+        for index in range(self.week_count):
+            record = WEEK_RECORD.unpack_from(self._map, self._weeks_pos + WEEK_RECORD.size * index)
+            weeks[str(record[0])] = {day: names[meal_id] for day, meal_id in zip(DAYS, record[1:]) if meal_id}
+        return {'weeks': weeks, 'start_date': self.start_date, 'num_weeks': self.num_weeks}
+
+
+class SnapshotWeeks(Mapping):
+    """Read-only ``{week: Week}`` view of a Snapshot, decoding each week on first access.
+
+    Meal names are interned into ``table`` once per string, so weeks read
+    from the snapshot share names with the rest of the plan.
+
+    A view keeps showing the weeks it was created with when the snapshot
+    file is replaced by a save: the weeks the save rewrote are decoded and
+    pinned first (``pin``), and the rest are read from the new file, which
+    holds the same records and string ids for them (``attach``). Without a
+    snapshot to read, only the pinned weeks are left (``detach`` pins all).
+    """
+
+    def __init__(self, snapshot, table):
+        self.snapshot = snapshot
+        self.table = table
+        self._cache = {}
+        self._pinned = {}  # week -> Week, or None where the snapshot has a week this view doesn't
+        self._table_ids = array('I', bytes(4 * (snapshot.string_count + 1)))
+
+    def _table_id(self, string_id):
+        if string_id >= len(self._table_ids):
+            raise SnapshotError(f"string id {string_id} out of range")
+        table_id = self._table_ids[string_id]
+        if not table_id and string_id:
+            table_id = self._table_ids[string_id] = self.table.intern(self.snapshot.string(string_id))
+        return table_id
+
+    def pin(self, weeks):
+        """Keep this view's meals for ``weeks`` in memory, whatever the snapshot holds for them later."""
+        for week in weeks:
+            if week not in self._pinned:
+                self._pinned[week] = self[week] if week in self else None
+                self._cache.pop(week, None)
+
+    def detach(self):
+        """Pin every week and let go of the snapshot; returns it, for the caller to close."""
+        if self.snapshot is not None:
+            self.pin(list(self))
+        return self.release()
+
+    def release(self):
+        """Let go of the snapshot, returning it; only pinned weeks can be read until ``attach``."""
+        snapshot, self.snapshot = self.snapshot, None
+        return snapshot
+
+    def attach(self, snapshot):
+        """Read the weeks that aren't pinned from ``snapshot``, written from this view's old one by write_updated."""
+        self.snapshot = snapshot
+        self._table_ids.extend(array('I', bytes(4 * max(0, snapshot.string_count + 1 - len(self._table_ids)))))
+
+    def __getitem__(self, week):
+        if week in self._pinned:
+            meals = self._pinned[week]
+            if meals is None:
+                raise KeyError(week)
+            return meals
+        meals = self._cache.get(week)
+        if meals is None:
+            index = self.snapshot.find(week) if self.snapshot is not None and isinstance(week, int) else -1
+            if index < 0:
+                raise KeyError(week)
+            meal_ids = [self._table_id(string_id) for string_id in self.snapshot.meal_ids(index)]
+            meals = self._cache[week] = Week(self.table, meal_ids)
+        return meals
+
+    def __contains__(self, week):
+        if week in self._pinned:
+            return self._pinned[week] is not None
+        return week in self._cache or (self.snapshot is not None and isinstance(week, int)
+                                       and self.snapshot.find(week) >= 0)
+
+    def __iter__(self):
+        pinned = sorted(week for week, meals in self._pinned.items() if meals is not None)
+        if self.snapshot is None:
+            return iter(pinned)
+        stored = (self.snapshot.week_number(index) for index in range(self.snapshot.week_count))
+        if not self._pinned:
+            return stored
+        return heapq.merge((week for week in stored if week not in self._pinned), pinned)
+
+    def __len__(self):
+        if self.snapshot is None:
+            return sum(1 for meals in self._pinned.values() if meals is not None)
+        length = self.snapshot.week_count
+        for week, meals in self._pinned.items():
+            length += (meals is not None) - (self.snapshot.find(week) >= 0)
+        return length
+
+
+class SnapshotPlanStore(PlanStore):
+    """PlanStore that keeps the snapshot in the binary format instead of JSON.
+
+    Loading maps the file and reads only the header; weeks are decoded as
+    they are looked up (see SnapshotWeeks). Edits are journaled exactly as
+    for JSON. When the snapshot does not exist yet and ``json_path`` does,
+    the JSON plan is converted on first load.
+
+    Like SQLitePlanStore, ``save`` writes the weeks in the document over
+    the stored ones and leaves the others as they are, so saving an edit
+    encodes only the edited weeks (see Snapshot.write_updated). The views
+    of the old file are closed before it is replaced, since Windows won't
+    replace a file that is still mapped, and then read the new one.
+    """
+
+    SAVES_CHANGES_ONLY = True
+    SNAPSHOT_WRITE_MODE = 'wb'
+
+    def __init__(self, path, json_path=None):
+        super().__init__(path)
+        self.json_path = json_path
+        self.snapshot = None
+        self._views = []  # weakref.ref to each SnapshotWeeks handed out; Mappings aren't hashable
+        self._written = set()  # Weeks the save in progress writes
+        self._released = []  # Views closed by _before_replace, to read the new file
+
+    def load(self):
+        with self.lock:
+            if self.json_path and not os.path.exists(self.path) and os.path.exists(self.json_path):
+                try:
+                    migrate_json_to_snapshot(self.json_path, self.path, DEFAULT_WEEK_MEALS)
+                except ValueError:
+                    pass  # Leave an unreadable JSON file alone; the plan starts from the defaults
+            return super().load()
+
+    def _read_snapshot(self, size):
+        snapshot = Snapshot(self.path)
+        self._reset()
+        self.snapshot = snapshot
+        self.num_weeks = snapshot.num_weeks
+        self.start_date = snapshot.start_date
+        self.weeks = SnapshotWeeks(snapshot, self.table)
+        self._views.append(weakref.ref(self.weeks))
+
+    def save(self, document, backups=BACKUP_COUNT):
+        with self.lock:
+            self.load()  # The weeks not in the document are kept from the file as it is now
+            try:
+                super().save(document, backups)
+            finally:
+                if self._released:
+                    # The file wasn't replaced; the views go back to reading it
+                    try:
+                        self._read_snapshot(None)
+                    except (OSError, ValueError):
+                        self._reset()
+                        self._signature = None
+                        self._released = []
+                    else:
+                        self.exists = True
+                        self._attach_released()
+
+    def _write_snapshot(self, f, document):
+        if self.snapshot is None:
+            write_snapshot(f, document)
+            self._written = set()  # No views of an earlier file to keep
+        else:
+            self._written = self.snapshot.write_updated(f, document.get('weeks', {}), document.get('start_date'),
+                                                        document.get('num_weeks'))
+
+    def _before_replace(self):
+        views, mapped = [], {}
+        for view in self._views:
+            weeks = view()
+            if weeks is None:
+                continue
+            views.append(view)
+            if self.snapshot is not None and weeks.snapshot is self.snapshot:
+                weeks.pin(self._written)  # The only weeks the new file has different records for
+                weeks.release()
+                self._released.append(weeks)
+            else:
+                snapshot = weeks.detach()  # Read from a file replaced earlier, whose string ids don't carry over
+                if snapshot is not None:
+                    mapped[id(snapshot)] = snapshot
+        if self.snapshot is not None:
+            mapped[id(self.snapshot)] = self.snapshot
+        for snapshot in mapped.values():
+            snapshot.close()  # Views can share a snapshot, so each is closed once they have all let go
+        self._views = views
+        self.snapshot = None
+
+    def _saved(self, document):
+        self._read_snapshot(None)
+        self._attach_released()
+
+    def _attach_released(self):
+        for weeks in self._released:
+            weeks.attach(self.snapshot)
+        self._released = []
+
+    def close(self):
+        # The map is closed once the last view of its weeks is gone
+        self.snapshot = None
+
+
+def migrate_json_to_snapshot(json_path, path, default_week=None):
+    """Write the plan in ``json_path`` (and its journal) as a snapshot at ``path``; returns the number of weeks."""
+    store = PlanStore(json_path).load()
+    if store.error == PlanStore.INVALID:
+        raise ValueError(f"{json_path} is not a valid meal plan file")
+    weeks = store.replayed_weeks(default_week or {})
+    if os.path.exists(path):
+        os.remove(path)  # Saving over a snapshot would keep its weeks that the JSON plan doesn't have
+    SnapshotPlanStore(path).save({'weeks': weeks, 'start_date': store.start_date, 'num_weeks': store.num_weeks}, backups=0)
+    return len(weeks)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3 or not sys.argv[1].endswith((".json", ".mealsnap")):
+        sys.exit("usage: python -m mealplanner.snapshot meal_plans.json meal_plans.mealsnap\n"
+                 "       python -m mealplanner.snapshot meal_plans.mealsnap meal_plans.json")
+    source, target = sys.argv[1:]
+    if source.endswith(".json"):
+        print(f"Wrote {migrate_json_to_snapshot(source, target, DEFAULT_WEEK_MEALS)} weeks from {source} to {target}")
+    else:
+        with open(target, 'w') as f:
+            json.dump(Snapshot(source).document(), f, indent=4)
+        print(f"Wrote {source} to {target}")
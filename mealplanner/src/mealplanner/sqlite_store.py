@@ -0,0 +1,254 @@
+import os
+import sqlite3
+import sys
+import threading
+from collections.abc import Mapping
+
+from .plan import DEFAULT_WEEK_MEALS, MealTable, Week, WeekPlans
+from .store import PlanStore
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS weeks (
+    week INTEGER PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS meals (
+    week INTEGER NOT NULL,
+    day TEXT NOT NULL,
+    meal TEXT NOT NULL,
+    PRIMARY KEY (week, day)
+) WITHOUT ROWID;
+"""
+
+UPSERT_MEAL = (
+    "INSERT INTO meals (week, day, meal) VALUES (?, ?, ?) "
+    "ON CONFLICT (week, day) DO UPDATE SET meal = excluded.meal"
+)
+
+
+def sqlite_path(data_file):
+    """Return the database path used for ``data_file`` (meal_plans.json -> meal_plans.sqlite3)."""
+    return os.path.splitext(data_file)[0] + ".sqlite3"
+
+
+class StoredWeeks(Mapping):
+    """Read-only view of the weeks in the database, fetching each week on first access.
+
+    Used as the ``stored`` layer of a WeekPlans, so only the weeks that are
+    looked at are read.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._cache = {}
+        self._absent = set()
+
+    def __getitem__(self, week):
+        meals = self._cache.get(week)
+        if meals is None:
+            if week in self._absent:
+                raise KeyError(week)
+            meals = self.store.fetch_week(week)
+            if meals is None:
+                self._absent.add(week)
+                raise KeyError(week)
+            meals = self._cache[week] = Week.from_mapping(self.store.table, meals)
+        return meals
+
+    def __contains__(self, week):
+        try:
+            self[week]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        return iter(self.store.week_numbers())
+
+    def __len__(self):
+        return len(self.store.week_numbers())
+
+
+class SQLitePlanStore:
+    """SQLite storage backend with the same interface as PlanStore.
+
+    Meals are rows keyed by (week, day), so opening a plan only reads the
+    settings, weeks are fetched as they are displayed (see StoredWeeks) and a
+    single edit is a single-row upsert rather than a rewrite. There is no
+    journal: ``append_edits`` writes straight to the database, and ``save``
+    only needs the weeks that changed.
+
+    When the database does not exist yet and ``json_path`` does, the JSON
+    plan is migrated into it on first load.
+    """
+
+    MISSING = PlanStore.MISSING
+    INVALID = PlanStore.INVALID
+    SAVES_CHANGES_ONLY = True
+
+    def __init__(self, path, json_path=None):
+        self.path = path
+        self.json_path = json_path
+        self.table = MealTable()
+        self.lock = threading.RLock()
+        self.journal = []
+        self.invalid_week_keys = []
+        self._connection = None
+        self.exists = False
+        self.error = None
+        self.num_weeks = None
+        self.start_date = None
+
+    def _has_data(self):
+        return self._connection is not None or os.path.exists(self.path) or bool(
+            self.json_path and os.path.exists(self.json_path))
+
+    def connect(self):
+        if self._connection is None:
+            if not os.path.exists(self.path) and self.json_path and os.path.exists(self.json_path):
+                migrate_json_to_sqlite(self.json_path, self.path, DEFAULT_WEEK_MEALS)
+            # Shared with the BackgroundWriter thread; every use holds self.lock
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.executescript(SCHEMA)
+        return self._connection
+
+    def changed_on_disk(self):
+        # Other writers go through SQLite's own locking, and weeks are read as they are shown
+        return False
+
+    def load(self):
+        """Read the settings, and return self. Meals are read per week by ``fetch_week``."""
+        with self.lock:
+            if not self._has_data():
+                self.exists = False
+                self.error = self.MISSING
+                self.num_weeks = self.start_date = None
+                return self
+            settings = dict(self.connect().execute("SELECT key, value FROM settings"))
+        self.exists = True
+        self.error = None
+        num_weeks = settings.get('num_weeks')
+        self.num_weeks = int(num_weeks) if num_weeks and int(num_weeks) > 0 else None
+        self.start_date = settings.get('start_date') or None
+        return self
+
+    def fetch_week(self, week):
+        """Return the stored meals for ``week`` as a dict, or None if it isn't stored."""
+        if not isinstance(week, int) or not self._has_data():
+            return None
+        with self.lock:
+            connection = self.connect()
+            if connection.execute("SELECT 1 FROM weeks WHERE week = ?", (week,)).fetchone() is None:
+                return None
+            return dict(connection.execute("SELECT day, meal FROM meals WHERE week = ?", (week,)))
+
+    def week_numbers(self):
+        if not self._has_data():
+            return []
+        with self.lock:
+            return [week for (week,) in self.connect().execute("SELECT week FROM weeks ORDER BY week")]
+
+    def replayed_weeks(self, default_week):
+        return WeekPlans(StoredWeeks(self), default_week, 0, self.table)
+
+    def plan_weeks(self, default_week, num_weeks):
+        return WeekPlans(StoredWeeks(self), default_week, num_weeks, self.table)
+
+    def append_edit(self, week, day, meal, default_week=None):
+        self.append_edits([(week, day, meal)], default_week)
+
+    def append_edits(self, records, default_week=None):
+        """Upsert (week, day, meal) records in one transaction.
+
+        A week that isn't stored yet is first filled from ``default_week``, so
+        it reads back the same as the week the user saw.
+        """
+        with self.lock:
+            connection = self.connect()
+            with connection:
+                for week, day, meal in records:
+                    created = connection.execute("INSERT OR IGNORE INTO weeks (week) VALUES (?)", (week,)).rowcount
+                    if created and default_week:
+                        connection.executemany(
+                            "INSERT OR IGNORE INTO meals (week, day, meal) VALUES (?, ?, ?)",
+                            [(week, default_day, default_meal) for default_day, default_meal in default_week.items()])
+                    connection.execute(UPSERT_MEAL, (week, day, meal))
+            self.exists = True
+            self.error = None
+
+    def needs_compaction(self, *args, **kwargs):
+        return False
+
+    def compact(self, default_week, backups=None):
+        pass
+
+    def save(self, document, backups=None):
+        """Write the settings and every week in ``document``.
+
+        Weeks that are not in ``document`` (for example ones that were never
+        edited) are left as they are in the database.
+        """
+        with self.lock:
+            connection = self.connect()
+            with connection:
+                _write_document(connection, document)
+            self.exists = True
+            self.error = None
+            self.num_weeks = document.get('num_weeks')
+            self.start_date = document.get('start_date')
+
+    def close(self):
+        with self.lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+def _write_document(connection, document):
+    connection.executemany(
+        "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+        [('num_weeks', None if document.get('num_weeks') is None else str(document['num_weeks'])),
+         ('start_date', document.get('start_date'))])
+    weeks = document.get('weeks', {})
+    week_numbers = [(int(week),) for week in weeks]
+    connection.executemany("INSERT OR IGNORE INTO weeks (week) VALUES (?)", week_numbers)
+    connection.executemany("DELETE FROM meals WHERE week = ?", week_numbers)
+    connection.executemany(
+        "INSERT INTO meals (week, day, meal) VALUES (?, ?, ?)",
+        ((int(week), day, meal) for week, meals in weeks.items() for day, meal in meals.items()))
+
+
+def migrate_json_to_sqlite(json_path, db_path, default_week=None):
+    """One-shot migration of a meal_plans.json file (and its journal) into a new database.
+
+    Journaled edits to weeks that were never saved start from
+    ``default_week``, or keep only the edited days if it isn't given.
+    Returns the number of weeks migrated.
+    """
+    store = PlanStore(json_path).load()
+    if store.error == PlanStore.INVALID:
+        raise ValueError(f"{json_path} is not a valid meal plan file")
+    weeks = store.replayed_weeks(default_week or {})
+    tmp_path = db_path + ".migrating"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    connection = sqlite3.connect(tmp_path)
+    try:
+        connection.executescript(SCHEMA)
+        with connection:
+            _write_document(connection, {'weeks': weeks, 'start_date': store.start_date, 'num_weeks': store.num_weeks})
+    finally:
+        connection.close()
+    os.replace(tmp_path, db_path)
+    return len(weeks)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3):
+        sys.exit("usage: python -m mealplanner.sqlite_store meal_plans.json [meal_plans.sqlite3]")
+    source = sys.argv[1]
+    target = sys.argv[2] if len(sys.argv) == 3 else sqlite_path(source)
+    print(f"Migrated {migrate_json_to_sqlite(source, target, DEFAULT_WEEK_MEALS)} weeks from {source} to {target}")
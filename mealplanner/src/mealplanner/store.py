@@ -0,0 +1,405 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections.abc import Mapping
+
+from .jsonstream import iter_members
+from .plan import MealTable, Week, WeekPlans
+
+# Compact the journal into a fresh snapshot once it grows past either limit.
+JOURNAL_MAX_BYTES = 256 * 1024
+JOURNAL_MAX_AGE = 15 * 60  # seconds since the oldest journaled edit
+
+# Number of rotated copies of the previous data file kept by PlanStore.save.
+BACKUP_COUNT = 3
+
+# Data files at least this big are parsed incrementally, week by week, so the
+# parsed document is never held in memory next to the weeks built from it.
+STREAMING_MIN_BYTES = 8 * 1024 * 1024
+
+STORAGE_BACKENDS = ("json", "sqlite", "binary")
+
+
+def open_store(data_file, backend="json"):
+    """Return the store for ``data_file`` using the named storage backend.
+
+    ``"json"`` keeps plans in ``data_file`` itself. ``"sqlite"`` keeps them
+    in a database next to it (``meal_plans.sqlite3`` for
+    ``meal_plans.json``), and ``"binary"`` in a memory-mapped snapshot
+    (``meal_plans.mealsnap``); both migrate the JSON file on first use.
+    """
+    if backend == "json":
+        return PlanStore(data_file)
+    if backend == "sqlite":
+        from .sqlite_store import SQLitePlanStore, sqlite_path
+
+        return SQLitePlanStore(sqlite_path(data_file), json_path=data_file)
+    if backend == "binary":
+        from .snapshot import SnapshotPlanStore, snapshot_path
+
+        return SnapshotPlanStore(snapshot_path(data_file), json_path=data_file)
+    raise ValueError(f"Unknown storage backend: {backend!r}")
+
+
+class PlanStore:
+    """Parse-once, in-memory view of a meal plan data file.
+
+    The file is read and validated a single time and the results are kept in
+    memory, so ``load_settings``, ``load_meals`` and ``load_start_date`` can
+    all share one parse. The document is only read again when the file on
+    disk changes (different inode, size or modification time).
+
+    Single-meal edits can be appended to a journal next to the data file
+    (``<path>.journal``, one JSON record per line) instead of rewriting the
+    whole document. ``journal`` holds the records to replay on top of
+    ``weeks``; writing a new snapshot with ``save`` or ``compact`` empties it.
+
+    All reads and writes hold ``lock``, so a store can be shared with the
+    BackgroundWriter thread.
+    """
+
+    MISSING = "missing"
+    INVALID = "invalid"
+    # save() rewrites the whole file, so it needs every persisted week
+    SAVES_CHANGES_ONLY = False
+    SNAPSHOT_WRITE_MODE = 'w'
+
+    def __init__(self, path):
+        self.path = path
+        self.table = MealTable()
+        self.journal_path = path + ".journal"
+        self.lock = threading.RLock()
+        self._signature = None
+        self._journal_signature = None
+        self._synced = False # The file has been read or written through this store
+        self._reset()
+        self.journal = []
+        self.journal_bytes = 0
+        self.journal_started = None
+
+    def _reset(self):
+        self.exists = False
+        self.error = None
+        self.num_weeks = None
+        self.start_date = None
+        self.weeks = {}
+        self.invalid_week_keys = []
+
+    def _stat_signature(self, path):
+        stat = os.stat(path)
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    def changed_on_disk(self):
+        """True if the data file changed since this store last read or wrote it."""
+        if not self._synced:
+            return False
+        try:
+            signature = self._stat_signature(self.path)
+        except OSError:
+            signature = None
+        return signature != self._signature
+
+    def load(self):
+        """Read the data file and journal if they changed since the last load, and return self."""
+        with self.lock:
+            self._load_snapshot()
+            self._load_journal()
+            self._synced = True
+        return self
+
+    def _load_snapshot(self):
+        try:
+            signature = self._stat_signature(self.path)
+        except OSError:
+            self._signature = None
+            self._reset()
+            self.error = self.MISSING
+            return
+
+        if signature == self._signature:
+            return
+
+        try:
+            self._read_snapshot(signature[1])
+        except FileNotFoundError:
+            self._signature = None
+            self._reset()
+            self.error = self.MISSING
+            return
+        except ValueError:  # Includes json.JSONDecodeError and UnicodeDecodeError
+            self._apply(None)
+
+        self.exists = True
+        self._signature = signature
+
+    def _read_snapshot(self, size):
+        with open(self.path, 'r') as f:
+            if size >= STREAMING_MIN_BYTES:
+                self._apply_stream(f)
+            else:
+                self._apply(json.load(f))
+
+    def _write_snapshot(self, f, document):
+        json.dump(document, f, indent=4, default=_encode_mapping)
+
+    def _load_journal(self):
+        try:
+            signature = self._stat_signature(self.journal_path)
+        except OSError:
+            self._journal_signature = None
+            self.journal = []
+            self.journal_bytes = 0
+            self.journal_started = None
+            return
+
+        if signature == self._journal_signature:
+            return
+
+        records = []
+        with open(self.journal_path, 'rb') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    week, day, meal = record['week'], record['day'], record['meal']
+                except (ValueError, KeyError, TypeError):
+                    continue  # A torn line from a crash mid-append
+                if isinstance(week, int) and isinstance(day, str) and isinstance(meal, str):
+                    records.append((week, day, meal))
+        self.journal = records
+        self.journal_bytes = signature[1]
+        self._journal_signature = signature
+        if records and self.journal_started is None:
+            # The records were appended after the last snapshot, so its age bounds theirs
+            try:
+                self.journal_started = os.stat(self.path).st_mtime
+            except OSError:
+                self.journal_started = time.time()
+
+    def replayed_weeks(self, default_week):
+        """Return the weeks as persisted: the snapshot with journaled edits replayed.
+
+        Weeks that only exist in the journal start from a copy of
+        ``default_week``. Each week is copied, so edits to the result don't
+        leak into the store.
+        """
+        weeks = {week: meals.copy() for week, meals in self.weeks.items()}
+        for week, day, meal in self.journal:
+            if week not in weeks:
+                weeks[week] = Week.from_mapping(self.table, default_week)
+            weeks[week][day] = meal
+        return weeks
+
+    def plan_weeks(self, default_week, num_weeks):
+        """Return the WeekPlans to plan with: the snapshot, journaled edits, and defaults up to ``num_weeks``.
+
+        Snapshot and default weeks are shared rather than copied; only the
+        journaled weeks are materialised up front.
+        """
+        weeks = WeekPlans(self.weeks, default_week, num_weeks, self.table)
+        for week, day, meal in self.journal:
+            if week not in weeks:
+                weeks[week] = default_week
+            weeks[week][day] = meal
+        return weeks
+
+    def append_edit(self, week, day, meal, default_week=None):
+        """Durably append one meal edit to the journal."""
+        self.append_edits([(week, day, meal)], default_week)
+
+    def append_edits(self, records, default_week=None):
+        """Durably append (week, day, meal) records to the journal in a single write.
+
+        ``default_week`` is accepted for interface parity with SQLitePlanStore;
+        the journal gets default weeks from whoever replays it.
+        """
+        data = "".join(json.dumps({'week': week, 'day': day, 'meal': meal}) + "\n" for week, day, meal in records).encode()
+        with self.lock:
+            self.load()  # Pick up records already on disk before extending the journal
+            with open(self.journal_path, 'a+b') as f:
+                if f.seek(0, os.SEEK_END) > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        data = b"\n" + data  # Start clean after a torn line
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            if not self.journal:
+                self.journal_started = time.time()
+            self.journal.extend(records)
+            try:
+                signature = self._stat_signature(self.journal_path)
+                self.journal_bytes = signature[1]
+                self._journal_signature = signature
+            except OSError:
+                self._journal_signature = None
+
+    def needs_compaction(self, max_bytes=JOURNAL_MAX_BYTES, max_age=JOURNAL_MAX_AGE):
+        """True when the journal is big or old enough to be folded into a snapshot."""
+        if not self.journal:
+            return False
+        if self.journal_bytes >= max_bytes or not self.exists:
+            return True
+        return time.time() - self.journal_started >= max_age
+
+    def compact(self, default_week, backups=BACKUP_COUNT):
+        """Fold the journal into a new snapshot built from the stored document."""
+        with self.lock:
+            self.load()
+            if self.SAVES_CHANGES_ONLY:
+                weeks = self.plan_weeks(default_week, 0).changed_weeks()  # Only the journaled weeks
+            else:
+                weeks = self.replayed_weeks(default_week)
+            self.save({'weeks': weeks, 'start_date': self.start_date, 'num_weeks': self.num_weeks}, backups)
+
+    def save(self, document, backups=BACKUP_COUNT):
+        """Atomically replace the data file with ``document`` and drop the journal.
+
+        The document is written to a temporary file in the same directory,
+        fsynced and renamed over the data file, so a crash leaves either the
+        old or the new file in place and never a partial one. The previous
+        file is kept as ``<path>.1``, older copies shifting up to
+        ``<path>.<backups>``.
+        """
+        with self.lock:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(self.path) + ".", suffix=".tmp", dir=directory)
+            try:
+                with os.fdopen(fd, self.SNAPSHOT_WRITE_MODE) as f:
+                    self._write_snapshot(f, document)
+                    f.flush()
+                    os.fsync(f.fileno())
+                try:
+                    os.chmod(tmp_path, os.stat(self.path).st_mode & 0o777)
+                except FileNotFoundError:
+                    pass
+                self._before_replace()
+                self._rotate_backups(backups)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
+            _fsync_directory(directory)
+
+            # The new snapshot covers everything in the journal
+            try:
+                os.remove(self.journal_path)
+            except FileNotFoundError:
+                pass
+            self.journal = []
+            self.journal_bytes = 0
+            self.journal_started = None
+            self._journal_signature = None
+
+            self._saved(document)
+            self.exists = True
+            self._synced = True
+            try:
+                self._signature = self._stat_signature(self.path)
+            except OSError:
+                self._signature = None
+
+    def _before_replace(self):
+        """Called once the new file is written, before the data file is renamed away and replaced."""
+
+    def _saved(self, document):
+        """Make the store reflect ``document``, which save() has just written."""
+        self._apply(document)
+
+    def close(self):
+        pass
+
+    def backup_path(self, number):
+        return f"{self.path}.{number}"
+
+    def _rotate_backups(self, backups):
+        if backups <= 0 or not os.path.exists(self.path):
+            return
+        for number in range(backups - 1, 0, -1):
+            if os.path.exists(self.backup_path(number)):
+                os.replace(self.backup_path(number), self.backup_path(number + 1))
+        newest = self.backup_path(1)
+        if os.path.exists(newest):
+            os.remove(newest)
+        try:
+            os.link(self.path, newest)
+        except OSError:
+            shutil.copy2(self.path, newest)  # Filesystems without hard links
+
+    def _apply(self, data):
+        self._reset()
+        if not isinstance(data, dict):
+            self.error = self.INVALID
+            return
+
+        self._apply_setting('num_weeks', data.get('num_weeks'))
+        self._apply_setting('start_date', data.get('start_date'))
+        weeks = data.get('weeks', {})
+        if not isinstance(weeks, dict):
+            weeks = {}
+        for week_str, meals in weeks.items():
+            self._apply_week(week_str, meals)
+
+    def _apply_stream(self, f):
+        """Like ``_apply(json.load(f))``, but builds each week as it is read.
+
+        Peak memory is the weeks plus one read buffer, instead of the whole
+        parsed document as well. Raises json.JSONDecodeError if ``f`` isn't
+        a JSON object.
+        """
+        self._reset()
+        for parent, key, value in iter_members(f, nested_key='weeks'):
+            if parent == 'weeks':
+                self._apply_week(key, value)
+            elif key == 'weeks':
+                # Not an object: like a missing 'weeks', and a later 'weeks' replaces an earlier one
+                self.weeks.clear()
+                self.invalid_week_keys.clear()
+            elif key in ('num_weeks', 'start_date'):
+                self._apply_setting(key, value)
+
+    def _apply_setting(self, key, value):
+        if key == 'num_weeks':
+            valid = isinstance(value, int) and not isinstance(value, bool) and value > 0
+            self.num_weeks = value if valid else None
+        elif key == 'start_date':
+            self.start_date = value if isinstance(value, str) and value else None
+
+    def _apply_week(self, week_str, meals):
+        try:
+            week = int(week_str)
+        except ValueError:
+            self.invalid_week_keys.append(week_str)
+            return
+        if isinstance(meals, Mapping):
+            # Interned copies: edits to the saved document don't leak into the store
+            self.weeks[week] = Week.from_mapping(self.table, meals)
+        else:
+            self.weeks.pop(week, None)
+            self.invalid_week_keys.append(week_str)
+
+
+def _encode_mapping(value):
+    # Lets json.dump write Week and WeekView objects as plain objects
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _fsync_directory(directory):
+    """Make a rename in ``directory`` durable, where the platform supports it."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
@@ -0,0 +1,136 @@
+import os
+import sys
+
+from .log import logger
+
+POLL_INTERVAL = 2.0 # Seconds between checks when inotify isn't available
+SETTLE_DELAY = 0.2 # Seconds to wait after the last change event before reporting it
+
+# inotify(7) constants
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_EVENT_HEADER = 16 # struct inotify_event: int wd, uint32 mask, cookie, len
+
+
+def _inotify():
+    """Return libc if it has inotify (Linux), else None."""
+    if not sys.platform.startswith("linux"):
+        return None
+    import ctypes # Only needed when a watcher starts
+    import ctypes.util
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1, libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    return libc
+
+
+class PlanWatcher:
+    """Calls ``callback()`` on the event loop when the file at ``path`` changes.
+
+    On Linux the file's directory is watched with inotify, so editors and
+    sync tools that replace the file by renaming are seen too; elsewhere
+    (or if inotify can't be set up) the file's size and mtime are polled
+    every ``interval`` seconds. Bursts of events are reported once, after
+    ``SETTLE_DELAY`` seconds without another. Changes this app makes itself
+    are reported as well; PlanEngine.reload_changes ignores those.
+    """
+
+    def __init__(self, path, callback, interval=POLL_INTERVAL):
+        self.path = os.path.abspath(path)
+        self.callback = callback
+        self.interval = interval
+        self.loop = None
+        self.mode = None # "inotify" or "poll" once started
+        self._fd = None
+        self._handle = None
+        self._signature = None
+
+    def start(self, loop, use_inotify=True):
+        self.loop = loop
+        if use_inotify and self._start_inotify():
+            self.mode = "inotify"
+        else:
+            self.mode = "poll"
+            self._signature = self._stat()
+            self._handle = loop.call_later(self.interval, self._poll)
+        logger.debug("Watching %s (%s)", self.path, self.mode)
+        return self
+
+    def _start_inotify(self):
+        libc = _inotify()
+        if libc is None:
+            return False
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            return False
+        directory = os.path.dirname(self.path)
+        mask = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+        if libc.inotify_add_watch(fd, os.fsencode(directory), mask) < 0:
+            os.close(fd)
+            return False
+        try:
+            self.loop.add_reader(fd, self._read_events)
+        except (NotImplementedError, RuntimeError):  # Event loops without file descriptor readers
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+
+    def _read_events(self):
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        name = os.fsencode(os.path.basename(self.path))
+        offset = 0
+        while offset + _EVENT_HEADER <= len(data):
+            length = int.from_bytes(data[offset + 12:offset + 16], sys.byteorder)
+            event_name = data[offset + _EVENT_HEADER:offset + _EVENT_HEADER + length].rstrip(b"\0")
+            offset += _EVENT_HEADER + length
+            if event_name == name:
+                self._schedule()
+
+    def _schedule(self):
+        if self._handle is not None:
+            self._handle.cancel()
+        self._handle = self.loop.call_later(SETTLE_DELAY, self._report)
+
+    def _report(self):
+        self._handle = None
+        self.callback()
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    def check(self):
+        """Poll once: call the callback and return True if the file changed since the last check."""
+        signature = self._stat()
+        if signature == self._signature:
+            return False
+        self._signature = signature
+        self.callback()
+        return True
+
+    def _poll(self):
+        self.check()
+        self._handle = self.loop.call_later(self.interval, self._poll)
+
+    def stop(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if self._fd is not None:
+            self.loop.remove_reader(self._fd)
+            os.close(self._fd)
+            self._fd = None
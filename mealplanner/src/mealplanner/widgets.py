@@ -0,0 +1,253 @@
+import toga
+from toga.style import Pack
+from toga.style.pack import CENTER, END, RIGHT, LEFT
+from toga.constants import COLUMN, ROW
+
+from .plan import DAYS
+
+NO_DINNER = "No dinner planned"
+# Bulk edit operation -> what its two inputs mean
+BULK_OPERATIONS = {
+    "Copy week": "week to copy, weeks to copy it to",
+    "Repeat weeks": "weeks to repeat, optionally the last week to fill",
+    "Shift weeks": "number of weeks to move every meal by",
+    "Clear weeks": "weeks to clear",
+}
+
+
+class DayRow(toga.Box):
+    """One row of the week grid: the day name, its meal and an Edit button.
+
+    The row keeps direct references to its widgets, and its Edit button
+    calls ``on_edit(widget, day)``, so the handler can read the week being
+    shown when the button is pressed and nothing needs rewiring when the
+    week changes.
+    """
+
+    def __init__(self, day, on_edit, meal=NO_DINNER):
+        super().__init__(style=Pack(direction=ROW, align_items=CENTER, margin=10))
+        self.day = day
+        self.meal = meal
+        self.on_edit = on_edit
+        self.day_label = toga.Label(f"{day}:", style=Pack(width=100, text_align=RIGHT))
+        self.meal_label = toga.Label(meal, id=f"{day.lower()}-dinner", style=Pack(width=200, text_align=LEFT))
+        self.edit_button = toga.Button("Edit", on_press=self.handle_edit, style=Pack(width=80))
+        self.add(self.day_label)
+        self.add(self.meal_label)
+        self.add(self.edit_button)
+
+    def handle_edit(self, widget):
+        self.on_edit(widget, self.day)
+
+    def show_meal(self, meal):
+        # Setting the same text still makes the backend relayout the label, and
+        # reading it back is a native call, so compare with the last shown meal
+        if meal != self.meal:
+            self.meal = meal
+            self.meal_label.text = meal
+
+
+class PooledDialog:
+    """A dialog window that is built on first use and then hidden and reshown.
+
+    Creating and laying out a native window is slow, so OK, Cancel and the
+    window's close button only hide it, ready for the next ``show``.
+    """
+
+    title = ""
+    resizable = False
+
+    def __init__(self):
+        self.window = None
+
+    def build(self):
+        """Return the content box for the window; called once, on first show."""
+        raise NotImplementedError
+
+    def open(self, title=None):
+        if self.window is None:
+            self.window = toga.Window(title=title or self.title, resizable=self.resizable, on_close=self.handle_close)
+            self.window.content = self.build()
+        elif title is not None and self.window.title != title:
+            self.window.title = title
+        self.window.show()
+
+    def hide(self):
+        if self.window is not None:
+            self.window.hide()
+
+    def handle_close(self, window, **kwargs):
+        self.hide()
+        return False  # Keep the window for the next show
+
+
+class EditDinnerDialog(PooledDialog):
+    """Dialog for changing the meal of one day; remembers which week and day it is editing."""
+
+    resizable = True
+
+    def __init__(self, on_ok, on_cancel):
+        super().__init__()
+        self.on_ok = on_ok
+        self.on_cancel = on_cancel
+        self.text_input = None
+        self.week = None
+        self.day = None
+
+    def build(self):
+        self.text_input = toga.TextInput()
+        content = toga.Box(style=Pack(direction=COLUMN, margin=10))
+        content.add(toga.Label("Enter the new dinner:", style=Pack(margin_bottom=5)))
+        content.add(self.text_input)
+
+        ok_button = toga.Button("OK", on_press=self.on_ok, style=Pack(width=60, margin=5))
+        cancel_button = toga.Button("Cancel", on_press=self.on_cancel, style=Pack(width=60, margin=5))
+        button_box = toga.Box(style=Pack(direction=ROW, justify_content=END, margin_top=20))
+        button_box.add(ok_button)
+        button_box.add(cancel_button)
+        content.add(button_box)
+        return content
+
+    def show(self, week, day, meal):
+        self.week = week
+        self.day = day
+        self.open(f"Edit Dinner for Week {week}, {day}")
+        self.text_input.value = meal
+        self.text_input.focus()
+
+
+class SetWeeksDialog(PooledDialog):
+    """Dialog asking for the number of weeks in the plan."""
+
+    title = "Set Number of Weeks"
+
+    def __init__(self, on_ok):
+        super().__init__()
+        self.on_ok = on_ok
+        self.weeks_input = None
+
+    def build(self):
+        self.weeks_input = toga.TextInput(style=Pack(margin=10))
+        ok_button = toga.Button("OK", on_press=self.on_ok, style=Pack(margin=10))
+        cancel_button = toga.Button("Cancel", on_press=lambda btn: self.hide(), style=Pack(margin=10))
+
+        button_box = toga.Box(style=Pack(direction=ROW, align_items=CENTER, margin=10))
+        button_box.add(ok_button)
+        button_box.add(cancel_button)
+
+        content_box = toga.Box(style=Pack(direction=COLUMN, margin=10))
+        content_box.add(toga.Label("Enter the desired number of weeks:", style=Pack(margin_bottom=5)))
+        content_box.add(self.weeks_input)
+        content_box.add(button_box)
+        return content_box
+
+    def show(self):
+        self.open()
+        self.weeks_input.value = ""
+        self.weeks_input.focus()
+
+
+class BulkEditDialog(PooledDialog):
+    """Dialog for changing whole ranges of weeks at once (see BULK_OPERATIONS)."""
+
+    title = "Bulk Edit Weeks"
+
+    def __init__(self, on_ok):
+        super().__init__()
+        self.on_ok = on_ok
+        self.operation_selection = None
+        self.hint_label = None
+        self.weeks_input = None
+        self.target_input = None
+
+    def build(self):
+        self.hint_label = toga.Label("", style=Pack(margin=10))
+        self.operation_selection = toga.Selection(items=list(BULK_OPERATIONS), on_change=self.show_hint,
+                                                  style=Pack(margin=10))
+        self.weeks_input = toga.TextInput(placeholder="Weeks, e.g. 1 or 1-4", style=Pack(margin=10))
+        self.target_input = toga.TextInput(placeholder="To weeks, e.g. 5-12", style=Pack(margin=10))
+        ok_button = toga.Button("OK", on_press=self.on_ok, style=Pack(margin=10))
+        cancel_button = toga.Button("Cancel", on_press=lambda btn: self.hide(), style=Pack(margin=10))
+
+        button_box = toga.Box(style=Pack(direction=ROW, align_items=CENTER, margin=10))
+        button_box.add(ok_button)
+        button_box.add(cancel_button)
+
+        content_box = toga.Box(style=Pack(direction=COLUMN, margin=10))
+        content_box.add(self.operation_selection)
+        content_box.add(self.hint_label)
+        content_box.add(self.weeks_input)
+        content_box.add(self.target_input)
+        content_box.add(button_box)
+        return content_box
+
+    def show_hint(self, widget):
+        self.hint_label.text = f"Enter the {BULK_OPERATIONS.get(widget.value, '')}."
+
+    def show(self):
+        self.open()
+        self.show_hint(self.operation_selection)
+        self.weeks_input.value = ""
+        self.target_input.value = ""
+        self.weeks_input.focus()
+
+
+class MonthDialog(PooledDialog):
+    """A month of the plan as a grid of day buttons; pressing one calls ``on_select(week)``.
+
+    The grid is built once with room for six weeks; ``show`` only changes
+    the button texts, so paging between months doesn't relayout the window.
+    """
+
+    title = "Calendar"
+    resizable = True
+    ROWS = 6 # Most weeks a month can touch
+
+    def __init__(self, on_select, on_previous, on_next):
+        super().__init__()
+        self.on_select = on_select
+        self.on_previous = on_previous
+        self.on_next = on_next
+        self.month_label = None
+        self.cells = [] # Rows of day buttons
+        self.cell_weeks = {} # Button id -> week shown in that cell, or None
+
+    def build(self):
+        nav_box = toga.Box(style=Pack(direction=ROW, align_items=CENTER, margin_bottom=10))
+        self.month_label = toga.Label("", style=Pack(flex=1, text_align=CENTER, font_weight='bold'))
+        nav_box.add(toga.Button("<", on_press=self.on_previous, style=Pack(width=40)))
+        nav_box.add(self.month_label)
+        nav_box.add(toga.Button(">", on_press=self.on_next, style=Pack(width=40)))
+
+        content = toga.Box(style=Pack(direction=COLUMN, margin=10))
+        content.add(nav_box)
+        header = toga.Box(style=Pack(direction=ROW))
+        for day in DAYS:
+            header.add(toga.Label(day[:3], style=Pack(flex=1, text_align=CENTER)))
+        content.add(header)
+        for _ in range(self.ROWS):
+            row_box = toga.Box(style=Pack(direction=ROW))
+            row = [toga.Button("", on_press=self.handle_select, style=Pack(flex=1, width=110)) for _ in DAYS]
+            for button in row:
+                row_box.add(button)
+            self.cells.append(row)
+            content.add(row_box)
+        return content
+
+    def handle_select(self, widget):
+        week = self.cell_weeks.get(widget.id)
+        if week is not None:
+            self.on_select(week)
+
+    def show(self, title, rows):
+        """Show ``rows`` of ``(text, week)`` cells under ``title``; cells with no week are disabled."""
+        self.open()
+        self.month_label.text = title
+        self.cell_weeks = {}
+        for index, buttons in enumerate(self.cells):
+            row = rows[index] if index < len(rows) else [("", None)] * len(DAYS)
+            for button, (text, week) in zip(buttons, row):
+                if button.text != text:
+                    button.text = text
+                button.enabled = week is not None
+                self.cell_weeks[button.id] = week
@@ -0,0 +1,114 @@
+import queue
+import threading
+import time
+
+# Seconds to wait after the first queued change before writing, so bursts of
+# edits are coalesced into one write.
+DEBOUNCE = 0.5
+
+_SAVE = "save"
+_EDIT = "edit"
+_FLUSH = "flush"
+_STOP = "stop"
+
+
+class _Pending:
+    def __init__(self):
+        self.document = None
+        self.records = []
+        self.default_week = None
+
+
+class BackgroundWriter:
+    """Persists meal plans on a worker thread, fed by a queue.
+
+    ``save`` queues a full snapshot and ``append_edit`` queues one journal
+    record. Everything queued within ``debounce`` seconds of the first
+    pending change is coalesced: only the newest snapshot is written, and the
+    edits made after it are appended to the journal in one write. ``flush``
+    blocks until everything queued so far is on disk; ``close`` flushes and
+    stops the thread.
+    """
+
+    def __init__(self, debounce=DEBOUNCE, on_error=None):
+        self.debounce = debounce
+        self.on_error = on_error
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="mealplanner-writer", daemon=True)
+        self._thread.start()
+
+    def save(self, store, document):
+        """Queue ``document`` to replace the data file of ``store``.
+
+        The document must not be mutated after it is queued; pass a copy of
+        live plans.
+        """
+        self._queue.put((_SAVE, store, document))
+
+    def append_edit(self, store, week, day, meal, default_week):
+        """Queue one meal edit for the journal of ``store``."""
+        self._queue.put((_EDIT, store, (week, day, meal), default_week))
+
+    def flush(self):
+        """Block until every queued change has been written."""
+        if self._thread.is_alive():
+            done = threading.Event()
+            self._queue.put((_FLUSH, done))
+            done.wait()
+
+    def close(self):
+        """Write everything queued and stop the worker thread."""
+        if self._thread.is_alive():
+            done = threading.Event()
+            self._queue.put((_STOP, done))
+            done.wait()
+            self._thread.join()
+
+    @property
+    def running(self):
+        return self._thread.is_alive()
+
+    def _run(self):
+        pending = {}
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0, deadline - time.monotonic())
+            try:
+                job = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._write(pending)
+                pending, deadline = {}, None
+                continue
+
+            kind = job[0]
+            if kind in (_FLUSH, _STOP):
+                self._write(pending)
+                pending, deadline = {}, None
+                job[1].set()
+                if kind == _STOP:
+                    return
+                continue
+
+            entry = pending.setdefault(job[1], _Pending())
+            if kind == _SAVE:
+                # The snapshot already contains every edit queued before it
+                entry.document = job[2]
+                entry.records = []
+            else:
+                entry.records.append(job[2])
+                entry.default_week = job[3]
+            if deadline is None:
+                deadline = time.monotonic() + self.debounce
+
+    def _write(self, pending):
+        for store, entry in pending.items():
+            try:
+                if entry.document is not None:
+                    store.save(entry.document)
+                if entry.records:
+                    store.append_edits(entry.records, entry.default_week)
+                    if store.needs_compaction():
+                        store.compact(entry.default_week)
+            except Exception as e:
+                if self.on_error is not None:
+                    self.on_error(store, e)
@@ -1,7 +1,38 @@
+from src.mealplanner import app as app_module
 from src.mealplanner.app import MealPlanner
 import pytest
+import sys
 
 
 @pytest.fixture
-def app():
-    return MealPlanner()
+def make_app(tmp_path, monkeypatch):
+    """Return a function that builds and starts a MealPlanner on ``tmp_path / "meal_plans.json"``.
+
+    Keyword arguments override the app module's settings (STORAGE_BACKEND,
+    STARTUP_MODE, HEADLESS, ...). They are patched before the app is built
+    because some toga backends (toga-dummy) run startup() from the
+    constructor; startup() is called again for those that don't, and does
+    nothing the second time. Write the plan file first to start from it.
+    Apps are shut down after the test, stopping their writer and watcher.
+    """
+    apps = []
+    monkeypatch.setattr(sys, "stdout", sys.stdout)  # Restored after the test; GUI apps redirect them
+    monkeypatch.setattr(sys, "stderr", sys.stderr)
+
+    def make(**settings):
+        settings = {"DATA_FILE": str(tmp_path / "meal_plans.json"), "HEADLESS": True, **settings}
+        for name, value in settings.items():
+            monkeypatch.setattr(app_module, name, value)
+        app = MealPlanner()
+        apps.append(app)
+        app.startup()
+        return app
+
+    yield make
+    for app in apps:
+        app.shutdown()
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
@@ -0,0 +1,66 @@
+import datetime
+import random
+
+from src.mealplanner.analytics import MealFrequency, MealStats
+from src.mealplanner.engine import PlanEngine
+from src.mealplanner.plan import DAYS
+
+START = datetime.date(2025, 1, 6)  # A Monday
+
+
+def test_counts_and_last_served():
+    stats = MealStats.build({1: {"Monday": "Soup", "Friday": "Curry"}, 2: {"Monday": "Soup", "Sunday": "Soup"}})
+    assert stats.counts == {"Soup": 3, "Curry": 1}
+    today = datetime.date(2025, 1, 14)  # Tuesday of week 2
+    assert stats.report(START, today) == [
+        MealFrequency("Soup", 3, datetime.date(2025, 1, 13), 1),
+        MealFrequency("Curry", 1, datetime.date(2025, 1, 10), 4),
+    ]
+    # Nothing served before the plan starts, and no dates without a start date
+    assert stats.report(START, datetime.date(2025, 1, 1))[0] == MealFrequency("Soup", 3, None, None)
+    assert stats.report(None, today)[1] == MealFrequency("Curry", 1, None, None)
+
+    stats.update(1, "Friday", "Soup")
+    stats.update(2, "Monday", None)
+    assert stats.counts == {"Soup": 3}
+    assert stats.report(START, today)[0].last_served == datetime.date(2025, 1, 10)
+
+
+def test_incremental_updates_match_a_rebuild():
+    rng = random.Random(18)
+    plans = {week: {day: f"Meal {rng.randrange(6)}" for day in DAYS} for week in range(1, 21)}
+    stats = MealStats.build(plans)
+    for _ in range(500):
+        week, day = rng.randrange(1, 21), rng.choice(DAYS)
+        meal = rng.choice(["", f"Meal {rng.randrange(8)}"])
+        plans[week][day] = meal
+        stats.update(week, day, meal)
+    rebuilt = MealStats.build(plans)
+    assert stats.counts == rebuilt.counts
+    assert stats.postings == rebuilt.postings
+    assert stats.report(START, datetime.date(2025, 3, 1)) == rebuilt.report(START, datetime.date(2025, 3, 1))
+
+
+def test_engine_stats_follow_edits_and_plan_length(tmp_path):
+    engine = PlanEngine(str(tmp_path / "meal_plans.json")).load()
+    engine.plan_start_date = START
+    assert engine.meal_stats.counts["Pasta"] == 4
+    engine.set_meal(2, "Tuesday", "Pasta")
+    engine.set_num_weeks(6)
+    assert engine.meal_stats.counts["Pasta"] == 7
+    engine.set_num_weeks(1)
+    assert engine.meal_stats.counts["Pasta"] == 1
+    report = engine.meal_report(today=datetime.date(2025, 1, 20))
+    assert report[0] == MealFrequency("Chicken and Veggies", 1, datetime.date(2025, 1, 9), 11)
+
+
+def test_meal_stats_button_logs_report(app, tmp_path, caplog):
+    app.DATA_FILE = str(tmp_path / "meal_plans.json")
+    app.startup()
+    app.edit_dinner(None, "Monday", 2)
+    app.edit_dialog.text_input.value = "Tacos"
+    app.handle_edit_ok(None)
+    app.show_meal_stats(None)
+    assert "Most planned meals (7 meals in 4 weeks):" in caplog.text
+    assert "  Tacos: 5 days" in caplog.text
+    app.main_window.close()
@@ -2,12 +2,13 @@ from src.mealplanner.app import MealPlanner
 import json
 from datetime import date, timedelta
 import toga
+from src.mealplanner.plan import DAYS
 
-def test_initial_state():
-    app = MealPlanner()
-    assert app.weekly_plans == {}
+def test_initial_state(make_app):
+    app = make_app()
+    assert app.weekly_plans == app.get_default_weekly_meals()
     assert app.current_week == 1
-    assert app.day_labels == {}
+    assert set(app.day_labels) == set(DAYS)
     assert app.plan_start_date is None
     assert app.num_weeks == 4
 
@@ -56,7 +57,6 @@ def test_load_settings_invalid_json(app, tmp_path):
     test_file = tmp_path / "meal_plans.json"
     with open(test_file, "w") as f:
         f.write("This is not valid JSON")
-    app = MealPlanner()
     app.DATA_FILE = str(test_file)
     app.load_settings()
     assert app.num_weeks == 4
@@ -129,11 +129,11 @@ def test_set_number_of_weeks_dialog(app, tmp_path):
 
     # Simulate showing the dialog
     app.show_set_weeks_dialog(None)  # Pass None as widget, as it's not used.
-    assert app.set_weeks_window is not None
-    assert app.weeks_input_widget is not None
+    assert app.set_weeks_dialog.window is not None
+    assert app.set_weeks_dialog.weeks_input is not None
 
     # Simulate entering a value and pressing OK
-    app.weeks_input_widget.value = "8"
+    app.set_weeks_dialog.weeks_input.value = "8"
     app.handle_set_weeks_ok(None) # Pass None
 
     # Check that num_weeks was updated
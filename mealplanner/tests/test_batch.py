@@ -0,0 +1,99 @@
+import io
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from src.mealplanner import batch
+from src.mealplanner.store import PlanStore
+
+
+def write_json(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data))
+    return str(path)
+
+
+def make_plans(root):
+    write_json(root / "good" / "meal_plans.json", {
+        "weeks": {str(week): {"Monday": f"Meal {week}"} for week in range(1, 5)},
+        "start_date": "2025-01-06", "num_weeks": 4})
+    write_json(root / "keys" / "meal_plans.json", {
+        "weeks": {"1": {"Monday": "Soup"}, "week 2": {"Tuesday": "Stew"}, "bogus": {"Friday": "Fish"}},
+        "start_date": "2025-01-06", "num_weeks": 3})
+    (root / "broken").mkdir()
+    (root / "broken" / "meal_plans.json").write_text("{not json")
+
+
+def test_fix_week_key():
+    assert [batch.fix_week_key(key) for key in ("3", " 4 ", "5.0", "week 6", "Week_7")] == [3, 4, 5, 6, 7]
+    assert [batch.fix_week_key(key) for key in ("bogus", "0", "2.5", "")] == [None] * 4
+
+
+def test_validate(tmp_path):
+    make_plans(tmp_path)
+    out = io.StringIO()
+    counts = batch.run("validate", str(tmp_path), workers=1, out=out)
+    assert counts[batch.OK] == 1 and counts[batch.INVALID] == 2
+    lines = out.getvalue().splitlines()
+    assert any(line.startswith("INVALID") and "'week 2'" in line for line in lines)
+    assert "3 files in" in lines[-1] and "files/s" in lines[-1]
+
+
+def test_files_that_are_not_plans_are_never_rewritten(tmp_path):
+    recipes = write_json(tmp_path / "home" / "recipes.json", {"Soup": [["leek", 2]]})
+    other = write_json(tmp_path / "home" / "settings.json", {"theme": "dark"})
+    assert batch.find_plan_files(str(tmp_path)) == [other]
+    out = io.StringIO()
+    counts = batch.run("normalise", str(tmp_path), workers=1, out=out)
+    assert counts[batch.INVALID] == 1 and "not a meal plan" in out.getvalue()
+    assert json.loads(Path(other).read_text()) == {"theme": "dark"}
+    assert json.loads(Path(recipes).read_text()) == {"Soup": [["leek", 2]]}
+    assert batch.validate_document({"theme": "dark"})[0] == ["not a meal plan: none of weeks, num_weeks, start_date"]
+    assert batch.validate_document({"weeks": {}})[0] == []
+
+
+def test_broken_file_has_one_status_for_every_action(tmp_path):
+    (tmp_path / "meal_plans.json").write_text("{not json")
+    details = set()
+    for action in ("validate", "normalise", "export"):
+        path, status, detail = batch.process_file((action, str(tmp_path / "meal_plans.json"), str(tmp_path),
+                                                   str(tmp_path / "out"), "json"))
+        assert status == batch.INVALID
+        details.add(detail)
+    assert len(details) == 1 and details.pop().startswith("not valid JSON")
+    assert (tmp_path / "meal_plans.json").read_text() == "{not json"
+
+
+def test_normalise_fixes_keys_and_fills_weeks(tmp_path):
+    make_plans(tmp_path)
+    counts = batch.run("normalise", str(tmp_path), workers=1, out=io.StringIO())
+    assert (counts[batch.OK], counts[batch.FIXED], counts[batch.INVALID]) == (1, 1, 1)
+
+    store = PlanStore(str(tmp_path / "keys" / "meal_plans.json")).load()
+    assert store.invalid_week_keys == []
+    assert sorted(store.weeks) == [1, 2, 3]
+    assert store.weeks[2] == {"Tuesday": "Stew"}
+    assert store.weeks[3]["Sunday"] == "Roast Dinner"
+    # Normalised files are left alone the second time
+    assert batch.run("normalise", str(tmp_path / "keys"), workers=1, out=io.StringIO())[batch.OK] == 1
+
+
+def test_export_in_worker_processes(tmp_path):
+    make_plans(tmp_path / "in")
+    out = io.StringIO()
+    counts = batch.run("export", str(tmp_path / "in"), str(tmp_path / "out"), "sqlite", workers=2, out=out, quiet=True)
+    assert counts[batch.INVALID] == 1 and counts[batch.OK] + counts[batch.FIXED] == 2
+    assert out.getvalue().startswith("INVALID")  # quiet: only problems and the summary
+    assert (tmp_path / "out" / "good" / "meal_plans.sqlite3").exists()
+    assert (tmp_path / "out" / "keys" / "meal_plans.sqlite3").exists()
+
+
+def test_batch_command(tmp_path):
+    make_plans(tmp_path)
+    env = dict(os.environ, PYTHONPATH=str(Path(__file__).resolve().parent.parent / "src"))
+    result = subprocess.run([sys.executable, "-m", "mealplanner", "batch", "validate", str(tmp_path), "--workers", "1"],
+                            env=env, capture_output=True, text=True)
+    assert result.returncode == 1
+    assert "1 ok, 2 invalid" in result.stdout
@@ -0,0 +1,95 @@
+import datetime
+import json
+
+import pytest
+
+from src.mealplanner.app import parse_week_range
+from src.mealplanner.engine import PlanEngine
+from src.mealplanner.plan import DAYS
+from src.mealplanner.widgets import NO_DINNER
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = PlanEngine(str(tmp_path / "meal_plans.json")).load()
+    engine.set_num_weeks(12)
+    for week in range(1, 5):
+        engine.weekly_plans[week] = {day: f"Meal {week}{index}" for index, day in enumerate(DAYS)}
+    engine.save_meals()
+    return engine
+
+
+def saved_weeks(engine):
+    with open(engine.data_file) as f:
+        return json.load(f)["weeks"]
+
+
+def test_copy_and_clear(engine):
+    engine.meal_index  # Built before the change, so it must follow it
+    saves = []
+    engine.persist_plans = lambda original=engine.persist_plans: saves.append(1) or original()
+    assert engine.copy_week(2, 5, 8) == [5, 6, 7, 8]
+    assert all(engine.meal(week, "Monday") == "Meal 20" for week in range(5, 9))
+    assert engine.clear_weeks(3, 4) == [3, 4]
+    assert engine.meal(3, "Monday") is None
+    assert saves == [1, 1]
+    assert len(engine.search_meals("Meal 20")) == 5
+    assert saved_weeks(engine)["7"]["Sunday"] == "Meal 26" and saved_weeks(engine)["4"] == {}
+    with pytest.raises(ValueError):
+        engine.copy_week(1, 10, 13)
+
+
+def test_repeat_rotation(engine):
+    assert engine.repeat_weeks(1, 4) == list(range(5, 13))
+    assert [engine.meal(week, "Friday") for week in range(1, 13)] == [f"Meal {week % 4 or 4}4" for week in range(1, 13)]
+    engine.clear_weeks(5, 12)
+    assert engine.repeat_weeks(1, 4, through=6) == [5, 6]
+    assert engine.meal(7, "Friday") is None
+
+
+def test_shift_and_start_date(engine):
+    engine.plan_start_date = datetime.date(2025, 1, 6)
+    engine.shift_weeks(2)
+    assert engine.meal(3, "Monday") == "Meal 10" and engine.meal(1, "Monday") == "Pasta"
+    engine.shift_weeks(-2)
+    assert engine.meal(1, "Monday") == "Meal 10" and engine.meal(12, "Monday") == "Pasta"
+
+    engine.set_start_date(datetime.date(2024, 12, 23))  # Two weeks earlier: meals keep their dates
+    assert engine.meal(3, "Monday") == "Meal 10"
+    assert PlanEngine(engine.data_file).load().plan_start_date == datetime.date(2024, 12, 23)
+    engine.set_start_date(datetime.date(2025, 3, 3), keep_dates=False)
+    assert engine.meal(3, "Monday") == "Meal 10"
+
+
+def test_parse_week_range():
+    assert parse_week_range("3") == (3, 3)
+    assert parse_week_range(" 2 - 5 ") == (2, 5)
+    with pytest.raises(ValueError):
+        parse_week_range("two")
+
+
+def test_bulk_edit_dialog_redraws_once(app, tmp_path, caplog):
+    app.DATA_FILE = str(tmp_path / "meal_plans.json")
+    app.startup()
+    app.edit_dinner(None, "Monday", 1)
+    app.edit_dialog.text_input.value = "Tacos"
+    app.handle_edit_ok(None)
+    app.show_bulk_edit_dialog(None)
+    dialog = app.bulk_edit_dialog
+    dialog.operation_selection.value = "Copy week"
+    assert dialog.hint_label.text == "Enter the week to copy, weeks to copy it to."
+    dialog.weeks_input.value = "1"
+    dialog.target_input.value = "2-4"
+    app.handle_bulk_edit_ok(None)
+    assert "Copy week: changed 3 week(s)." in caplog.text
+    assert app.weekly_plans[4]["Monday"] == "Tacos"
+
+    app.current_week = 2
+    app.bulk_edit("Clear weeks", "2")
+    assert app.day_labels["Monday"].text == NO_DINNER
+    app.show_bulk_edit_dialog(None)
+    dialog.operation_selection.value = "Clear weeks"
+    dialog.weeks_input.value = "3-9"
+    app.handle_bulk_edit_ok(None)
+    assert "Clear weeks: Weeks 3 to 9 are not within the plan's 4 weeks" in caplog.text
+    app.main_window.close()
@@ -0,0 +1,97 @@
+from src.mealplanner.console import GUIConsole
+import threading
+
+
+class FakeLabel:
+    def __init__(self):
+        self._text = ""
+        self.repaints = 0
+
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, value):
+        self._text = value
+        self.repaints += 1
+
+
+class FakeLoop:
+    def __init__(self):
+        self.later = []
+        self.threadsafe = []
+
+    def is_closed(self):
+        return False
+
+    def call_later(self, delay, callback):
+        self.later.append(callback)
+
+    def call_soon_threadsafe(self, callback, *args):
+        self.threadsafe.append((callback, args))
+
+    def run_pending(self):
+        for callback, args in self.threadsafe:
+            callback(*args)
+        self.threadsafe = []
+        later, self.later = self.later, []
+        for callback in later:
+            callback()
+
+
+def test_console_keeps_last_lines():
+    label = FakeLabel()
+    console = GUIConsole(label, max_lines=3, interval=0)
+    for n in range(10):
+        console.write(f"message {n}")
+    lines = label.text.splitlines()
+    assert len(lines) == 3
+    assert lines[0].endswith("Info: message 7")
+    assert lines[-1].endswith("Info: message 9")
+
+
+def test_print_writes_one_line():
+    label = FakeLabel()
+    console = GUIConsole(label, is_stderr=True, interval=0)
+    print("Saved", file=console)
+    assert label.text.count("\n") == 1
+    assert label.text.endswith("Error: Saved\n")
+
+
+def test_writes_are_batched_per_interval():
+    label = FakeLabel()
+    loop = FakeLoop()
+    console = GUIConsole(label, interval=60, loop=loop)
+    console.write("first")
+    assert label.repaints == 1
+    for n in range(100):
+        console.write(f"burst {n}")
+    assert label.repaints == 1
+    assert len(loop.later) == 1
+
+    loop.run_pending()
+    assert label.repaints == 2
+    assert label.text.splitlines()[-1].endswith("burst 99")
+
+
+def test_write_from_other_thread_is_scheduled():
+    label = FakeLabel()
+    loop = FakeLoop()
+    console = GUIConsole(label, loop=loop)
+    worker = threading.Thread(target=console.write, args=("from worker",))
+    worker.start()
+    worker.join()
+    assert label.repaints == 0
+    loop.run_pending()
+    assert "from worker" in label.text
+
+
+def test_clear_empties_buffer():
+    label = FakeLabel()
+    console = GUIConsole(label, interval=0)
+    console.write("message")
+    console.clear()
+    assert label.text == ""
+    console.write("after")
+    assert "message" not in label.text
@@ -1,4 +1,5 @@
 import json
+from collections.abc import Mapping
 
 def test_load_settings_from_file(app, tmp_path):
     # Create a temporary data file with a specific num_weeks
@@ -13,16 +14,17 @@ def test_load_settings_from_file(app, tmp_path):
 
     assert app.num_weeks == 6
 
-def test_load_settings_default_no_file(app):
-    app.DATA_FILE = "non_existent_file.json"
+def test_load_settings_default_no_file(app, tmp_path):
+    app.DATA_FILE = str(tmp_path / "non_existent_file.json")
     app.load_settings()
     assert app.num_weeks == 4
 
 def test_get_default_weekly_meals_structure(app):
     meals = app.get_default_weekly_meals()
-    assert isinstance(meals, dict)
+    assert isinstance(meals, Mapping)
     assert 1 in meals
     assert "Monday" in meals[1]
+    assert len(meals) == app.num_weeks
 
 def test_load_meals_missing_file(app,tmp_path):
     app.DATA_FILE = str(tmp_path / "non_existent.json")
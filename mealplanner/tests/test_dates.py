@@ -0,0 +1,81 @@
+import datetime
+
+from src.mealplanner.dates import CalendarCell, DateIndex
+from src.mealplanner.engine import PlanEngine
+
+START = datetime.date(2025, 1, 6)  # A Monday
+
+
+def test_date_lookups():
+    index = DateIndex(START, 10)
+    assert index.end_date == datetime.date(2025, 3, 16)
+    assert index.week_label(3) == "2025-01-20"
+    assert index.date(2, "Wednesday") == datetime.date(2025, 1, 15)
+    assert index.date(11, "Monday") is None
+    assert index.locate(datetime.date(2025, 1, 15)) == (2, "Wednesday")
+    assert index.locate(datetime.date(2025, 1, 5)) is None
+    assert index.locate(datetime.date(2025, 3, 17)) is None
+
+
+def test_month_rows_cover_whole_weeks():
+    rows = DateIndex(START, 10).month(2025, 1)
+    assert len(rows) == 5 and all(len(row) == 7 for row in rows)
+    assert rows[0][0] == CalendarCell(datetime.date(2024, 12, 30), None, None)
+    assert rows[1][0] == CalendarCell(START, 1, "Monday")
+    assert rows[-1][-1] == CalendarCell(datetime.date(2025, 2, 2), 4, "Sunday")
+    assert len(DateIndex(START, 1).month(2025, 3)) == 6  # March 2025 starts on a Saturday
+
+
+def test_plans_running_past_the_last_date():
+    index = DateIndex(START, 10 ** 9)  # Nothing is built per day
+    assert index.locate(datetime.date(9999, 12, 31)) == (416115, "Friday")
+    assert index.week_label(416115) == "9999-12-27" and index.week_label(416116) is None
+    assert index.date(10 ** 9, "Sunday") is None and index.end_date == datetime.date.max
+    rows = index.month(9999, 12)
+    assert rows[-1][-1] == CalendarCell(datetime.date.max, 416115, "Friday") and len(rows[-1]) == 5
+
+
+def test_engine_rebuilds_index_when_plan_changes(tmp_path):
+    engine = PlanEngine(str(tmp_path / "meal_plans.json")).load()
+    engine.plan_start_date = START
+    index = engine.date_index
+    assert engine.week_display_date(2) == "2025-01-13" and engine.date_index is index
+    assert engine.locate_date(datetime.date(2025, 2, 3)) is None
+    engine.set_num_weeks(5)
+    assert engine.date_index is not index
+    assert engine.locate_date(datetime.date(2025, 2, 3)) == (5, "Monday")
+    engine.plan_start_date = datetime.date(2025, 1, 13)
+    assert engine.week_display_date(1) == "2025-01-13"
+    assert engine.week_display_date(9) == "2025-03-10"  # Past the plan: computed, not indexed
+    assert engine.week_display_date(10 ** 6) == "Not Set" and engine.week_start_date(10 ** 6) is None
+
+    engine.set_meal(1, "Monday", "Soup")
+    cells = [pair for row in engine.month_calendar(2025, 1) for pair in row]
+    assert (CalendarCell(datetime.date(2025, 1, 13), 1, "Monday"), "Soup") in cells
+    assert (CalendarCell(datetime.date(2025, 1, 12), None, None), None) in cells
+    engine.plan_start_date = None
+    assert engine.month_calendar(2025, 1) == [] and engine.locate_date(START) is None
+
+
+def test_go_to_date_and_calendar(app, tmp_path, caplog):
+    app.DATA_FILE = str(tmp_path / "meal_plans.json")
+    app.startup()
+    app.plan_start_date = START
+    app.date_input.value = "2025-01-22"
+    app.go_to_date(None)
+    assert app.current_week == 3 and app.week_label.text == "Week 3: 2025-01-20"
+    assert "2025-01-22 is Wednesday of week 3: Pizza" in caplog.text
+    app.date_input.value = "2026-01-01"
+    app.go_to_date(None)
+    assert "2026-01-01 is not in the plan." in caplog.text and app.current_week == 3
+
+    app.show_calendar(None)
+    dialog = app.month_dialog
+    assert dialog.month_label.text == "January 2025"
+    assert dialog.cells[1][0].text == "6 Pasta" and not dialog.cells[0][0].enabled
+    app.next_month(None)
+    assert dialog.month_label.text == "February 2025"
+    assert dialog.cells[0][6].text == "2 Roast Dinner" and not dialog.cells[1][0].enabled
+    dialog.handle_select(dialog.cells[0][6])
+    assert app.current_week == 4
+    app.main_window.close()
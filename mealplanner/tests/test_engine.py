@@ -0,0 +1,52 @@
+import datetime
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.mealplanner.engine import PlanEngine
+
+
+def test_engine_does_not_import_toga():
+    code = "import sys, src.mealplanner.engine; print('toga' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], cwd=Path(__file__).resolve().parent.parent,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
+
+
+def test_engine_load_edit_save(tmp_path):
+    data_file = str(tmp_path / "meal_plans.json")
+    engine = PlanEngine(data_file).load()
+    assert engine.num_weeks == 4
+    assert engine.meal(2, "Friday") == "Fish and Chips"
+
+    engine.plan_start_date = datetime.date(2025, 1, 6)
+    engine.set_meal(2, "Friday", "Curry")
+    engine.set_num_weeks(6)
+    engine.close()
+
+    with open(data_file) as f:
+        data = json.load(f)
+    assert data["num_weeks"] == 6
+    assert data["weeks"]["2"]["Friday"] == "Curry"
+
+    reloaded = PlanEngine(data_file).load()
+    assert reloaded.meal(2, "Friday") == "Curry"
+    assert reloaded.meal(6, "Monday") == "Pasta"
+    assert reloaded.week_display_date(3) == "2025-01-20"
+
+
+def test_engine_week_dates_without_start_date(tmp_path):
+    engine = PlanEngine(str(tmp_path / "meal_plans.json")).load()
+    assert engine.plan_start_date is None  # No data file yet
+    assert engine.week_start_date(1) is None
+    assert engine.week_display_date(1) == "Not Set"
+
+
+def test_set_num_weeks_rejects_non_positive(tmp_path):
+    engine = PlanEngine(str(tmp_path / "meal_plans.json")).load()
+    with pytest.raises(ValueError):
+        engine.set_num_weeks(0)
+    assert engine.num_weeks == 4
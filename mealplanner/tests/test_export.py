@@ -0,0 +1,100 @@
+import csv
+import datetime
+import io
+import json
+
+import pytest
+
+from src.mealplanner import batch
+from src.mealplanner.engine import PlanEngine
+from src.mealplanner.export import csv_chunks, ics_chunks, ics_line, plan_days, write_export
+
+START = datetime.date(2025, 1, 6)  # A Monday
+STAMP = datetime.datetime(2025, 1, 1, 12, 0, tzinfo=datetime.timezone.utc)
+
+
+def test_plan_days_skip_empty_days():
+    plans = {1: {"Monday": "Soup", "Tuesday": ""}, 3: {"Sunday": "Stew"}}
+    assert list(plan_days(plans, START, 3)) == [
+        (START, 1, "Monday", "Soup"),
+        (datetime.date(2025, 1, 26), 3, "Sunday", "Stew"),
+    ]
+
+
+def test_csv_rows_in_chunks():
+    days = [(START + datetime.timedelta(days=n), 1, "Monday", f'Meal, "{n}"') for n in range(5)]
+    chunks = list(csv_chunks(iter(days), chunk_rows=2))
+    assert len(chunks) == 3
+    rows = list(csv.reader(io.StringIO("".join(chunks))))
+    assert rows[0] == ["date", "week", "day", "meal"]
+    assert rows[5] == ["2025-01-10", "1", "Monday", 'Meal, "4"']
+
+
+def test_ics_events_are_escaped_and_folded():
+    text = "".join(ics_chunks(iter([(START, 1, "Monday", "Fish, chips; peas")]), stamp=STAMP, chunk_rows=1))
+    lines = text.split("\r\n")
+    assert lines[0] == "BEGIN:VCALENDAR" and lines[-2] == "END:VCALENDAR"
+    assert "SUMMARY:Fish\\, chips\\; peas" in lines
+    assert "DTSTART;VALUE=DATE:20250106" in lines and "DTEND;VALUE=DATE:20250107" in lines
+    assert "DTSTAMP:20250101T120000Z" in lines and "UID:20250106-dinner-plan@mealplanner" in lines
+
+    folded = ics_line("SUMMARY:" + "é" * 80)
+    parts = folded[:-2].split("\r\n ")
+    assert all(len(part.encode("utf-8")) <= 75 for part in parts)
+    assert "".join(parts) == "SUMMARY:" + "é" * 80
+
+
+def test_failed_export_leaves_no_file(tmp_path):
+    def broken_days():
+        yield START, 1, "Monday", "Soup"
+        raise RuntimeError("disk on fire")
+
+    path = tmp_path / "plan.csv"
+    with pytest.raises(RuntimeError):
+        write_export(str(path), broken_days())
+    assert list(tmp_path.iterdir()) == []
+    with pytest.raises(ValueError):
+        write_export(str(tmp_path / "plan.txt"), iter([]))
+
+
+def test_engine_export(tmp_path):
+    engine = PlanEngine(str(tmp_path / "meal_plans.json")).load()
+    engine.plan_start_date = START
+    engine.set_meal(2, "Friday", "Curry")
+    assert engine.export_plan(str(tmp_path / "plan.csv")) == 28
+    rows = list(csv.DictReader(io.StringIO((tmp_path / "plan.csv").read_text())))
+    assert rows[11] == {"date": "2025-01-17", "week": "2", "day": "Friday", "meal": "Curry"}
+    assert engine.export_plan(str(tmp_path / "plan.ics")) == 28
+    text = (tmp_path / "plan.ics").read_text()
+    assert text.count("BEGIN:VEVENT") == 28 and "UID:20250117-dinner-meal_plans@mealplanner" in text
+    engine.plan_start_date = None
+    with pytest.raises(ValueError):
+        engine.export_plan(str(tmp_path / "plan.ics"))
+
+
+def test_batch_export_to_calendars(tmp_path):
+    plan = tmp_path / "in" / "home" / "meal_plans.json"
+    plan.parent.mkdir(parents=True)
+    plan.write_text(json.dumps({"weeks": {"1": {"Monday": "Soup"}}, "start_date": "2025-01-06", "num_weeks": 2}))
+    undated = tmp_path / "in" / "undated" / "meal_plans.json"
+    undated.parent.mkdir()
+    undated.write_text(json.dumps({"weeks": {}}))
+    counts = batch.run("export", str(tmp_path / "in"), str(tmp_path / "out"), "ics", workers=1, out=io.StringIO())
+    assert counts[batch.FIXED] == 1 and counts[batch.ERROR] == 1  # Fixed: week 2 is filled in
+    text = (tmp_path / "out" / "home" / "meal_plans.ics").read_text()
+    assert text.count("BEGIN:VEVENT") == 8  # Week 1's Monday and week 2's default meals
+    assert "UID:20250106-dinner-home-meal_plans@mealplanner" in text
+
+
+def test_export_buttons(app, tmp_path, caplog):
+    app.DATA_FILE = str(tmp_path / "meal_plans.json")
+    app.startup()
+    app.plan_start_date = START
+    app.export_plan("ics")
+    assert f"Exported 28 meals to {tmp_path / 'meal_plans.ics'}" in caplog.text
+    app.export_plan("csv")
+    assert (tmp_path / "meal_plans.csv").read_bytes().startswith(b"date,week,day,meal\r\n")
+    app.plan_start_date = None
+    app.export_plan("csv")
+    assert "Error exporting to" in caplog.text
+    app.main_window.close()
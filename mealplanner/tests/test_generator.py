@@ -0,0 +1,101 @@
+import datetime
+import json
+
+import pytest
+
+from src.mealplanner.engine import PlanEngine
+from src.mealplanner.generator import FillRules, PlanGenerator
+from src.mealplanner.plan import DAYS
+
+LIBRARY = [f"Meal {number}" for number in range(30)]
+
+
+def days_of(filled):
+    return [filled[week][day] for week in sorted(filled) for day in DAYS]
+
+
+def test_no_repeat_within_window():
+    filled = PlanGenerator(LIBRARY, FillRules(no_repeat_days=20), seed=1).fill({}, range(1, 53))
+    meals = days_of(filled)
+    assert set(meals) <= set(LIBRARY)
+    for day, meal in enumerate(meals):
+        assert meal not in meals[day + 1:day + 21]
+
+
+def test_max_per_month_and_fixed_days():
+    rules = FillRules(no_repeat_days=3, max_per_month=3, fixed_days={"Friday": ["Fish and Chips", "Fish Pie"]})
+    generator = PlanGenerator(LIBRARY, rules, start_date=datetime.date(2025, 1, 6), seed=2)
+    filled = generator.fill({}, range(1, 27))
+    assert generator.violations == 0
+    assert {filled[week]["Friday"] for week in filled} == {"Fish and Chips", "Fish Pie"}
+    uses = {}
+    for week, meals in filled.items():
+        for index, day in enumerate(DAYS):
+            date = datetime.date(2025, 1, 6) + datetime.timedelta(days=(week - 1) * 7 + index)
+            key = (date.year, date.month, meals[day])
+            uses[key] = uses.get(key, 0) + 1
+    assert max(count for count in uses.values()) <= 3
+
+
+def test_impossible_rules_fall_back_to_least_recently_used():
+    generator = PlanGenerator(["Soup", "Stew"], FillRules(no_repeat_days=5), seed=3)
+    meals = days_of(generator.fill({}, [1]))
+    assert generator.violations == 5
+    assert all(meal != previous for previous, meal in zip(meals, meals[1:]))
+
+
+def test_fill_respects_meals_already_planned():
+    plans = {1: {day: LIBRARY[index] for index, day in enumerate(DAYS)}}
+    filled = PlanGenerator(LIBRARY[:14], FillRules(no_repeat_days=13), seed=4).fill(plans, [2])
+    assert set(filled) == {2}
+    assert set(filled[2].values()) == set(LIBRARY[7:14])
+
+
+def test_same_seed_same_plan():
+    first = PlanGenerator(LIBRARY, seed=5).fill({}, range(1, 9))
+    assert PlanGenerator(LIBRARY, seed=5).fill({}, range(1, 9)) == first
+    with pytest.raises(ValueError):
+        PlanGenerator([])
+
+
+def test_engine_auto_fill_writes_through_weekly_plans(tmp_path):
+    engine = PlanEngine(str(tmp_path / "meal_plans.json")).load()
+    engine.set_num_weeks(10)
+    engine.set_meal(2, "Monday", "Soup")
+    assert engine.empty_weeks() == [1, 3, 4, 5, 6, 7, 8, 9, 10]
+    engine.meal_index  # Built before filling, so it must follow the fill
+    generator = engine.auto_fill(library=LIBRARY, rules=FillRules(no_repeat_days=10), seed=6)
+    assert generator.violations == 0
+    assert engine.empty_weeks() == []
+    assert engine.meal(2, "Monday") == "Soup" and engine.meal(2, "Tuesday") == "Tacos"
+    assert engine.meal(5, "Friday") in LIBRARY
+    assert engine.search_meals(engine.meal(5, "Friday")).count((5, "Friday")) == 1
+
+    with open(engine.data_file) as f:
+        saved = json.load(f)["weeks"]
+    assert sorted(saved, key=int) == [str(week) for week in range(1, 11)]
+
+
+def test_empty_weeks_are_judged_by_their_meals(tmp_path):
+    path = tmp_path / "meal_plans.json"
+    default = PlanEngine(str(path)).get_default_week_meals()
+    # Older versions saved every default week
+    path.write_text(json.dumps({"num_weeks": 8, "weeks": {str(week): default for week in range(1, 9)}}))
+    engine = PlanEngine(str(path)).load()
+    assert engine.empty_weeks() == list(range(1, 9))
+    engine.set_meal(1, "Monday", "Soup")
+    engine.clear_weeks(5, 8)
+    engine.set_meal(6, "Friday", "Curry")
+    assert engine.empty_weeks() == [2, 3, 4, 5, 7, 8]
+
+
+def test_auto_fill_button(app, tmp_path, caplog):
+    app.DATA_FILE = str(tmp_path / "meal_plans.json")
+    app.startup()
+    app.auto_fill(None)
+    assert "Filled 4 weeks from 7 meals." in caplog.text
+    assert app.engine.empty_weeks() == []
+    assert app.day_labels["Monday"].text == app.weekly_plans[1]["Monday"]
+    app.auto_fill(None)
+    assert "No empty weeks to fill." in caplog.text
+    app.main_window.close()
@@ -0,0 +1,94 @@
+import json
+import os
+
+import pytest
+
+from src.mealplanner.households import DEFAULT_HOUSEHOLD, HouseholdManager
+
+
+def make_manager(tmp_path, **kwargs):
+    return HouseholdManager(str(tmp_path / "meal_plans.json"), **kwargs)
+
+
+def test_household_paths_and_names(tmp_path):
+    manager = make_manager(tmp_path)
+    assert manager.path(DEFAULT_HOUSEHOLD) == str(tmp_path / "meal_plans.json")
+    assert manager.path("Grandma's") == str(tmp_path / "households" / "Grandma's.json")
+    for name in ("", "../x", "a/b", "..", "recipes", "Recipes"):
+        with pytest.raises(ValueError):
+            manager.path(name)
+    assert manager.names() == [DEFAULT_HOUSEHOLD]
+    (tmp_path / "households").mkdir()
+    (tmp_path / "households" / "cabin.json").write_text("{}")
+    (tmp_path / "households" / "recipes.json").write_text("{}")  # Shared by the households, not one of them
+    manager.open("Beach")
+    assert manager.names() == [DEFAULT_HOUSEHOLD, "Beach", "cabin"]
+
+
+def test_open_hits_the_cache(tmp_path):
+    manager = make_manager(tmp_path)
+    home = manager.open(DEFAULT_HOUSEHOLD)
+    beach = manager.open("Beach")
+    assert manager.open(DEFAULT_HOUSEHOLD) is home and manager.open("Beach") is beach
+    assert (manager.hits, manager.misses, manager.evictions) == (2, 2, 0)
+    assert beach.data_file == str(tmp_path / "households" / "Beach.json")
+
+
+def test_eviction_saves_dirty_plans(tmp_path):
+    manager = make_manager(tmp_path, max_bytes=0)  # Only the plan opened last stays open
+    home = manager.open(DEFAULT_HOUSEHOLD)
+    home.save_meals()
+    home.set_meal(1, "Monday", "Soup")
+    assert home.dirty and os.path.exists(home.data_file + ".journal")
+
+    beach = manager.open("Beach")
+    assert list(manager.engines) == ["Beach"] and manager.evictions == 1
+    assert not home.dirty and not os.path.exists(home.data_file + ".journal")
+    with open(home.data_file) as f:
+        assert json.load(f)["weeks"]["1"]["Monday"] == "Soup"
+
+    manager.open(DEFAULT_HOUSEHOLD)  # Clean plans are closed without writing
+    assert not os.path.exists(beach.data_file)
+    assert manager.open(DEFAULT_HOUSEHOLD).meal(1, "Monday") == "Soup"
+    assert (manager.hits, manager.misses) == (1, 3)
+
+
+def test_eviction_is_least_recently_used(tmp_path):
+    manager = make_manager(tmp_path)
+    for name in ("A", "B", "C"):
+        manager.open(name).save_meals()
+    size = manager.engines["A"].estimated_size()
+    manager.max_bytes = 3 * size
+    manager.open("A")
+    manager.open("D").save_meals()
+    manager.open("B")
+    assert list(manager.engines) == ["A", "D", "B"]
+
+
+def test_switching_households_in_the_app(app, tmp_path, caplog):
+    app.DATA_FILE = str(tmp_path / "meal_plans.json")
+    app.startup()
+    home = app.engine
+    app.edit_dinner(None, "Monday", 1)
+    app.edit_dialog.text_input.value = "Soup"
+    app.handle_edit_ok(None)
+
+    app.new_household_input.value = "Beach House"
+    app.add_household(None)
+    assert app.household == "Beach House" and app.engine is not home
+    assert [row.value for row in app.household_selection.items] == [DEFAULT_HOUSEHOLD, "Beach House"]
+    assert app.household_selection.value == "Beach House"
+    assert app.plan_watcher.path == app.engine.data_file  # Watching the plan shown
+    assert app.day_labels["Monday"].text == "Pasta"
+    app.next_week(None)
+
+    app.household_selection.value = DEFAULT_HOUSEHOLD
+    assert app.engine is home and app.current_week == 1
+    assert app.day_labels["Monday"].text == "Soup"
+
+    app.new_household_input.value = "../etc"
+    app.add_household(None)
+    assert "Invalid household name" in caplog.text
+    app.shutdown()
+    assert not app.households.engines
+    app.main_window.close()
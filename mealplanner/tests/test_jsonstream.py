@@ -0,0 +1,60 @@
+import io
+import json
+
+import pytest
+
+from src.mealplanner import store as store_module
+from src.mealplanner.jsonstream import iter_members
+from src.mealplanner.store import PlanStore
+
+DOCUMENTS = [
+    {"weeks": {"1": {"Monday": "Soup"}, "2": {"Tuesday": "Café \"special\" \\ stew"}}, "start_date": "2025-01-06", "num_weeks": 12345},
+    {"num_weeks": 2, "weeks": {"bad": {"Monday": "X"}, "3": "not a week", "4": {}}},
+    {"weeks": [], "start_date": None, "extra": {"nested": [1, 2.5, True, None]}},
+    {},
+]
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+@pytest.mark.parametrize("indent", [None, 4])
+def test_iter_members_matches_json_load(document, indent):
+    text = json.dumps(document, indent=indent)
+    # A tiny chunk size puts chunk boundaries inside keys, strings and numbers
+    members = list(iter_members(io.StringIO(text), nested_key="weeks", chunk_size=3))
+    rebuilt = {}
+    for parent, key, value in members:
+        if parent == "weeks":
+            rebuilt.setdefault("weeks", {})[key] = value
+        else:
+            rebuilt[key] = value
+    if document.get("weeks") == {}:
+        rebuilt.setdefault("weeks", {})
+    assert rebuilt == document
+
+
+@pytest.mark.parametrize("text", ['[1, 2]', '{"weeks": {"1": {}}', '{"a": 1} trailing', '{"a" 1}', ''])
+def test_iter_members_rejects_invalid_documents(text):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_members(io.StringIO(text), nested_key="weeks", chunk_size=4))
+
+
+@pytest.mark.parametrize("document", DOCUMENTS + ["not an object"])
+def test_streaming_load_matches_whole_document_load(tmp_path, monkeypatch, document):
+    test_file = tmp_path / "meal_plans.json"
+    test_file.write_text(json.dumps(document, indent=4))
+    whole = PlanStore(str(test_file)).load()
+    monkeypatch.setattr(store_module, "STREAMING_MIN_BYTES", 0)
+    streamed = PlanStore(str(test_file)).load()
+    assert (streamed.error, streamed.num_weeks, streamed.start_date) == (whole.error, whole.num_weeks, whole.start_date)
+    assert streamed.weeks == whole.weeks
+    assert streamed.invalid_week_keys == whole.invalid_week_keys
+
+
+def test_streaming_load_warns_about_invalid_week_keys(app, tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(store_module, "STREAMING_MIN_BYTES", 0)
+    app.DATA_FILE = str(tmp_path / "meal_plans.json")
+    with open(app.DATA_FILE, "w") as f:
+        json.dump({"weeks": {"1": {"Monday": "Soup"}, "oops": {}}, "num_weeks": 2}, f)
+    meals = app.load_meals()
+    assert meals[1]["Monday"] == "Soup"
+    assert "Skipping invalid week key in data file: oops" in caplog.text
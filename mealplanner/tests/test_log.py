@@ -0,0 +1,75 @@
+import logging
+import sys
+
+from src.mealplanner.log import GUIConsoleHandler, configure_logging, logger
+
+
+class Console:
+    def __init__(self):
+        self.lines = []
+
+    def append(self, line):
+        self.lines.append(line)
+
+
+class CountingArg:
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return "arg"
+
+
+def teardown_function():
+    configure_logging(gui=False, log_file=None)
+
+
+def test_filtered_messages_are_not_formatted():
+    handler = configure_logging("INFO")
+    handler.attach(Console(), Console())
+    arg = CountingArg()
+    logger.debug("save_meals() called %s", arg)
+    assert arg.formatted == 0
+    logger.info("shown %s", arg)
+    assert arg.formatted >= 1
+
+
+def test_gui_handler_routes_by_level():
+    handler = configure_logging("DEBUG")
+    stdout, stderr = Console(), Console()
+    handler.attach(stdout, stderr)
+    logger.info("Loaded %d weeks", 4)
+    logger.warning("Skipping invalid week key in data file: %s", "x")
+    assert len(stdout.lines) == 1 and stdout.lines[0].endswith("INFO: Loaded 4 weeks")
+    assert len(stderr.lines) == 1 and "WARNING: Skipping invalid week key" in stderr.lines[0]
+
+
+def test_gui_handler_holds_records_until_attached():
+    handler = GUIConsoleHandler(capacity=2)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    for n in range(3):
+        handler.handle(logging.LogRecord("mealplanner", logging.ERROR, __file__, 1, "early %d", (n,), None))
+    stderr = Console()
+    handler.attach(Console(), stderr)
+    assert stderr.lines == ["early 0", "early 1"]
+
+
+def test_rotating_log_file(tmp_path):
+    log_file = tmp_path / "mealplanner.log"
+    configure_logging("INFO", gui=False, log_file=str(log_file), max_bytes=200, backups=2)
+    for n in range(20):
+        logger.info("message %d", n)
+    for handler in logger.handlers:
+        handler.flush()
+    assert "message 19" in log_file.read_text()
+    assert (tmp_path / "mealplanner.log.1").exists()
+    assert not (tmp_path / "mealplanner.log.3").exists()
+
+
+def test_headless_app_has_no_gui_sink(make_app):
+    real_stdout, real_stderr = sys.stdout, sys.stderr
+    app = make_app(HEADLESS=True)
+    assert app.log_handler is None
+    assert sys.stdout is real_stdout and sys.stderr is real_stderr
+    assert not any(isinstance(handler, GUIConsoleHandler) for handler in logger.handlers)
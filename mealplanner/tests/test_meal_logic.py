@@ -1,5 +1,5 @@
-from src.mealplanner.app import MealPlanner
-from datetime import date, timedelta
+from src.mealplanner.engine import PlanEngine
+from datetime import date
 import json
 
 def test_save_meals(app,tmp_path):
@@ -23,8 +23,9 @@ def test_save_meals(app,tmp_path):
         },
     }
 
-    # Call the save_meals method
+    # Call the save_meals method; the background writer saves it
     app.save_meals()
+    app.writer.flush()
 
     # Load the data from the file
     try:
@@ -49,3 +50,34 @@ def test_save_meals(app,tmp_path):
         "num_weeks": 2,
     }
     assert saved_data == expected_data
+
+def test_save_settings_keeps_weeks(app, tmp_path):
+    test_file = tmp_path / "meal_plans.json"
+    app.DATA_FILE = str(test_file)
+    app.num_weeks = 2
+    app.plan_start_date = date(2024, 2, 19)
+    app.weekly_plans = {1: {"Monday": "Chicken"}, 2: {"Friday": "Fish"}}
+    app.save_meals()
+
+    app.num_weeks = 6
+    app.save_settings()
+    app.writer.flush()
+
+    with open(str(test_file), "r") as f:
+        saved_data = json.load(f)
+    assert saved_data["num_weeks"] == 6
+    assert saved_data["start_date"] == "2024-02-19"
+    assert saved_data["weeks"] == {"1": {"Monday": "Chicken"}, "2": {"Friday": "Fish"}}
+
+def test_save_settings_before_load_keeps_stored_weeks(tmp_path):
+    test_file = tmp_path / "meal_plans.json"
+    with open(test_file, "w") as f:
+        json.dump({"num_weeks": 2, "weeks": {"1": {"Monday": "Chicken"}}}, f)
+    engine = PlanEngine(str(test_file))  # Never loaded, unlike a started app's
+    engine.num_weeks = 3
+    engine.persist_plans()
+
+    with open(str(test_file), "r") as f:
+        saved_data = json.load(f)
+    assert saved_data["num_weeks"] == 3
+    assert saved_data["weeks"] == {"1": {"Monday": "Chicken"}}
@@ -0,0 +1,97 @@
+from src.mealplanner.plan import MealTable, Week, WeekPlans
+import json
+import pytest
+import threading
+
+DEFAULT_WEEK = {"Monday": "Pasta", "Tuesday": "Tacos"}
+
+
+def test_default_weeks_are_shared_until_edited():
+    plans = WeekPlans({}, DEFAULT_WEEK, 5000)
+    assert len(plans) == 5000
+    assert plans[4000]["Monday"] == "Pasta"
+    assert plans.get(5001) is None
+    assert plans.edited == {}
+
+    plans[4000]["Monday"] = "Soup"
+    assert plans[4000] == {"Monday": "Soup", "Tuesday": "Tacos"}
+    assert plans[3999]["Monday"] == "Pasta"
+    assert DEFAULT_WEEK["Monday"] == "Pasta"
+    assert plans.persisted_weeks() == {4000: {"Monday": "Soup", "Tuesday": "Tacos"}}
+
+
+def test_week_interns_meal_names():
+    table = MealTable()
+    first = Week.from_mapping(table, {"Monday": "Soup", "Funday": "Cake", "Tuesday": 3})
+    second = Week(table)
+    second["Friday"] = "Soup"
+    assert first == {"Monday": "Soup"}
+    assert list(second) == ["Friday"]
+    assert first.ids[0] == second.ids[4]
+    assert table.names == [None, "Soup"]
+    with pytest.raises(KeyError):
+        second["Funday"] = "Cake"
+    with pytest.raises(TypeError):
+        second["Monday"] = 3
+    del second["Friday"]
+    assert len(second) == 0 and second == {}
+
+
+
+def test_interning_from_several_threads():
+    table = MealTable()
+    names = [f"Meal {n}" for n in range(2000)]
+    threads = [threading.Thread(target=lambda: [table.intern(name) for name in names]) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert table.names == [None] + names
+    assert all(table.names[table.ids[name]] == name for name in names)
+
+def test_stored_weeks_copy_on_write():
+    stored = {1: {"Monday": "Soup"}, 7: {"Friday": "Fish"}}
+    plans = WeekPlans(stored, DEFAULT_WEEK, 2)
+    assert sorted(plans) == [1, 2, 7]
+    assert plans[2] == DEFAULT_WEEK
+
+    view = plans[1]
+    view["Tuesday"] = "Stew"
+    assert stored[1] == {"Monday": "Soup"}
+    assert plans[1] == {"Monday": "Soup", "Tuesday": "Stew"}
+    assert view["Tuesday"] == "Stew"
+    assert plans.changed_weeks() == {1: {"Monday": "Soup", "Tuesday": "Stew"}}
+    # Only stored and edited weeks are persisted, never untouched defaults
+    assert plans.persisted_weeks() == {1: {"Monday": "Soup", "Tuesday": "Stew"}, 7: {"Friday": "Fish"}}
+
+
+def test_num_weeks_can_grow():
+    plans = WeekPlans({}, DEFAULT_WEEK, 1)
+    assert 2 not in plans
+    plans.num_weeks = 3
+    assert plans[3]["Tuesday"] == "Tacos"
+
+
+def test_large_week_count_only_persists_edited_weeks(app, tmp_path):
+    test_file = tmp_path / "meal_plans.json"
+    app.DATA_FILE = str(test_file)
+    app.startup()
+    app.show_set_weeks_dialog(None)
+    app.set_weeks_dialog.weeks_input.value = "5000"
+    app.handle_set_weeks_ok(None)
+
+    app.current_week = 4999
+    app.next_week(None)
+    assert app.current_week == 5000
+    assert app.day_labels["Monday"].text == "Pasta"
+    app.edit_dinner(None, "Monday", 5000)
+    app.edit_dialog.text_input.value = "Soup"
+    app.handle_edit_ok(None)
+    app.shutdown()
+
+    with open(test_file) as f:
+        saved = json.load(f)
+    assert saved["num_weeks"] == 5000
+    assert list(saved["weeks"]) == ["5000"]
+    assert saved["weeks"]["5000"]["Monday"] == "Soup"
+    app.main_window.close()
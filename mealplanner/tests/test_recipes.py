@@ -0,0 +1,78 @@
+import json
+
+from src.mealplanner.engine import PlanEngine
+from src.mealplanner.recipes import RecipeBook, ShoppingItem, ShoppingListCache, normalise_unit, shopping_items
+
+RECIPES = {
+    "Pasta": [{"ingredient": "Spaghetti", "quantity": 500, "unit": "g"}, ["tomato sauce", 0.5, "L"], ["onion", 1]],
+    "Tacos": [["beef mince", 0.25, "kg"], ["taco shells", 8], ["onion", 2, "pieces"]],
+    "Bolognese": [["spaghetti", 1, "lb"], ["beef mince", 500, "grams"], ["tomato sauce", 2, "cups"], "bad", ["x", "y"]],
+}
+
+
+def test_normalise_unit():
+    assert normalise_unit("kg") == ("g", 1000)
+    assert normalise_unit(" Tbsp. ") == ("ml", 15)
+    assert normalise_unit("cups") == ("ml", 240)
+    assert normalise_unit(None) == ("", 1)
+    assert normalise_unit("pinch") == ("pinch", 1)
+
+
+def test_recipe_vectors_and_aggregation():
+    book = RecipeBook(RECIPES)
+    assert dict(book.vector("  pasta ")) == {("spaghetti", "g"): 500, ("tomato sauce", "ml"): 500, ("onion", ""): 1}
+    assert book.vector("Soup") is None and book.vector("") is None
+    assert len(book.vector("Bolognese")) == 3  # Malformed ingredients skipped
+
+    plans = {1: {"Monday": "Pasta", "Tuesday": "Tacos", "Wednesday": "Soup"}, 2: {"Monday": "Bolognese"}}
+    cache = ShoppingListCache(book, plans)
+    totals, missing = cache.aggregate([1, 2])
+    assert missing == {"Soup"}
+    assert shopping_items(totals) == [
+        ShoppingItem("beef mince", 750, "g"),
+        ShoppingItem("onion", 3, ""),
+        ShoppingItem("spaghetti", 953.59, "g"),
+        ShoppingItem("taco shells", 8, ""),
+        ShoppingItem("tomato sauce", 980, "ml"),
+    ]
+
+    plans[1]["Tuesday"] = "Pasta"
+    assert cache.aggregate([1])[0][("onion", "")] == 3  # Still the cached week
+    cache.update(1, "Tuesday", "Pasta")
+    assert cache.aggregate([1])[0][("onion", "")] == 2
+
+
+def test_engine_shopping_list_follows_edits(tmp_path):
+    (tmp_path / "recipes.json").write_text(json.dumps(RECIPES))
+    engine = PlanEngine(str(tmp_path / "meal_plans.json")).load()
+    items, missing = engine.shopping_list(1, 4)
+    assert ShoppingItem("taco shells", 32, "") in items
+    assert "Steak" in missing
+    engine.set_meal(2, "Tuesday", "Pasta")
+    items, _ = engine.shopping_list(1, 4)
+    assert ShoppingItem("taco shells", 24, "") in items
+    assert ShoppingItem("spaghetti", 2.5, "kg") in items
+    assert engine.shopping_list(3, 99)[0] == engine.shopping_list(3, 4)[0]
+
+    (tmp_path / "recipes.json").write_text(json.dumps({"Pasta": [["spaghetti", 100, "g"]]}))
+    engine.load_recipes()
+    assert engine.shopping_list(1)[0] == [ShoppingItem("spaghetti", 100, "g")]
+
+
+def test_invalid_recipes_file(tmp_path, caplog):
+    (tmp_path / "recipes.json").write_text("{oops")
+    assert RecipeBook.load(str(tmp_path / "recipes.json")).vectors == {}
+    assert "Error reading recipes" in caplog.text
+    assert RecipeBook.load(str(tmp_path / "missing.json")).vectors == {}
+
+
+def test_shopping_list_button(app, tmp_path, caplog):
+    app.DATA_FILE = str(tmp_path / "meal_plans.json")
+    (tmp_path / "recipes.json").write_text(json.dumps(RECIPES))
+    app.startup()
+    app.show_shopping_list(None)
+    assert "Shopping list for week 1 (5 items):" in caplog.text
+    assert "  spaghetti: 500 g" in caplog.text
+    assert "  onion: 3\n" in caplog.text
+    assert "No recipe for: Chicken and Veggies, Fish and Chips, Pizza, Roast Dinner, Steak" in caplog.text
+    app.main_window.close()
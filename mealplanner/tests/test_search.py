@@ -0,0 +1,79 @@
+from src.mealplanner.engine import PlanEngine
+from src.mealplanner.search import MealIndex, slot, slot_day, tokenize
+
+
+def test_tokenize():
+    assert tokenize("Fish and Chips") == ["fish", "and", "chips"]
+    assert tokenize("  Mac'n'Cheese, CAFÉ ") == ["mac", "n", "cheese", "café"]
+    assert tokenize("") == [] and tokenize(None) == []
+
+
+def test_index_search_and_update():
+    index = MealIndex.build({1: {"Monday": "Beef Lasagne", "Friday": "Fish and Chips"},
+                             2: {"Monday": "Veggie lasagne", "Sunday": "Roast beef"}, 0: {"Monday": "Lasagne"}})
+    assert MealIndex.matches(index.search("lasagne")) == [(1, "Monday"), (2, "Monday")]
+    assert MealIndex.matches(index.search("LASAGNE beef")) == [(1, "Monday")]
+    assert MealIndex.matches(index.search("beef")) == [(1, "Monday"), (2, "Sunday")]
+    assert index.search("pizza") == 0 and index.search("  ") == 0 and MealIndex.matches(0) == []
+
+    bits = index.search("beef")
+    assert slot_day(MealIndex.next_match(bits)) == (1, "Monday")
+    assert slot_day(MealIndex.next_match(bits, slot(1, "Monday"))) == (2, "Sunday")
+    assert MealIndex.next_match(bits, slot(2, "Sunday")) is None
+
+    index.update(1, "Monday", "Pizza")
+    index.update(2, "Tuesday", "Lasagne")
+    assert MealIndex.matches(index.search("lasagne")) == [(2, "Monday"), (2, "Tuesday")]
+    index.update(2, "Monday", "")
+    index.update(2, "Tuesday", None)
+    assert index.search("lasagne") == 0
+    assert "lasagne" not in index.postings
+
+
+def test_engine_search_follows_edits(tmp_path):
+    engine = PlanEngine(str(tmp_path / "meal_plans.json")).load()
+    assert engine.search_meals("pasta") == [(week, "Monday") for week in range(1, 5)]
+    engine.set_meal(3, "Wednesday", "Pasta bake")
+    engine.set_meal(1, "Monday", "Soup")
+    assert engine.search_meals("pasta") == [(2, "Monday"), (3, "Monday"), (3, "Wednesday"), (4, "Monday")]
+    engine.set_num_weeks(5)
+    assert engine.search_meals("pasta bake") == [(3, "Wednesday")]
+    assert engine.search_meals("pasta")[-1] == (5, "Monday")
+    engine.set_num_weeks(2)
+    assert engine.search_meals("pasta") == [(2, "Monday")]
+
+    engine.weekly_plans = {1: {"Monday": "Lasagne"}}  # A replaced plan is re-indexed
+    assert engine.search_meals("lasagne") == [(1, "Monday")]
+
+
+def test_next_meal_match_wraps_round(tmp_path):
+    engine = PlanEngine(str(tmp_path / "meal_plans.json")).load()
+    engine.set_meal(3, "Sunday", "Pasta bake")
+    assert engine.next_meal_match("pasta", 2) == (2, "Monday", 2, 5)
+    assert engine.next_meal_match("pasta", 3, "Monday") == (3, "Sunday", 4, 5)
+    assert engine.next_meal_match("pasta", 4, "Monday") == (1, "Monday", 1, 5)
+    assert engine.next_meal_match("lasagne", 1) is None
+
+
+def test_search_box_jumps_to_each_match(app, tmp_path):
+    app.DATA_FILE = str(tmp_path / "meal_plans.json")
+    app.startup()
+    for week, day in ((2, "Friday"), (4, "Tuesday"), (4, "Sunday")):
+        app.edit_dinner(None, day, week)
+        app.edit_dialog.text_input.value = "Lasagne"
+        app.handle_edit_ok(None)
+
+    app.search_input.value = "lasagne"
+    shown = []
+    for _ in range(4):
+        app.find_meal(None)
+        shown.append(app.search_hit)
+        assert app.week_label.text.startswith(f"Week {app.current_week}:")
+        assert app.day_labels[app.search_hit[1]].text == "Lasagne"
+    assert shown == [(2, "Friday"), (4, "Tuesday"), (4, "Sunday"), (2, "Friday")]
+    assert app.prev_button.enabled
+
+    app.search_input.value = "nothing like this"
+    app.find_meal(None)
+    assert app.current_week == 2
+    app.main_window.close()
@@ -0,0 +1,159 @@
+import io
+import json
+
+import pytest
+
+from src.mealplanner import batch
+from src.mealplanner.engine import PlanEngine
+from src.mealplanner.plan import DEFAULT_WEEK_MEALS
+from src.mealplanner.snapshot import (Snapshot, SnapshotError, SnapshotPlanStore, migrate_json_to_snapshot,
+                                      snapshot_path, write_snapshot)
+from src.mealplanner.store import PlanStore, open_store
+
+DEFAULT_WEEK = {"Monday": "Pasta", "Tuesday": "Tacos"}
+
+
+def write_document(path, document):
+    with open(path, "wb") as f:
+        write_snapshot(f, document)
+    return str(path)
+
+
+def test_round_trips_the_saved_json_document(tmp_path):
+    engine = PlanEngine(str(tmp_path / "meal_plans.json")).load()
+    engine.set_num_weeks(8)
+    engine.set_meal(2, "Friday", "Café crème brûlée")
+    engine.set_meal(7, "Sunday", "")
+    engine.save_meals()
+    with open(engine.data_file) as f:
+        saved = json.load(f)
+
+    path = write_document(tmp_path / "plan.mealsnap", engine.plan_document())
+    assert Snapshot(path).document() == saved
+
+
+def test_weeks_are_read_on_demand(tmp_path):
+    weeks = {week: {"Monday": f"Meal {week % 3}"} for week in range(1, 1001)}
+    path = write_document(tmp_path / "plan.mealsnap", {"weeks": weeks, "start_date": None, "num_weeks": 4})
+    store = SnapshotPlanStore(path).load()
+    assert (store.num_weeks, store.start_date) == (4, None)
+    plans = store.plan_weeks(DEFAULT_WEEK, 4)
+    assert plans[500] == {"Monday": "Meal 2"}
+    assert list(store.weeks._cache) == [500]
+    assert 1001 not in plans.stored and 999 in plans.stored
+    assert len(store.weeks) == 1000
+    # One interned copy of each meal name, whichever week it came from
+    assert plans[3]["Monday"] is plans[6]["Monday"]
+
+
+def test_snapshot_store_journals_and_compacts(tmp_path):
+    store = SnapshotPlanStore(str(tmp_path / "plan.mealsnap")).load()
+    assert store.error == PlanStore.MISSING
+    store.save({"weeks": {1: {"Monday": "Soup"}}, "start_date": "2025-01-06", "num_weeks": 2})
+    store.append_edit(1, "Tuesday", "Stew")
+    store.append_edit(2, "Monday", "Curry")
+
+    reopened = SnapshotPlanStore(store.path).load()
+    assert reopened.replayed_weeks(DEFAULT_WEEK) == {1: {"Monday": "Soup", "Tuesday": "Stew"},
+                                                     2: {"Monday": "Curry", "Tuesday": "Tacos"}}
+    reopened.compact(DEFAULT_WEEK)
+    assert reopened.journal == []
+    assert Snapshot(store.path).document()["weeks"]["2"] == {"Monday": "Curry", "Tuesday": "Tacos"}
+
+
+def test_binary_backend_migrates_json(tmp_path):
+    data_file = tmp_path / "meal_plans.json"
+    data_file.write_text(json.dumps({"weeks": {"1": {"Monday": "Soup"}, "x": {}}, "num_weeks": 3}))
+    store = open_store(str(data_file), "binary")
+    assert isinstance(store, SnapshotPlanStore) and store.path == snapshot_path(str(data_file))
+
+    engine = PlanEngine(str(data_file), "binary").load()
+    assert engine.meal(1, "Monday") == "Soup"
+    assert engine.num_weeks == 3
+    engine.set_meal(3, "Friday", "Fish")
+    engine.close()
+    assert PlanEngine(str(data_file), "binary").load().meal(3, "Friday") == "Fish"
+    assert migrate_json_to_snapshot(str(data_file), str(tmp_path / "again.mealsnap")) == 1
+
+
+def test_journal_only_week_migrates_from_the_default_week(tmp_path):
+    data_file = tmp_path / "meal_plans.json"
+    data_file.write_text(json.dumps({"weeks": {"1": {"Monday": "Soup"}}, "num_weeks": 2}))
+    PlanStore(str(data_file)).append_edit(2, "Monday", "X")
+    engine = PlanEngine(str(data_file), "binary").load()
+    assert engine.meal(2, "Monday") == "X"
+    assert engine.meal(2, "Tuesday") == DEFAULT_WEEK_MEALS["Tuesday"]  # Not just the edited day
+
+
+def test_saving_closes_the_mapped_snapshot(tmp_path):
+    path = write_document(tmp_path / "plan.mealsnap", {"weeks": {1: {"Monday": "Soup"}, 2: {"Monday": "Stew"}},
+                                                       "start_date": None, "num_weeks": 2})
+    store = SnapshotPlanStore(path).load()
+    plans = store.plan_weeks(DEFAULT_WEEK, 2)
+    mapped = store.weeks.snapshot
+    assert plans[1] == {"Monday": "Soup"}
+    store.save({"weeks": {1: {"Monday": "Curry"}}, "start_date": None, "num_weeks": 2})
+    assert mapped._map.closed and store.snapshot is not mapped
+    # Views of the replaced file still read its weeks
+    assert plans[2] == {"Monday": "Stew"} and sorted(plans.stored) == [1, 2]
+    assert SnapshotPlanStore(path).load().weeks[1] == {"Monday": "Curry"}
+
+
+def test_write_updated_encodes_only_the_given_weeks(tmp_path):
+    path = write_document(tmp_path / "plan.mealsnap", {"weeks": {1: {"Monday": "Soup"}, 4: {"Friday": "Stew"}},
+                                                       "start_date": None, "num_weeks": 4})
+    snapshot = Snapshot(path)
+    updated = io.BytesIO()
+    written = snapshot.write_updated(updated, {"2": {"Monday": "Curry"}, 4: {"Friday": "Soup"}}, "2025-01-06", 6)
+    assert written == {2, 4}
+    (tmp_path / "updated.mealsnap").write_bytes(updated.getvalue())
+    result = Snapshot(str(tmp_path / "updated.mealsnap"))
+    assert result.document() == {"weeks": {"1": {"Monday": "Soup"}, "2": {"Monday": "Curry"}, "4": {"Friday": "Soup"}},
+                                 "start_date": "2025-01-06", "num_weeks": 6}
+    # Existing strings keep their ids; new ones go after them
+    assert [result.string(string_id) for string_id in range(1, result.string_count + 1)] == [
+        "Soup", "Stew", "Curry", "2025-01-06"]
+
+
+def test_repeated_small_saves_only_decode_the_edited_weeks(tmp_path):
+    data_file = tmp_path / "meal_plans.json"
+    weeks = {week: {"Monday": f"Meal {week % 5}"} for week in range(1, 2001)}
+    write_document(snapshot_path(str(data_file)), {"weeks": weeks, "start_date": "2025-01-06", "num_weeks": 4})
+    engine = PlanEngine(str(data_file), "binary").load()
+    engine.journal_mode = False  # Every edit is a full save
+    for edit in range(10):
+        engine.set_meal(edit % 3 + 1, "Monday", f"Edit {edit}")
+    store = engine.plan_store()
+    decoded = [len(view._cache) + len(view._pinned) for view in (engine.weekly_plans.stored, store.weeks)]
+    assert max(decoded) <= 3
+
+    reopened = SnapshotPlanStore(store.path).load()
+    assert len(reopened.weeks) == 2000
+    assert [reopened.weeks[week]["Monday"] for week in (1, 2, 3, 4, 1500)] == [
+        "Edit 9", "Edit 7", "Edit 8", "Meal 4", "Meal 0"]
+    assert engine.meal(1500, "Monday") == "Meal 0" and engine.meal(1, "Monday") == "Edit 9"
+
+
+@pytest.mark.parametrize("data", [b"", b"MEALSNAP", b"NOTASNAP" + bytes(56), b"MEALSNAP\x01" + b"\xff" * 60])
+def test_corrupt_snapshot_is_invalid(tmp_path, data):
+    path = tmp_path / "plan.mealsnap"
+    path.write_bytes(data)
+    with pytest.raises(SnapshotError):
+        Snapshot(str(path))
+    assert SnapshotPlanStore(str(path)).load().error == PlanStore.INVALID
+
+
+def test_snapshot_is_smaller_than_json(tmp_path):
+    weeks = {week: {day: f"Meal {week % 20}" for day in DEFAULT_WEEK} for week in range(1, 201)}
+    document = {"weeks": weeks, "start_date": "2025-01-06", "num_weeks": 200}
+    binary = io.BytesIO()
+    write_snapshot(binary, document)
+    assert len(binary.getvalue()) < len(json.dumps(document, indent=4)) / 2
+
+
+def test_batch_export_to_snapshots(tmp_path):
+    (tmp_path / "in").mkdir()
+    (tmp_path / "in" / "meal_plans.json").write_text(json.dumps({"weeks": {"1": {"Monday": "Soup"}}, "num_weeks": 1}))
+    counts = batch.run("export", str(tmp_path / "in"), str(tmp_path / "out"), "binary", workers=1, out=io.StringIO())
+    assert counts[batch.OK] == 1
+    assert Snapshot(str(tmp_path / "out" / "meal_plans.mealsnap")).document()["weeks"] == {"1": {"Monday": "Soup"}}
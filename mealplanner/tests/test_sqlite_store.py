@@ -0,0 +1,92 @@
+from src.mealplanner.sqlite_store import SQLitePlanStore, migrate_json_to_sqlite, sqlite_path
+from src.mealplanner.store import PlanStore, open_store
+import json
+import pytest
+
+DEFAULT_WEEK = {"Monday": "Pasta", "Tuesday": "Tacos"}
+
+
+def write_plan(path, data):
+    with open(path, "w") as f:
+        json.dump(data, f)
+
+
+def test_open_store_selects_backend(tmp_path):
+    data_file = str(tmp_path / "meal_plans.json")
+    assert isinstance(open_store(data_file, "json"), PlanStore)
+    sqlite_store = open_store(data_file, "sqlite")
+    assert isinstance(sqlite_store, SQLitePlanStore)
+    assert sqlite_store.path == str(tmp_path / "meal_plans.sqlite3") == sqlite_path(data_file)
+    with pytest.raises(ValueError):
+        open_store(data_file, "xml")
+
+
+def test_migrate_json_to_sqlite(tmp_path):
+    json_file = tmp_path / "meal_plans.json"
+    write_plan(json_file, {"num_weeks": 3, "start_date": "2025-01-27",
+                           "weeks": {"1": {"Monday": "Soup"}, "2": {}, "bad": {}}})
+    PlanStore(str(json_file)).append_edit(1, "Tuesday", "Stew")
+
+    assert migrate_json_to_sqlite(str(json_file), str(tmp_path / "plans.sqlite3")) == 2
+    store = SQLitePlanStore(str(tmp_path / "plans.sqlite3")).load()
+    assert store.num_weeks == 3
+    assert store.start_date == "2025-01-27"
+    assert store.fetch_week(1) == {"Monday": "Soup", "Tuesday": "Stew"}
+    assert store.fetch_week(2) == {}
+    assert store.fetch_week(3) is None
+    store.close()
+
+
+def test_journal_only_week_migrates_from_the_default_week(tmp_path):
+    json_file = tmp_path / "meal_plans.json"
+    write_plan(json_file, {"num_weeks": 2, "weeks": {"1": {"Monday": "Soup"}}})
+    PlanStore(str(json_file)).append_edit(2, "Monday", "X")
+    store = SQLitePlanStore(str(tmp_path / "meal_plans.sqlite3"), json_path=str(json_file)).load()
+    week = store.fetch_week(2)
+    assert week["Monday"] == "X" and week["Tuesday"] == "Tacos"  # Not just the edited day
+    store.close()
+
+
+def test_sqlite_weeks_load_on_demand(tmp_path):
+    json_file = tmp_path / "meal_plans.json"
+    write_plan(json_file, {"num_weeks": 3, "weeks": {str(week): {"Monday": f"Meal {week}"} for week in range(1, 101)}})
+    store = SQLitePlanStore(str(tmp_path / "meal_plans.sqlite3"), json_path=str(json_file)).load()
+    weeks = store.plan_weeks(DEFAULT_WEEK, 3)
+    assert weeks.stored._cache == {}
+    assert weeks.get(50) == {"Monday": "Meal 50"}
+    assert weeks[2]["Monday"] == "Meal 2"
+    assert sorted(weeks.stored._cache) == [2, 50]
+    assert weeks.get(500) is None
+    assert len(weeks) == 100
+    store.close()
+
+
+def test_sqlite_edit_is_single_row_upsert(tmp_path):
+    store = SQLitePlanStore(str(tmp_path / "meal_plans.sqlite3")).load()
+    assert store.error == SQLitePlanStore.MISSING
+    store.save({"weeks": {1: {"Monday": "Soup"}}, "num_weeks": 2, "start_date": None})
+
+    store.append_edit(1, "Monday", "Stew", DEFAULT_WEEK)
+    store.append_edit(2, "Tuesday", "Curry", DEFAULT_WEEK)
+    assert store.fetch_week(1) == {"Monday": "Stew"}
+    # A week edited for the first time keeps the defaults the user saw
+    assert store.fetch_week(2) == {"Monday": "Pasta", "Tuesday": "Curry"}
+    store.close()
+
+
+def test_app_with_sqlite_backend(make_app, tmp_path):
+    json_file = tmp_path / "meal_plans.json"
+    write_plan(json_file, {"num_weeks": 2, "start_date": "2025-01-27", "weeks": {"1": {"Monday": "Soup"}}})
+    app = make_app(STORAGE_BACKEND="sqlite")
+    assert app.weekly_plans[1]["Monday"] == "Soup"
+
+    app.edit_dinner(None, "Tuesday", 2)
+    app.edit_dialog.text_input.value = "Curry"
+    app.handle_edit_ok(None)
+    app.shutdown()
+    app.main_window.close()
+
+    reopened = SQLitePlanStore(str(tmp_path / "meal_plans.sqlite3")).load()
+    assert reopened.fetch_week(2)["Tuesday"] == "Curry"
+    assert reopened.fetch_week(1) == {"Monday": "Soup"}
+    reopened.close()
@@ -0,0 +1,62 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import toga
+
+# Modules that only some runs need; importing the app must not pull them in.
+DEFERRED_MODULES = {
+    "sqlite3",
+    "logging.handlers",
+    "ctypes",
+    "src.mealplanner.sqlite_store",
+}
+
+
+def import_times(statement):
+    """Run ``statement`` under ``python -X importtime`` and return {module: (self_us, cumulative_us)}."""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=Path(__file__).resolve().parent.parent, env=env, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def startup_report(times, limit=15):
+    rows = sorted(times.items(), key=lambda item: item[1][1], reverse=True)[:limit]
+    return "\n".join(f"{cumulative:>9} us {own:>8} us  {name}" for name, (own, cumulative) in rows)
+
+
+def test_import_profile_keeps_optional_modules_deferred():
+    times = import_times("import src.mealplanner.app")
+    report = startup_report(times)
+    print(f"import -X importtime report (cumulative, self):\n{report}")
+    assert "src.mealplanner.app" in times, report
+    imported_early = DEFERRED_MODULES & set(times)
+    assert not imported_early, f"imported at startup: {sorted(imported_early)}\n{report}"
+
+
+def test_grid_first_startup_defers_message_area(make_app, tmp_path):
+    (tmp_path / "meal_plans.json").write_text("{not json")
+    app = make_app(STARTUP_MODE="grid-first", HEADLESS=False)
+
+    assert set(app.day_rows) == set(app.day_labels) and len(app.day_rows) == 7
+    assert app.stdout_console is None and app.writer is None
+    assert not any(isinstance(widget, toga.Button) and widget.text == "Clear Messages"
+                   for widget in app.main_window.content.children)
+
+    app.finish_startup()
+    assert app.writer is not None and app.writer.running
+    assert any(isinstance(widget, toga.Button) and widget.text == "Clear Messages"
+               for widget in app.main_window.content.children)
+    # Logged while loading, before the message area existed
+    assert "Error decoding JSON" in app.stderr_label.text
+    app.finish_startup()  # Running it again (e.g. from the queued callback) is harmless
+    app.shutdown()
@@ -0,0 +1,175 @@
+from src.mealplanner import store as store_module
+from src.mealplanner.store import PlanStore
+import json
+import pytest
+
+
+def write_plan(path, data):
+    with open(path, "w") as f:
+        json.dump(data, f)
+
+
+def test_plan_store_reads_document(tmp_path):
+    test_file = tmp_path / "meal_plans.json"
+    write_plan(test_file, {"num_weeks": 3, "start_date": "2025-01-27", "weeks": {"1": {"Monday": "Soup"}, "bad": {}}})
+    store = PlanStore(str(test_file)).load()
+    assert store.exists
+    assert store.error is None
+    assert store.num_weeks == 3
+    assert store.start_date == "2025-01-27"
+    assert store.weeks == {1: {"Monday": "Soup"}}
+    assert store.invalid_week_keys == ["bad"]
+
+
+def test_plan_store_missing_and_invalid(tmp_path):
+    missing = PlanStore(str(tmp_path / "missing.json")).load()
+    assert missing.error == PlanStore.MISSING
+    assert not missing.exists
+
+    test_file = tmp_path / "meal_plans.json"
+    test_file.write_text("This is not valid JSON")
+    invalid = PlanStore(str(test_file)).load()
+    assert invalid.error == PlanStore.INVALID
+    assert invalid.exists
+
+
+def test_plan_store_only_rereads_changed_file(tmp_path, monkeypatch):
+    test_file = tmp_path / "meal_plans.json"
+    write_plan(test_file, {"num_weeks": 3})
+    calls = []
+    real_load = json.load
+    monkeypatch.setattr(store_module.json, "load", lambda f: calls.append(1) or real_load(f))
+
+    store = PlanStore(str(test_file))
+    store.load()
+    store.load()
+    assert len(calls) == 1
+
+    write_plan(test_file, {"num_weeks": 12, "weeks": {}})
+    assert store.load().num_weeks == 12
+    assert len(calls) == 2
+
+
+def test_startup_parses_data_file_once(make_app, tmp_path, monkeypatch):
+    test_file = tmp_path / "meal_plans.json"
+    write_plan(test_file, {"num_weeks": 2, "start_date": "2025-01-27", "weeks": {"1": {"Monday": "Soup"}}})
+    calls = []
+    real_load = json.load
+    monkeypatch.setattr(store_module.json, "load", lambda f: calls.append(1) or real_load(f))
+
+    app = make_app()
+    assert len(calls) == 1
+    assert app.num_weeks == 2
+    assert app.weekly_plans[1]["Monday"] == "Soup"
+    assert 2 in app.weekly_plans
+    assert str(app.plan_start_date) == "2025-01-27"
+    app.main_window.close()
+
+
+def test_journal_append_and_reload(tmp_path):
+    test_file = tmp_path / "meal_plans.json"
+    write_plan(test_file, {"num_weeks": 2, "weeks": {"1": {"Monday": "Soup"}}})
+    store = PlanStore(str(test_file)).load()
+    store.append_edit(1, "Monday", "Stew")
+    store.append_edit(3, "Friday", "Fish")
+    assert store.journal == [(1, "Monday", "Stew"), (3, "Friday", "Fish")]
+
+    # A torn final line is ignored, and later appends still replay
+    with open(store.journal_path, "a") as f:
+        f.write('{"week": 2, "day": "Tue')
+    reloaded = PlanStore(str(test_file)).load()
+    assert reloaded.journal == [(1, "Monday", "Stew"), (3, "Friday", "Fish")]
+    reloaded.append_edit(2, "Sunday", "Roast")
+    assert PlanStore(str(test_file)).load().journal[-1] == (2, "Sunday", "Roast")
+
+
+def test_journal_compaction_threshold(tmp_path):
+    test_file = tmp_path / "meal_plans.json"
+    write_plan(test_file, {"num_weeks": 1})
+    store = PlanStore(str(test_file)).load()
+    assert not store.needs_compaction()
+    store.append_edit(1, "Monday", "Stew")
+    assert not store.needs_compaction()
+    assert store.needs_compaction(max_bytes=1)
+    assert store.needs_compaction(max_age=0)
+
+    store.save({"weeks": {1: {"Monday": "Stew"}}, "num_weeks": 1})
+    assert store.journal == []
+    assert not (tmp_path / "meal_plans.json.journal").exists()
+
+
+def test_edit_appends_to_journal_and_replays(make_app, tmp_path):
+    test_file = tmp_path / "meal_plans.json"
+    write_plan(test_file, {"num_weeks": 3, "start_date": "2025-01-27", "weeks": {"1": {"Monday": "Soup"}}})
+    app = make_app()
+    snapshot = test_file.read_text()
+
+    app.edit_dinner(None, "Monday", 1)
+    app.edit_dialog.text_input.value = "Stew"
+    app.handle_edit_ok(None)
+    app.edit_dinner(None, "Tuesday", 2)
+    app.edit_dialog.text_input.value = "Tacos"
+    app.handle_edit_ok(None)
+    app.writer.flush()
+
+    # The snapshot is untouched; the edits live in the journal
+    assert test_file.read_text() == snapshot
+    replayed = app.load_meals()
+
+    app.save_meals()
+    app.writer.flush()
+    assert not (tmp_path / "meal_plans.json.journal").exists()
+    assert replayed == app.load_meals()
+    assert replayed[1] == {"Monday": "Stew"}
+    assert replayed[2]["Tuesday"] == "Tacos"
+    app.main_window.close()
+
+
+def test_shutdown_compacts_journal(make_app, tmp_path):
+    test_file = tmp_path / "meal_plans.json"
+    write_plan(test_file, {"num_weeks": 1, "weeks": {"1": {"Monday": "Soup"}}})
+    app = make_app()
+    app.weekly_plans[1]["Monday"] = "Stew"
+    app.save_meal(1, "Monday", "Stew")
+    app.writer.flush()
+    assert (tmp_path / "meal_plans.json.journal").exists()
+
+    app.shutdown()
+    assert not (tmp_path / "meal_plans.json.journal").exists()
+    with open(test_file) as f:
+        assert json.load(f)["weeks"]["1"]["Monday"] == "Stew"
+    app.main_window.close()
+
+
+def test_save_failure_leaves_previous_file(tmp_path, monkeypatch):
+    test_file = tmp_path / "meal_plans.json"
+    write_plan(test_file, {"num_weeks": 1, "weeks": {"1": {"Monday": "Soup"}}})
+    original = test_file.read_text()
+
+    def broken_dump(document, f, **kwargs):
+        f.write('{"weeks": {"1": {"Mon')
+        raise OSError("disk full")
+
+    monkeypatch.setattr(store_module.json, "dump", broken_dump)
+    store = PlanStore(str(test_file))
+    with pytest.raises(OSError):
+        store.save({"weeks": {1: {"Monday": "Stew"}}, "num_weeks": 1})
+    assert test_file.read_text() == original
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["meal_plans.json"]
+
+
+def test_rapid_saves_stay_bounded(tmp_path):
+    test_file = tmp_path / "meal_plans.json"
+    store = PlanStore(str(test_file))
+    for n in range(200):
+        store.save({"weeks": {1: {"Monday": f"Meal {n}"}}, "num_weeks": 1}, backups=3)
+        with open(test_file) as f:
+            assert json.load(f)["weeks"]["1"]["Monday"] == f"Meal {n}"
+
+    # Only the data file and its rotated backups remain, never temp files
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "meal_plans.json", "meal_plans.json.1", "meal_plans.json.2", "meal_plans.json.3",
+    ]
+    for number in (1, 2, 3):
+        with open(store.backup_path(number)) as f:
+            assert json.load(f)["weeks"]["1"]["Monday"] == f"Meal {199 - number}"
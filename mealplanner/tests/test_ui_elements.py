@@ -66,12 +66,11 @@ def test_week_label_updates(app):
     app.main_window.close()
 
 
-def test_set_number_of_weeks_invalid_input(tmp_path, app):
-    app.DATA_FILE = str(tmp_path / "meal_plans.json")
-    app.startup()
+def test_set_number_of_weeks_invalid_input(make_app):
+    app = make_app(HEADLESS=False)  # The error is shown in the message area
 
     app.show_set_weeks_dialog(None)
-    app.weeks_input_widget.value = "abc"
+    app.set_weeks_dialog.weeks_input.value = "abc"
     app.handle_set_weeks_ok(None)
 
     # Check that num_weeks remains at the default value
@@ -91,12 +90,12 @@ def test_edit_dinner_dialog(app, tmp_path):
     app.edit_dinner(None, day, week)
 
     # Check the initial state of the dialog
-    assert app.edit_window is not None
-    assert app.text_input is not None  # Changed to use the stored text_input
+    assert app.edit_dialog.window is not None
+    assert app.edit_dialog.text_input is not None  # Changed to use the stored text_input
 
     # Simulate entering a new meal and pressing OK
     new_meal = "New Meal"
-    app.text_input.value = new_meal
+    app.edit_dialog.text_input.value = new_meal
     app.handle_edit_ok(None)  # Added None
 
     # Check that the meal was updated
@@ -107,7 +106,7 @@ def test_edit_dinner_cancel(app, tmp_path):
     app.startup()
     app.weekly_plans = {1: {"Monday": "Original"}}
     app.edit_dinner(None, "Monday", 1)
-    app.text_input.value = "New Meal"
+    app.edit_dialog.text_input.value = "New Meal"
     app.handle_edit_cancel(None)
     assert app.weekly_plans[1]["Monday"] == "Original"
 
@@ -115,7 +114,7 @@ def test_edit_then_save_and_reload(app, tmp_path):
     app.DATA_FILE = str(tmp_path / "meal_plans.json")
     app.startup()
     app.edit_dinner(None, "Monday", 1)
-    app.text_input.value = "Pizza"
+    app.edit_dialog.text_input.value = "Pizza"
     app.handle_edit_ok(None)
     app.save_meals()
 
@@ -123,3 +122,55 @@ def test_edit_then_save_and_reload(app, tmp_path):
     new_app.DATA_FILE = str(tmp_path / "meal_plans.json")
     new_app.weekly_plans = new_app.load_meals()
     assert new_app.weekly_plans[1]["Monday"] == "Pizza"
+
+def test_day_row_edit_uses_week_shown_at_press_time(app, tmp_path):
+    app.DATA_FILE = str(tmp_path / "meal_plans.json")
+    app.startup()
+    app.next_week(None)
+    app.next_week(None)
+    app.day_rows["Tuesday"].edit_button.on_press()
+    assert (app.edit_dialog.week, app.edit_dialog.day) == (3, "Tuesday")
+    app.edit_dialog.text_input.value = "Curry"
+    app.handle_edit_ok(None)
+    assert app.weekly_plans[3]["Tuesday"] == "Curry"
+    assert app.day_labels["Tuesday"].text == "Curry"
+    app.main_window.close()
+
+def test_week_change_updates_day_rows(app, tmp_path):
+    app.DATA_FILE = str(tmp_path / "meal_plans.json")
+    app.startup()
+    app.weekly_plans[2]["Friday"] = "Sushi"
+    app.next_week(None)
+    assert app.day_rows["Friday"].meal_label.text == "Sushi"
+    app.prev_week(None)
+    assert app.day_rows["Friday"].meal_label.text == "Fish and Chips"
+    app.main_window.close()
+
+def test_edit_dialog_is_reused(app, tmp_path):
+    app.DATA_FILE = str(tmp_path / "meal_plans.json")
+    app.startup()
+    app.edit_dinner(None, "Monday", 1)
+    window, text_input = app.edit_dialog.window, app.edit_dialog.text_input
+    app.edit_dialog.text_input.value = "Half typed"
+    app.handle_edit_cancel(None)
+    assert not window.visible
+
+    app.edit_dinner(None, "Friday", 2)
+    assert app.edit_dialog.window is window and app.edit_dialog.text_input is text_input
+    assert window.visible
+    assert window.title == "Edit Dinner for Week 2, Friday"
+    assert text_input.value == "Fish and Chips"
+    assert (app.edit_dialog.week, app.edit_dialog.day) == (2, "Friday")
+    app.main_window.close()
+
+def test_closing_pooled_dialog_only_hides_it(app, tmp_path):
+    app.DATA_FILE = str(tmp_path / "meal_plans.json")
+    app.startup()
+    app.show_set_weeks_dialog(None)
+    window = app.set_weeks_dialog.window
+    assert app.set_weeks_dialog.handle_close(window) is False
+    assert not window.visible
+    app.show_set_weeks_dialog(None)
+    assert app.set_weeks_dialog.window is window and window.visible
+    assert app.set_weeks_dialog.weeks_input.value == ""
+    app.main_window.close()
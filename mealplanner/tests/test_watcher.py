@@ -0,0 +1,147 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+from src.mealplanner.engine import PlanEngine
+from src.mealplanner.watcher import PlanWatcher
+
+
+def write_externally(path, document):
+    """Replace the data file like a sync tool or editor would."""
+    with open(path + ".tmp", "w") as f:
+        json.dump(document, f)
+    os.replace(path + ".tmp", path)
+
+
+def saved_document(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = PlanEngine(str(tmp_path / "meal_plans.json")).load()
+    engine.set_num_weeks(6)
+    engine.set_meal(2, "Monday", "Soup")
+    engine.save_meals()
+    return engine
+
+
+def test_reload_applies_only_changed_weeks(engine):
+    assert engine.reload_changes() is None  # Our own save
+    engine.meal_index  # Built before the reload, so it must follow it
+    document = saved_document(engine.data_file)
+    document["weeks"].setdefault("3", {})["Friday"] = "Curry"
+    document["weeks"]["5"] = {"Monday": "Stew"}
+    write_externally(engine.data_file, document)
+
+    changes = engine.reload_changes()
+    assert changes.weeks == [3, 5] and changes.conflicts == [] and not changes.settings
+    assert engine.meal(3, "Friday") == "Curry" and engine.meal(5, "Monday") == "Stew"
+    assert engine.meal(2, "Monday") == "Soup"
+    assert engine.search_meals("curry") == [(3, "Friday")]
+    assert not engine.dirty
+    assert engine.reload_changes() is None
+
+
+def test_unsaved_edits_win_conflicts(engine):
+    engine.set_meal(3, "Friday", "Pizza")
+    document = saved_document(engine.data_file)
+    document["weeks"].setdefault("3", {})["Friday"] = "Curry"
+    document["weeks"].setdefault("4", {})["Friday"] = "Curry"
+    write_externally(engine.data_file, document)
+
+    changes = engine.reload_changes()
+    assert changes.weeks == [4] and changes.conflicts == [3]
+    assert engine.meal(3, "Friday") == "Pizza" and engine.meal(4, "Friday") == "Curry"
+    engine.save_meals()
+    weeks = saved_document(engine.data_file)["weeks"]
+    assert weeks["3"]["Friday"] == "Pizza" and weeks["4"]["Friday"] == "Curry"
+
+
+def test_reload_applies_settings_and_ignores_invalid_files(engine, caplog):
+    document = saved_document(engine.data_file)
+    document["num_weeks"] = 8
+    write_externally(engine.data_file, document)
+    changes = engine.reload_changes()
+    assert changes.settings and engine.num_weeks == 8 and engine.meal(8, "Monday") == "Pasta"
+
+    with open(engine.data_file, "w") as f:
+        f.write("{half written")
+    assert engine.reload_changes() == ([], [], False)
+    assert "Ignoring the changed data file" in caplog.text
+    assert engine.meal(2, "Monday") == "Soup"
+
+
+def test_poll_check_reports_changes(tmp_path):
+    path = str(tmp_path / "meal_plans.json")
+    calls = []
+    loop = asyncio.new_event_loop()
+    try:
+        watcher = PlanWatcher(path, lambda: calls.append(1), interval=60).start(loop, use_inotify=False)
+        assert watcher.mode == "poll" and not watcher.check()
+        write_externally(path, {"weeks": {}})
+        assert watcher.check() and calls == [1]
+        assert not watcher.check()
+        watcher.stop()
+    finally:
+        loop.close()
+
+
+def test_inotify_reports_replaced_file(tmp_path):
+    path = str(tmp_path / "meal_plans.json")
+    calls = []
+    loop = asyncio.new_event_loop()
+    try:
+        watcher = PlanWatcher(path, lambda: calls.append(1)).start(loop)
+        if watcher.mode != "inotify":
+            watcher.stop()
+            pytest.skip("inotify is not available")
+        (tmp_path / "other.json").write_text("{}")
+        write_externally(path, {"weeks": {}})
+        write_externally(path, {"weeks": {"1": {}}})
+        loop.run_until_complete(asyncio.sleep(0.5))
+        assert calls == [1]  # One report for the burst, none for other files
+        watcher.stop()
+    finally:
+        loop.close()
+
+
+def test_app_redraws_only_for_the_visible_week(app, tmp_path, caplog):
+    app.DATA_FILE = str(tmp_path / "meal_plans.json")
+    app.startup()
+    app.save_meals()
+    app.writer.flush()
+    app.day_labels["Monday"].text = "(not redrawn)"
+    document = saved_document(app.DATA_FILE)
+    document["weeks"].setdefault("2", {})["Monday"] = "Curry"
+    write_externally(app.DATA_FILE, document)
+    app.handle_plan_file_changed()
+    app.writer.flush()  # The merged plan is saved again, replacing any save queued before it
+    assert app.day_labels["Monday"].text == "(not redrawn)"
+    assert "Reloaded week(s) 2 from disk." in caplog.text
+
+    app.edit_dinner(None, "Tuesday", 1)
+    app.edit_dialog.text_input.value = "Pizza"
+    app.handle_edit_ok(None)
+    document["weeks"].setdefault("1", {})["Monday"] = "Stew"
+    document["weeks"].setdefault("1", {})["Tuesday"] = "Curry"
+    write_externally(app.DATA_FILE, document)
+    app.handle_plan_file_changed()
+    assert "kept your unsaved edits to week(s) 1." in caplog.text
+    assert app.day_labels["Tuesday"].text == "Pizza"
+    app.main_window.close()
+
+
+def test_saving_merges_changes_made_on_disk(engine, caplog):
+    engine.set_meal(3, "Friday", "Pizza")
+    document = saved_document(engine.data_file)
+    document["weeks"].setdefault("2", {})["Monday"] = "Curry"
+    document["weeks"].setdefault("3", {})["Friday"] = "Curry"
+    write_externally(engine.data_file, document)
+    engine.close()  # Before the watcher has noticed
+    weeks = saved_document(engine.data_file)["weeks"]
+    assert weeks["2"]["Monday"] == "Curry" and weeks["3"]["Friday"] == "Pizza"
+    assert "saving your edits over week(s) 3" in caplog.text
@@ -0,0 +1,78 @@
+from src.mealplanner.store import PlanStore
+from src.mealplanner.writer import BackgroundWriter
+import json
+import time
+
+
+class CountingStore(PlanStore):
+    def __init__(self, path):
+        super().__init__(path)
+        self.saves = []
+        self.appends = []
+
+    def save(self, document, backups=3):
+        self.saves.append(document)
+        super().save(document, backups)
+
+    def append_edits(self, records, default_week=None):
+        self.appends.append(list(records))
+        super().append_edits(records, default_week)
+
+
+def test_writer_coalesces_burst_of_edits(tmp_path):
+    store = CountingStore(str(tmp_path / "meal_plans.json"))
+    store.save({"weeks": {1: {"Monday": "Soup"}}, "num_weeks": 1})
+    store.saves.clear()
+    writer = BackgroundWriter(debounce=60)
+    for n in range(20):
+        writer.append_edit(store, 1, "Monday", f"Meal {n}", {})
+    writer.flush()
+    assert store.appends == [[(1, "Monday", f"Meal {n}") for n in range(20)]]
+    assert store.saves == []
+    writer.close()
+
+
+def test_writer_snapshot_replaces_earlier_edits(tmp_path):
+    store = CountingStore(str(tmp_path / "meal_plans.json"))
+    writer = BackgroundWriter(debounce=60)
+    writer.append_edit(store, 1, "Monday", "Stew", {})
+    writer.save(store, {"weeks": {1: {"Monday": "Stew"}}, "num_weeks": 1})
+    writer.save(store, {"weeks": {1: {"Monday": "Curry"}}, "num_weeks": 1})
+    writer.append_edit(store, 1, "Tuesday", "Tacos", {})
+    writer.close()
+
+    assert len(store.saves) == 1
+    assert store.appends == [[(1, "Tuesday", "Tacos")]]
+    assert not writer.running
+    reloaded = PlanStore(store.path).load()
+    assert reloaded.weeks == {1: {"Monday": "Curry"}}
+    assert reloaded.journal == [(1, "Tuesday", "Tacos")]
+
+
+def test_writer_writes_after_debounce_window(tmp_path):
+    store = CountingStore(str(tmp_path / "meal_plans.json"))
+    writer = BackgroundWriter(debounce=0.01)
+    writer.save(store, {"weeks": {}, "num_weeks": 1})
+    for _ in range(200):
+        if store.saves:
+            break
+        time.sleep(0.01)
+    assert len(store.saves) == 1
+    writer.close()
+
+
+def test_shutdown_flushes_queued_saves(app, tmp_path):
+    test_file = tmp_path / "meal_plans.json"
+    app.DATA_FILE = str(test_file)
+    app.save_debounce = 60
+    app.startup()
+    app.edit_dinner(None, "Monday", 1)
+    app.edit_dialog.text_input.value = "Stew"
+    app.handle_edit_ok(None)
+    assert not test_file.exists()
+
+    app.shutdown()
+    assert app.writer is None
+    with open(test_file) as f:
+        assert json.load(f)["weeks"]["1"]["Monday"] == "Stew"
+    app.main_window.close()